@@ -1,21 +1,26 @@
-import os
-import os.path
 import sys
 
-from PySide6.QtWidgets import QApplication
-
-from services.database import init_db
-from windows.clocking import MainClocking
+from services import instrumentation
 
 if __name__ == '__main__':
+    # Before the app's modules are imported, so their calls are the timed ones
+    if instrumentation.enabled(sys.argv):
+        instrumentation.install()
+
+    from PySide6.QtWidgets import QApplication
+
+    from services.database import close_connections, get_app_data_dir, init_db
+    from windows.clocking import MainClocking
+
     init_db()
 
-    app = QApplication(sys.argv)
+    app = QApplication([arg for arg in sys.argv if arg != instrumentation.PROFILE_FLAG])
     widget = MainClocking()
+    app.aboutToQuit.connect(widget.sync_scheduler.stop)
     widget.show()
     exitCode = app.exec()
-
-    if exitCode == MainClocking.EXIT_CODE_REBOOT:
-        os.execv(sys.executable, [sys.executable] + sys.argv)
-    else:
-        sys.exit(exitCode)
+    close_connections()
+    reports = instrumentation.finish(get_app_data_dir() / 'profiles')
+    if reports:
+        print('Profiling reports written to:', *reports, sep='\n  ', file=sys.stderr)
+    sys.exit(exitCode)
@@ -0,0 +1,108 @@
+"""
+Time of a day's Clockify push against a local stub server.
+
+Compares a new connection per request (module-level requests.post, the
+previous behaviour) with the pooled keep-alive session. The stub is plain
+HTTP on localhost, so the gap is a lower bound: against the real API every
+new connection also pays DNS, TCP and TLS round trips. The lookup cache and
+the configuration live in a temporary directory, so user data is never
+touched. Run from the project root:
+
+    python -m benchmarks.bench_clockify [--entries N] [--rounds N]
+"""
+import argparse
+import datetime
+import json
+import statistics
+import tempfile
+import threading
+import time
+from contextlib import ExitStack
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest.mock import patch
+
+import requests
+
+import services.clockify_api as clockify_api
+import services.database as db
+from services.config_manager import ConfigManager
+from services.database import ConnectionManager
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Answers every request with a created time entry."""
+
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        payload = json.dumps({'id': 'entry'}).encode()
+        self.send_response(201)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+class OneShotSession:
+    """Stands in for the pooled session with the previous per-call requests.post."""
+
+    def post(self, url, json=None):
+        return requests.post(url, json=json, headers=clockify_api._get_config().headers)
+
+
+def push_day(entries: int) -> float:
+    """Log `entries` time entries and return the elapsed seconds."""
+    start_dt = datetime.datetime(2024, 1, 2, 9, 0, tzinfo=datetime.timezone.utc)
+    started = time.perf_counter()
+    for i in range(entries):
+        entry_start = start_dt + datetime.timedelta(minutes=10 * i)
+        clockify_api.log_time_in_clockify(
+            'project', 'task', 'TASK-1', entry_start, entry_start + datetime.timedelta(minutes=5))
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--entries', type=int, default=50)
+    parser.add_argument('--rounds', type=int, default=5)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, args=(0.01,), daemon=True).start()
+    url = f'http://127.0.0.1:{server.server_address[1]}/workspaces'
+
+    sessions = {
+        'one-shot': lambda: OneShotSession(),
+        'pooled': clockify_api.get_session,
+    }
+    print(f'{args.entries} entries, median of {args.rounds} rounds (ms)')
+    with tempfile.TemporaryDirectory() as tmpdir, ExitStack() as stack:
+        db_path = str(Path(tmpdir) / 'clocking.db')
+        manager = ConnectionManager(lambda: db_path)
+        db.set_connection_manager(manager)
+        db.init_db()
+        config = ConfigManager(env_path=str(Path(tmpdir) / '.env'))
+        config.update_all({'CLOCKIFY_WORKSPACE': 'workspace', 'CLOCKIFY_API_KEY': 'key'})
+        stack.enter_context(patch.object(clockify_api, 'get_config_manager', lambda: config))
+        stack.enter_context(patch.object(clockify_api, 'API_URL', url))
+        for name, get_session in sessions.items():
+            clockify_api.clear_clockify_cache()
+            with patch.object(clockify_api, 'get_session', get_session):
+                push_day(1)  # warm up
+                rounds = [push_day(args.entries) for _ in range(args.rounds)]
+            print(f'{name:<12}{statistics.median(rounds) * 1000:>10.1f}')
+        clockify_api.clear_clockify_cache()
+        manager.close_all()
+        db.set_connection_manager(None)
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""
+Per-call latency of the timer hot-path queries.
+
+Compares a fresh sqlite3 connection per call (the previous behaviour) with the
+pooled ConnectionManager. Run from the project root:
+
+    python -m benchmarks.bench_database [--rows N] [--calls N]
+"""
+import argparse
+import datetime
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import services.database as db
+from services.database import ClockingRecord, ConnectionManager
+
+
+class OneShotConnectionManager(ConnectionManager):
+    """Opens, configures and hands out a brand new connection on every call."""
+
+    def connection(self):
+        return db._open_connection(self.path())
+
+
+def seed(rows: int) -> str:
+    """Fill the benchmark DB with `rows` completed sessions plus one open session."""
+    today = datetime.date.today()
+    records = []
+    for i in range(rows):
+        day = (today - datetime.timedelta(days=i // 8)).isoformat()
+        hour = 9 + i % 8
+        records.append(ClockingRecord(
+            date=day,
+            task=f'TASK-{i % 25}',
+            check_in=f'{day} {hour:02d}:00',
+            check_out=f'{day} {hour:02d}:45',
+            message=None,
+            id=i + 1,
+        ))
+    db.save_clockings(records)
+    db.insert_clocking(today.isoformat(), 'TASK-1', f'{today.isoformat()} 18:00')
+    return today.isoformat()
+
+
+def measure(fn, calls: int) -> float:
+    """Return the median latency of fn() in microseconds."""
+    samples = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, default=5000)
+    parser.add_argument('--calls', type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db_path = str(Path(tmpdir) / 'clocking.db')
+        db.set_connection_manager(ConnectionManager(lambda: db_path))
+        db.init_db()
+        today = seed(args.rows)
+
+        queries = {
+            'get_open_clocking': db.get_open_clocking,
+            'get_today_completed_seconds': lambda: db.get_today_completed_seconds(today),
+        }
+        managers = {
+            'one-shot': OneShotConnectionManager(lambda: db_path),
+            'pooled': ConnectionManager(lambda: db_path),
+        }
+
+        print(f'{args.rows} rows, median of {args.calls} calls (us/call)')
+        print(f'{"query":<30}' + ''.join(f'{name:>12}' for name in managers))
+        for query_name, query in queries.items():
+            results = []
+            for manager in managers.values():
+                db.set_connection_manager(manager)
+                query()  # warm up
+                results.append(measure(query, args.calls))
+                manager.close_all()
+            print(f'{query_name:<30}' + ''.join(f'{r:>12.1f}' for r in results))
+        db.set_connection_manager(None)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,125 @@
+"""
+Startup time of the main window, checked against a committed budget.
+
+Measures, each in a fresh interpreter:
+
+- imports: cumulative `python -X importtime` time of `windows.clocking`, and
+  the modules loaded eagerly that are meant to be imported on first use
+- first paint: time from the start of the script to the first paint event
+  of MainClocking (offscreen, against an empty database in a temp dir)
+
+The limits live in benchmarks/startup_budget.json; tests/test_startup.py
+fails when they are exceeded. Run from the project root:
+
+    python -m benchmarks.bench_startup [--rounds N]
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+BUDGET_PATH = Path(__file__).resolve().parent / 'startup_budget.json'
+
+_IMPORTTIME = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+
+
+def load_budget() -> dict:
+    return json.loads(BUDGET_PATH.read_text())
+
+
+def _run(args: list[str], data_dir: str) -> subprocess.CompletedProcess:
+    env = dict(os.environ, QT_QPA_PLATFORM='offscreen',
+               XDG_DATA_HOME=data_dir, APPDATA=data_dir, HOME=data_dir)
+    return subprocess.run([sys.executable, *args], cwd=ROOT, env=env,
+                          capture_output=True, text=True, timeout=120, check=True)
+
+
+def measure_imports(lazy_modules: list[str]) -> tuple[float, list[str]]:
+    """
+    Import windows.clocking in a fresh interpreter
+
+    Returns:
+        Tuple of (cumulative import milliseconds, lazy modules that were loaded anyway)
+    """
+    code = ('import json, sys, windows.clocking; '
+            f'print(json.dumps([m for m in {lazy_modules!r} if m in sys.modules]))')
+    with tempfile.TemporaryDirectory() as data_dir:
+        result = _run(['-X', 'importtime', '-c', code], data_dir)
+    total_us = 0
+    for line in result.stderr.splitlines():
+        match = _IMPORTTIME.match(line)
+        if match and not match.group(3).strip(' ') and match.group(4) == 'windows.clocking':
+            total_us = int(match.group(2))
+    return total_us / 1000, json.loads(result.stdout)
+
+
+def measure_first_paint() -> float:
+    """Start the main window in a fresh interpreter; return the milliseconds to its first paint."""
+    with tempfile.TemporaryDirectory() as data_dir:
+        result = _run(['-m', 'benchmarks.bench_startup', '--child'], data_dir)
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def _child() -> None:
+    """Runs in the measured interpreter: start the app like app.py and print the first paint."""
+    import time
+    started = time.perf_counter()
+
+    from PySide6.QtCore import QEvent, QObject, QTimer
+    from PySide6.QtWidgets import QApplication
+
+    from services.database import close_connections, init_db
+    from windows.clocking import MainClocking
+
+    class FirstPaint(QObject):
+        elapsed_ms: float | None = None
+
+        def eventFilter(self, watched, event):
+            if event.type() == QEvent.Type.Paint and self.elapsed_ms is None:
+                self.elapsed_ms = (time.perf_counter() - started) * 1000
+                QTimer.singleShot(0, QApplication.quit)
+            return False
+
+    init_db()
+    app = QApplication(sys.argv[:1])
+    widget = MainClocking()
+    first_paint = FirstPaint()
+    widget.installEventFilter(first_paint)
+    widget.show()
+    QTimer.singleShot(30_000, QApplication.quit)
+    app.exec()
+    widget.sync_scheduler.stop()
+    close_connections()
+    if first_paint.elapsed_ms is None:
+        sys.exit('The main window was not painted')
+    print(f'{first_paint.elapsed_ms:.1f}')
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rounds', type=int, default=5)
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        _child()
+        return
+
+    budget = load_budget()
+    imports, eager = zip(*(measure_imports(budget['lazy_modules']) for _ in range(args.rounds)))
+    paints = [measure_first_paint() for _ in range(args.rounds)]
+    print(f'median of {args.rounds} rounds (ms)   measured    budget')
+    print(f"{'import windows.clocking':<28}{statistics.median(imports):>10.1f}"
+          f"{budget['import_ms']:>10}")
+    print(f"{'first paint':<28}{statistics.median(paints):>10.1f}"
+          f"{budget['first_paint_ms']:>10}")
+    print(f"eagerly loaded lazy modules: {', '.join(sorted(set().union(*eager))) or 'none'}")
+
+
+if __name__ == '__main__':
+    main()
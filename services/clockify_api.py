@@ -1,17 +1,35 @@
+import logging
+import threading
+import time
+from collections.abc import Iterable
 from datetime import datetime
-from functools import cache
 from zoneinfo import ZoneInfo
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from services.config_manager import get_config_manager
+from services.constants import CLOCKIFY_PAGE_SIZE, CLOCKIFY_TASK_INDEX_TTL_SECONDS
 from services.exceptions import ClockingException
 from services.jira_api import get_project_name
+from services.lookup_cache import persistent_cache
+
+API_URL = "https://api.clockify.me/api/v1/workspaces"
+# (connect, read) seconds for every Clockify request
+DEFAULT_TIMEOUT = (5, 30)
+POOL_SIZE = 8
+
+_lookup_lock = threading.Lock()
+_session_lock = threading.Lock()
+_sessions: dict[tuple[str, str], requests.Session] = {}
+# project id -> (monotonic time listed, task name -> task id); guarded by _lookup_lock
+_task_indexes: dict[str, tuple[float, dict[str, str]]] = {}
 
 
 class ClockifyConfig:
     def __init__(self, workspace, api_key):
-        self.url = "https://api.clockify.me/api/v1/workspaces"
+        self.url = API_URL
         self.workspace = workspace
         self.api_key = api_key
 
@@ -32,12 +50,57 @@ def _get_config():
     )
 
 
-@cache
+class _ClockifyRetry(Retry):
+    """Retry 429 and 5xx responses, honouring Retry-After; POSTs only on 429."""
+
+    def is_retry(self, method: str, status_code: int, has_retry_after: bool = False) -> bool:
+        if method and method.upper() == 'POST' and status_code != 429:
+            return False
+        return super().is_retry(method, status_code, has_retry_after)
+
+
+class _TimeoutHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter that applies DEFAULT_TIMEOUT to requests made without a timeout."""
+
+    def send(self, request, timeout=None, **kwargs):
+        return super().send(request, timeout=timeout or DEFAULT_TIMEOUT, **kwargs)
+
+
+def _build_session(config: ClockifyConfig) -> requests.Session:
+    session = requests.Session()
+    retry = _ClockifyRetry(
+        total=3,
+        read=0,                 # a request that timed out may have been applied
+        backoff_factor=0.5,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=None,   # every method; _ClockifyRetry narrows POST down
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = _TimeoutHTTPAdapter(pool_connections=1, pool_maxsize=POOL_SIZE, max_retries=retry)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update(config.headers)
+    return session
+
+
+def get_session() -> requests.Session:
+    """Return the keep-alive session of the configured workspace, creating it once."""
+    config = _get_config()
+    key = (config.workspace, config.api_key)
+    with _session_lock:
+        session = _sessions.get(key)
+        if session is None:
+            session = _sessions[key] = _build_session(config)
+    return session
+
+
+@persistent_cache('clockify_project_id')
 def find_clockify_project(project_name: str) -> str:
     config = _get_config()
     projects_url = f'{config.url}/{config.workspace}/projects'
     params = {'name': project_name, 'strict-name-search': True}
-    response = requests.get(projects_url, headers=config.headers, params=params)
+    response = get_session().get(projects_url, params=params)
     projects = response.json()
 
     if not response.ok or len(projects) == 0:
@@ -46,24 +109,62 @@ def find_clockify_project(project_name: str) -> str:
     return projects[0]['id']
 
 
-@cache
-def find_or_create_clockify_task(project_id: str, task_name: str) -> str:
+def list_clockify_tasks(project_id: str) -> dict[str, str]:
+    """
+    Return the name -> id index of all of a project's tasks, listed page by page
+
+    Raises:
+        ClockingException: If a page cannot be fetched
+    """
     config = _get_config()
     tasks_url = f'{config.url}/{config.workspace}/projects/{project_id}/tasks'
-    params = {'name': task_name, 'strict-name-search': True}
-    response = requests.get(tasks_url, headers=config.headers, params=params)
-    tasks = response.json()
+    index: dict[str, str] = {}
+    page = 1
+    while True:
+        response = get_session().get(
+            tasks_url, params={'page': page, 'page-size': CLOCKIFY_PAGE_SIZE})
+        if not response.ok:
+            raise ClockingException(f'Clockify rejected the task listing ({response.status_code})')
+        tasks = response.json()
+        for task in tasks:
+            index.setdefault(task['name'], task['id'])
+        if len(tasks) < CLOCKIFY_PAGE_SIZE:
+            return index
+        page += 1
+
 
-    if len(tasks):
-        return tasks[0]['id']
+def _project_task_index(project_id: str, max_age: float | None = None) -> dict[str, str]:
+    """Return the project's task index, listing it if missing or older than max_age seconds."""
+    listed = _task_indexes.get(project_id)
+    if listed is None or (max_age is not None and time.monotonic() - listed[0] > max_age):
+        listed = _task_indexes[project_id] = (time.monotonic(), list_clockify_tasks(project_id))
+    return listed[1]
 
-    data = {'name': task_name}
-    response = requests.post(tasks_url, json=data, headers=config.headers)
+
+@persistent_cache('clockify_task_id')
+def find_or_create_clockify_task(project_id: str, task_name: str) -> str:
+    """
+    Return the id of the project's task with this name, creating the task if there is none
+
+    Tasks are looked up in the project's index, listed once for all of them;
+    an index that may be stale is listed again before a task is created.
+    Callers hold _lookup_lock.
+    """
+    task_id = _project_task_index(project_id).get(task_name)
+    if task_id is None:
+        index = _project_task_index(project_id, max_age=CLOCKIFY_TASK_INDEX_TTL_SECONDS)
+        task_id = index.get(task_name)
+    if task_id is not None:
+        return task_id
+
+    config = _get_config()
+    tasks_url = f'{config.url}/{config.workspace}/projects/{project_id}/tasks'
+    response = get_session().post(tasks_url, json={'name': task_name})
 
     if not response.ok:
         raise ClockingException()
 
-    task_id = response.json()['id']
+    task_id = index[task_name] = response.json()['id']
     return task_id
 
 
@@ -73,16 +174,14 @@ def convert_datetime_to_utc(dt: datetime) -> str:
     return formatted_datetime
 
 
-def log_time_in_clockify(
+def _time_entry(
     project_id: str,
     task_id: str,
     task_key: str,
     start_time: datetime,
     end_time: datetime,
-) -> bool:
-    config = _get_config()
-    url = f'{config.url}/{config.workspace}/time-entries'
-    data = {
+) -> dict:
+    return {
         'start': convert_datetime_to_utc(start_time),
         'end': convert_datetime_to_utc(end_time),
         'billable': 'true',
@@ -90,14 +189,41 @@ def log_time_in_clockify(
         'projectId': project_id,
         'taskId': task_id,
     }
-    response = requests.post(url, json=data, headers=config.headers)    
+
+
+def log_time_in_clockify(
+    project_id: str,
+    task_id: str,
+    task_key: str,
+    start_time: datetime,
+    end_time: datetime,
+) -> bool:
+    config = _get_config()
+    url = f'{config.url}/{config.workspace}/time-entries'
+    data = _time_entry(project_id, task_id, task_key, start_time, end_time)
+    response = get_session().post(url, json=data)
     return response.ok
 
 
 def clear_clockify_cache() -> None:
-    """Clear cached Clockify API results (call after credential updates)."""
+    """Clear cached Clockify API results and sessions (call after credential updates)."""
     find_clockify_project.cache_clear()
     find_or_create_clockify_task.cache_clear()
+    _task_indexes.clear()
+    with _session_lock:
+        sessions = list(_sessions.values())
+        _sessions.clear()
+    for session in sessions:
+        session.close()
+
+
+def _resolve_task(task_key: str) -> tuple[str, str]:
+    """Return the (project id, task id) a task key's entries are logged under."""
+    # Pushes run in parallel: two misses for one task must not both create it
+    with _lookup_lock:
+        project_name = get_project_name(task_key.split('-')[0])
+        project_id = find_clockify_project(project_name)
+        return project_id, find_or_create_clockify_task(project_id, task_key)
 
 
 def push_worklog_to_clockify(
@@ -107,12 +233,85 @@ def push_worklog_to_clockify(
 ) -> bool:
 
     try:
-        project_key = task_key.split('-')[0]
-        project_name = get_project_name(project_key)
-        project_id = find_clockify_project(project_name)
-
-        task_id = find_or_create_clockify_task(project_id, task_key)
+        project_id, task_id = _resolve_task(task_key)
     except ClockingException:
         return False
 
     return log_time_in_clockify(project_id, task_id, task_key, start_time, end_time)
+
+
+def create_clockify_entry(task_key: str, start_time: datetime, end_time: datetime) -> str:
+    """
+    Log a time entry for the task and return its id
+
+    Raises:
+        ClockingException: If the project, the task or the entry cannot be resolved or created
+    """
+    project_id, task_id = _resolve_task(task_key)
+    config = _get_config()
+    url = f'{config.url}/{config.workspace}/time-entries'
+    response = get_session().post(
+        url, json=_time_entry(project_id, task_id, task_key, start_time, end_time))
+    if not response.ok:
+        raise ClockingException(f'Clockify rejected the time entry ({response.status_code})')
+    return response.json()['id']
+
+
+def update_clockify_entry(
+    entry_id: str,
+    task_key: str,
+    start_time: datetime,
+    end_time: datetime,
+) -> None:
+    """Replace the task and times of an existing time entry."""
+    project_id, task_id = _resolve_task(task_key)
+    config = _get_config()
+    url = f'{config.url}/{config.workspace}/time-entries/{entry_id}'
+    response = get_session().put(
+        url, json=_time_entry(project_id, task_id, task_key, start_time, end_time))
+    if not response.ok:
+        raise ClockingException(f'Clockify rejected the update ({response.status_code})')
+
+
+def delete_clockify_entry(entry_id: str) -> None:
+    """Delete a time entry; one that is already gone counts as deleted."""
+    config = _get_config()
+    url = f'{config.url}/{config.workspace}/time-entries/{entry_id}'
+    response = get_session().delete(url)
+    if not response.ok and response.status_code != 404:
+        raise ClockingException(f'Clockify rejected the delete ({response.status_code})')
+
+
+def warm_project_lookups(task_keys: Iterable[str]) -> int:
+    """
+    Resolve the Jira project names, Clockify project ids and task indexes of the tasks' projects.
+
+    Meant to run in the background at startup so the first push of the day
+    finds them in the lookup caches. Nothing is created remotely. Lookups for
+    a target that is not configured are skipped and failures are ignored.
+
+    Args:
+        task_keys: Task keys such as 'PROJ-123'
+
+    Returns:
+        Number of projects whose lookups succeeded
+    """
+    config = get_config_manager()
+    jira_configured, _ = config.is_jira_configured()
+    clockify_configured, _ = config.is_clockify_configured()
+    if not jira_configured:
+        return 0
+
+    warmed = 0
+    for project_key in sorted({key.split('-')[0] for key in task_keys if '-' in key}):
+        try:
+            with _lookup_lock:
+                project_name = get_project_name(project_key)
+                if clockify_configured:
+                    _project_task_index(find_clockify_project(project_name))
+        except Exception as e:
+            logging.info(f"Could not warm lookups for {project_key}: {e}")
+            continue
+        warmed += 1
+    return warmed
+
@@ -0,0 +1,106 @@
+"""Merge a day's short same-task sessions before they are pushed, into one remote entry each."""
+import datetime
+from dataclasses import dataclass
+
+from services.config_manager import ConfigManager, get_config_manager
+from services.constants import DEFAULT_COALESCE_GAP_MINUTES
+from services.database import ClockingRecord
+
+_FMT = "%Y-%m-%d %H:%M"
+
+COALESCE_OFF = 'off'
+COALESCE_TASK = 'task'      # every session of a task on the day
+COALESCE_GAP = 'gap'        # sessions of a task whose gap is at most max_gap_minutes
+COALESCE_MODES = (COALESCE_OFF, COALESCE_TASK, COALESCE_GAP)
+
+
+@dataclass(frozen=True)
+class CoalesceRule:
+    """Which completed sessions of the same task on a day are pushed as one entry."""
+    mode: str = COALESCE_OFF
+    max_gap_minutes: int = DEFAULT_COALESCE_GAP_MINUTES
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != COALESCE_OFF
+
+
+@dataclass
+class SessionGroup:
+    """
+    Sessions pushed as one entry.
+
+    record carries the id of the first session, so the group's remote entry
+    is tracked under it; its check_out is check_in plus the sessions' total
+    duration (gaps between them are not logged).
+    """
+    record: ClockingRecord
+    member_ids: list[int]
+
+
+def get_coalesce_rule(config: ConfigManager | None = None) -> CoalesceRule:
+    """
+    Return the rule set in the configuration
+
+    Args:
+        config: Configuration to read PUSH_COALESCE and PUSH_COALESCE_GAP_MINUTES
+            from; the global one if None. Unknown or invalid values fall back
+            to the defaults.
+    """
+    config = config or get_config_manager()
+    mode = config.get('PUSH_COALESCE').strip().lower()
+    try:
+        gap = int(config.get('PUSH_COALESCE_GAP_MINUTES') or DEFAULT_COALESCE_GAP_MINUTES)
+    except ValueError:
+        gap = DEFAULT_COALESCE_GAP_MINUTES
+    return CoalesceRule(mode if mode in COALESCE_MODES else COALESCE_OFF, max(gap, 0))
+
+
+def _parse(value: str) -> datetime.datetime:
+    return datetime.datetime.strptime(value, _FMT)
+
+
+def _merge(sessions: list[ClockingRecord]) -> SessionGroup:
+    first = sessions[0]
+    if len(sessions) == 1:
+        return SessionGroup(first, [first.id])
+    total = sum((_parse(s.check_out) - _parse(s.check_in) for s in sessions), datetime.timedelta())
+    messages = list(dict.fromkeys(s.message for s in sessions if s.message))
+    record = ClockingRecord(
+        date=first.date,
+        task=first.task,
+        check_in=first.check_in,
+        check_out=(_parse(first.check_in) + total).strftime(_FMT),
+        message='; '.join(messages) or None,
+        id=first.id,
+    )
+    return SessionGroup(record, [s.id for s in sessions])
+
+
+def coalesce(records: list[ClockingRecord], rule: CoalesceRule) -> list[SessionGroup]:
+    """
+    Group a day's completed clockings by the rule
+
+    Args:
+        records: One day's clockings; open ones are skipped
+        rule: How sessions of the same task are merged
+
+    Returns:
+        One group per entry to push, ordered by check-in
+    """
+    completed = sorted((r for r in records if r.check_out), key=lambda r: (r.check_in, r.id))
+    if not rule.enabled:
+        return [_merge([r]) for r in completed]
+
+    max_gap = datetime.timedelta(minutes=rule.max_gap_minutes)
+    runs: dict[str, list[list[ClockingRecord]]] = {}
+    for record in completed:
+        task_runs = runs.setdefault(record.task, [])
+        if task_runs and (rule.mode == COALESCE_TASK or
+                          _parse(record.check_in) - _parse(task_runs[-1][-1].check_out) <= max_gap):
+            task_runs[-1].append(record)
+        else:
+            task_runs.append([record])
+
+    groups = [_merge(run) for task_runs in runs.values() for run in task_runs]
+    return sorted(groups, key=lambda g: (g.record.check_in, g.record.id))
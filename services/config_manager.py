@@ -1,6 +1,9 @@
+import io
 import os
+import tempfile
 
-from dotenv import dotenv_values, set_key
+from dotenv import dotenv_values
+from dotenv.parser import parse_stream
 
 from services.database import get_app_data_dir
 
@@ -14,7 +17,7 @@ class ConfigManager:
     ALL_REQUIRED_KEYS = REQUIRED_JIRA_KEYS + REQUIRED_CLOCKIFY_KEYS
 
     # Optional configuration keys
-    OPTIONAL_KEYS = ['JIRA_TASK_PREFIX']
+    OPTIONAL_KEYS = ['JIRA_TASK_PREFIX', 'PUSH_COALESCE', 'PUSH_COALESCE_GAP_MINUTES']
     
     def __init__(self, env_path: str | None = None):
         """
@@ -25,22 +28,37 @@ class ConfigManager:
         """
         self.env_path = env_path or str(get_app_data_dir() / '.env')
         self._config: dict[str, str] = {}
+        # Bumped whenever a value changes, so callers can cache what they derive from it
+        self.version = 0
         self.load_config()
     
-    def load_config(self) -> None:
-        """Load configuration from .env file"""
+    def load_config(self) -> bool:
+        """
+        Load configuration from .env file
+
+        Returns:
+            True if any value differs from the one held before
+        """
         # Load values directly from .env file without modifying process environment
         all_keys = self.ALL_REQUIRED_KEYS + self.OPTIONAL_KEYS
         if os.path.exists(self.env_path):
             env_values = dotenv_values(self.env_path)
-            self._config = {
+            config = {
                 key: env_values.get(key) or '' for key in all_keys
             }
         else:
             # If file doesn't exist, initialize with empty values
-            self._config = {
+            config = {
                 key: '' for key in all_keys
             }
+        return self._replace(config)
+
+    def _replace(self, config: dict[str, str]) -> bool:
+        if config == self._config:
+            return False
+        self._config = config
+        self.version += 1
+        return True
     
     def get(self, key: str, default: str = '') -> str:
         """
@@ -63,26 +81,59 @@ class ConfigManager:
             key: Configuration key
             value: Configuration value
         """
-        self._config[key] = value
+        self._replace({**self._config, key: value})
     
     def save(self) -> bool:
         """
         Save configuration to .env file
 
+        The file is written once, to a temporary file next to it that then
+        replaces it, so a crash never leaves it half written. Other lines of
+        the file (comments, unknown keys) are kept.
+
         Returns:
             True if successful, False otherwise
         """
         try:
-            # Write all configuration values (set_key creates the file if missing)
-            for key, value in self._config.items():
-                set_key(self.env_path, key, value)
-
-            # Reload to ensure consistency
-            self.load_config()
+            self._write_atomically(self._render())
             return True
         except Exception as e:
             print(f"Error saving configuration: {e}")
             return False
+
+    def _render(self) -> str:
+        """Return the .env content with the current values, in the quoting of dotenv.set_key."""
+        lines = {key: "{}='{}'\n".format(key, value.replace("'", "\\'"))
+                 for key, value in self._config.items()}
+        try:
+            with open(self.env_path, encoding='utf-8') as f:
+                existing = f.read()
+        except FileNotFoundError:
+            existing = ''
+
+        out = io.StringIO()
+        for binding in parse_stream(io.StringIO(existing)):
+            original = binding.original.string
+            out.write(lines.pop(binding.key) if binding.key in lines else original)
+        if out.tell() and not out.getvalue().endswith('\n'):
+            out.write('\n')
+        out.writelines(lines.values())
+        return out.getvalue()
+
+    def _write_atomically(self, content: str) -> None:
+        directory = os.path.dirname(os.path.abspath(self.env_path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.env.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(content)
+                f.flush()
+                os.fsync(f.fileno())
+            if os.path.exists(self.env_path):
+                os.chmod(tmp_path, os.stat(self.env_path).st_mode & 0o777)
+            os.replace(tmp_path, self.env_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
     
     def get_all(self) -> dict[str, str]:
         """
@@ -100,7 +151,7 @@ class ConfigManager:
         Args:
             config: Dictionary of configuration key-value pairs
         """
-        self._config.update(config)
+        self._replace({**self._config, **config})
     
     def _is_configured(self, keys: list[str]) -> tuple[bool, list[str]]:
         missing_keys = [key for key in keys if not self._config.get(key, '').strip()]
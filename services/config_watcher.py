@@ -0,0 +1,58 @@
+"""Reload the configuration when its .env file is changed outside the app."""
+import os
+
+from PySide6.QtCore import QFileSystemWatcher, QObject, QTimer, Signal
+
+from services.config_manager import ConfigManager, get_config_manager
+
+# Editors and ConfigManager.save() replace the file in several steps; wait for the last one
+DEBOUNCE_MS = 200
+
+
+class ConfigWatcher(QObject):
+    """
+    Watches the .env file and reloads the ConfigManager when its values change.
+
+    The directory is watched too: a file replaced by rename (as editors and
+    ConfigManager.save() do) drops out of QFileSystemWatcher, and a file
+    created later has nothing to watch yet. `changed` is only emitted when a
+    value differs from the one in memory, so the app's own saves are silent.
+    """
+
+    changed = Signal()
+
+    def __init__(self, config: ConfigManager | None = None, parent: QObject | None = None):
+        """
+        Args:
+            config: Configuration to keep in sync; the global one if None
+            parent: Owner of the watcher
+        """
+        super().__init__(parent)
+        self.config = config or get_config_manager()
+        self._path = os.path.abspath(self.config.env_path)
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.fileChanged.connect(self._schedule_reload)
+        self._watcher.directoryChanged.connect(self._schedule_reload)
+        self._debounce = QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.setInterval(DEBOUNCE_MS)
+        self._debounce.timeout.connect(self.reload)
+        self._watch()
+
+    def _watch(self) -> None:
+        watched = self._watcher.files() + self._watcher.directories()
+        paths = [p for p in (os.path.dirname(self._path), self._path)
+                 if os.path.exists(p) and p not in watched]
+        if paths:
+            self._watcher.addPaths(paths)
+
+    def _schedule_reload(self, path: str) -> None:
+        self._debounce.start()
+
+    def reload(self) -> bool:
+        """Re-read the file now; returns whether any value changed."""
+        self._watch()
+        if not self.config.load_config():
+            return False
+        self.changed.emit()
+        return True
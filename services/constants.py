@@ -1,3 +1,41 @@
 CLOCKING_HEADER = ["Date", "Task", "Check In", "Check Out", "Message"]
 TASK_HEADER = ['Task', 'Description', 'Task Type']
 TASK_TYPES = ['fixed', 'open', 'closed']
+
+# Days of clocking history loaded when the main window opens; older rows are paged in.
+HISTORY_DAYS = 14
+CLOCKING_PAGE_SIZE = 200
+
+# Push limits per target: concurrent requests and sustained requests per second.
+JIRA_MAX_IN_FLIGHT = 4
+JIRA_REQUESTS_PER_SECOND = 10
+CLOCKIFY_MAX_IN_FLIGHT = 4
+CLOCKIFY_REQUESTS_PER_SECOND = 10
+
+# Delay after startup before the lookups below are warmed, so importing the network
+# clients does not compete with the first paint of the main window.
+LOOKUP_WARM_DELAY_SECONDS = 2
+
+# How long Jira project names and Clockify project/task ids are trusted before re-fetching.
+LOOKUP_CACHE_TTL_SECONDS = 7 * 24 * 3600
+
+# Clockify task listing: page size, and how old a project's task index may be before
+# it is listed again ahead of creating a task it does not contain.
+CLOCKIFY_PAGE_SIZE = 200
+CLOCKIFY_TASK_INDEX_TTL_SECONDS = 10 * 60
+
+# Jira open-issue sync: page size of each search, and how often a full sync
+# (instead of only the issues updated since the last one) is done.
+JIRA_SEARCH_PAGE_SIZE = 100
+JIRA_FULL_SYNC_INTERVAL_SECONDS = 24 * 3600
+
+# Background sync: retry failed pushes and refresh Jira open issues.
+SYNC_STARTUP_DELAY_SECONDS = 30
+SYNC_INTERVAL_SECONDS = 5 * 60
+JIRA_REFRESH_INTERVAL_SECONDS = 30 * 60
+SYNC_BACKOFF_BASE_SECONDS = 30
+SYNC_BACKOFF_MAX_SECONDS = 30 * 60
+SYNC_MAX_ATTEMPTS = 10
+
+# Push coalescing: default largest gap between same-task sessions pushed as one entry.
+DEFAULT_COALESCE_GAP_MINUTES = 15
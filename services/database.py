@@ -1,10 +1,19 @@
 """SQLite database access layer for ClockingApp."""
+import argparse
 import os
 import sqlite3
 import sys
+import threading
+import weakref
+from collections.abc import Callable
 from dataclasses import dataclass
 from pathlib import Path
 
+from services.constants import CLOCKING_PAGE_SIZE
+
+# Size of the per-connection prepared-statement cache (sqlite3 default is 128).
+_STATEMENT_CACHE_SIZE = 256
+
 
 # ---------------------------------------------------------------------------
 # Data objects
@@ -42,7 +51,42 @@ class TaskRecord:
 @dataclass
 class TaskDuration:
     task: str
-    total_seconds: int   # computed in SQL via julianday()
+    total_seconds: int   # maintained in SQL by the daily_task_totals triggers
+
+
+@dataclass
+class TaskSyncResult:
+    added: list[str]     # task keys inserted as 'open'
+    updated: list[str]   # existing tasks whose description or type changed to 'open'
+    closed: list[str]    # 'open' tasks set to 'closed'
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.added or self.updated or self.closed)
+
+
+@dataclass
+class SyncState:
+    clocking_id: int
+    target: str                 # 'Jira' | 'Clockify'
+    date: str                   # date of the clocking when it was last pushed
+    task: str                   # task it was last pushed under
+    remote_id: str | None       # Jira worklog id / Clockify time entry id
+    content_hash: str | None    # hash of the clocking as last pushed successfully
+    status: str                 # 'synced' | 'failed'
+    attempts: int               # failed attempts since the last success
+    last_error: str | None = None
+    clocking_exists: bool = True
+
+
+@dataclass
+class DailyTotalMismatch:
+    date: str
+    task: str
+    expected_seconds: int    # recomputed from clockings
+    expected_sessions: int
+    stored_seconds: int      # read from daily_task_totals
+    stored_sessions: int
 
 
 # ---------------------------------------------------------------------------
@@ -66,13 +110,122 @@ def get_db_path() -> str:
     return str(get_app_data_dir() / 'clocking.db')
 
 
-def _get_connection() -> sqlite3.Connection:
-    conn = sqlite3.connect(get_db_path())
+class _ManagedConnection(sqlite3.Connection):
+    """sqlite3.Connection that can be weakly referenced by ConnectionManager."""
+
+
+def _open_connection(path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(
+        path,
+        factory=_ManagedConnection,
+        cached_statements=_STATEMENT_CACHE_SIZE,
+        check_same_thread=False,
+    )
     conn.row_factory = sqlite3.Row
     conn.execute("PRAGMA foreign_keys=ON")
     return conn
 
 
+class ConnectionManager:
+    """
+    Hands out one long-lived SQLite connection per thread.
+
+    Connections are opened lazily and keep their prepared-statement cache for
+    the lifetime of the thread. The database path is resolved once, on first
+    use; after reset_path() it is resolved again and connections to the old
+    path are re-opened.
+    """
+
+    def __init__(self, path_provider: Callable[[], str] | None = None):
+        """
+        Args:
+            path_provider: Callable returning the database path. Defaults to get_db_path
+        """
+        self._path_provider = path_provider
+        self._path: str | None = None
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._open: weakref.WeakSet[sqlite3.Connection] = weakref.WeakSet()
+
+    def path(self) -> str:
+        path = self._path
+        if path is None:
+            path = self._path = self._path_provider() if self._path_provider else get_db_path()
+        return path
+
+    def reset_path(self) -> None:
+        """Resolve the database path again on next use."""
+        self._path = None
+
+    def connection(self) -> sqlite3.Connection:
+        """Return the calling thread's connection, opening it if needed."""
+        path = self.path()
+        local = self._local
+        conn = getattr(local, 'conn', None)
+        if conn is not None and local.path == path and local.generation == self._generation:
+            return conn
+        if conn is not None:
+            self._discard(conn)
+        conn = _open_connection(path)
+        with self._lock:
+            self._open.add(conn)
+            local.generation = self._generation
+        local.conn = conn
+        local.path = path
+        return conn
+
+    def close(self) -> None:
+        """Close the calling thread's connection, if any."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            self._discard(conn)
+            self._local.conn = None
+
+    def close_all(self) -> None:
+        """Close every connection handed out by this manager (call at shutdown)."""
+        with self._lock:
+            conns = list(self._open)
+            self._open.clear()
+            self._generation += 1
+        for conn in conns:
+            conn.close()
+
+    def _discard(self, conn: sqlite3.Connection) -> None:
+        with self._lock:
+            self._open.discard(conn)
+        conn.close()
+
+
+# Global instance
+_connection_manager: ConnectionManager | None = None
+
+
+def get_connection_manager() -> ConnectionManager:
+    """Get or create the global ConnectionManager instance"""
+    global _connection_manager
+    if _connection_manager is None:
+        _connection_manager = ConnectionManager()
+    return _connection_manager
+
+
+def set_connection_manager(manager: ConnectionManager | None) -> ConnectionManager | None:
+    """Replace the global ConnectionManager (e.g. with a test double). Returns the previous one."""
+    global _connection_manager
+    previous, _connection_manager = _connection_manager, manager
+    return previous
+
+
+def close_connections() -> None:
+    """Close all pooled connections of the global manager."""
+    if _connection_manager is not None:
+        _connection_manager.close_all()
+
+
+def _get_connection() -> sqlite3.Connection:
+    return get_connection_manager().connection()
+
+
 def _clocking_from_row(row: sqlite3.Row) -> ClockingRecord:
     return ClockingRecord(
         id=row['id'],
@@ -103,8 +256,160 @@ def _task_duration_from_row(row: sqlite3.Row) -> TaskDuration:
 # Schema initialisation
 # ---------------------------------------------------------------------------
 
+# Each entry upgrades the schema by one version and PRAGMA user_version records
+# how many have been applied. Released migrations must never be edited; append
+# a new one instead.
+_MIGRATIONS: list[str] = [
+    # 1: indexes for the per-day aggregates, the open-session lookup and per-task reports
+    """
+    CREATE INDEX IF NOT EXISTS idx_clockings_date_check_out ON clockings (date, check_out);
+    CREATE INDEX IF NOT EXISTS idx_clockings_open ON clockings (id) WHERE check_out IS NULL;
+    CREATE INDEX IF NOT EXISTS idx_clockings_task_date ON clockings (task, date);
+    """,
+    # 2: integer epoch seconds and duration stored alongside the TEXT timestamps.
+    # check_in/check_out are naive wall-clock times, so the epochs are only
+    # meaningful relative to each other. SQLite cannot ALTER in a STORED
+    # generated column, hence the table rebuild (keeping the AUTOINCREMENT counter).
+    """
+    CREATE TABLE clockings_v2 (
+        id               INTEGER PRIMARY KEY AUTOINCREMENT,
+        date             TEXT NOT NULL,
+        task             TEXT NOT NULL,
+        check_in         TEXT NOT NULL,
+        check_out        TEXT,
+        message          TEXT,
+        start_epoch      INTEGER GENERATED ALWAYS AS
+                             (CAST(strftime('%s', check_in) AS INTEGER)) STORED,
+        end_epoch        INTEGER GENERATED ALWAYS AS
+                             (CAST(strftime('%s', check_out) AS INTEGER)) STORED,
+        duration_seconds INTEGER GENERATED ALWAYS AS (end_epoch - start_epoch) STORED
+    );
+    INSERT INTO clockings_v2 (id, date, task, check_in, check_out, message)
+        SELECT id, date, task, check_in, check_out, message FROM clockings;
+    DELETE FROM sqlite_sequence WHERE name = 'clockings_v2';
+    UPDATE sqlite_sequence SET name = 'clockings_v2' WHERE name = 'clockings';
+    DROP TABLE clockings;
+    ALTER TABLE clockings_v2 RENAME TO clockings;
+    CREATE INDEX idx_clockings_date_check_out ON clockings (date, check_out);
+    CREATE INDEX idx_clockings_open ON clockings (id) WHERE check_out IS NULL;
+    CREATE INDEX idx_clockings_task_date ON clockings (task, date);
+    """,
+    # 3: per-day, per-task totals of completed sessions kept in step by triggers
+    """
+    CREATE TABLE daily_task_totals (
+        date     TEXT NOT NULL,
+        task     TEXT NOT NULL,
+        seconds  INTEGER NOT NULL,
+        sessions INTEGER NOT NULL,
+        PRIMARY KEY (date, task)
+    ) WITHOUT ROWID;
+    CREATE TRIGGER clockings_totals_insert AFTER INSERT ON clockings
+    WHEN NEW.duration_seconds IS NOT NULL
+    BEGIN
+        INSERT INTO daily_task_totals (date, task, seconds, sessions)
+            VALUES (NEW.date, NEW.task, NEW.duration_seconds, 1)
+            ON CONFLICT (date, task) DO UPDATE
+            SET seconds = seconds + excluded.seconds, sessions = sessions + 1;
+    END;
+    CREATE TRIGGER clockings_totals_delete AFTER DELETE ON clockings
+    WHEN OLD.duration_seconds IS NOT NULL
+    BEGIN
+        UPDATE daily_task_totals
+            SET seconds = seconds - OLD.duration_seconds, sessions = sessions - 1
+            WHERE date = OLD.date AND task = OLD.task;
+        DELETE FROM daily_task_totals
+            WHERE date = OLD.date AND task = OLD.task AND sessions <= 0;
+    END;
+    CREATE TRIGGER clockings_totals_update AFTER UPDATE OF date, task, check_in, check_out
+    ON clockings
+    BEGIN
+        UPDATE daily_task_totals
+            SET seconds = seconds - OLD.duration_seconds, sessions = sessions - 1
+            WHERE OLD.duration_seconds IS NOT NULL AND date = OLD.date AND task = OLD.task;
+        DELETE FROM daily_task_totals
+            WHERE date = OLD.date AND task = OLD.task AND sessions <= 0;
+        INSERT INTO daily_task_totals (date, task, seconds, sessions)
+            SELECT NEW.date, NEW.task, NEW.duration_seconds, 1
+            WHERE NEW.duration_seconds IS NOT NULL
+            ON CONFLICT (date, task) DO UPDATE
+            SET seconds = seconds + excluded.seconds, sessions = sessions + 1;
+    END;
+    INSERT INTO daily_task_totals (date, task, seconds, sessions)
+        SELECT date, task, SUM(duration_seconds), COUNT(*)
+        FROM clockings WHERE duration_seconds IS NOT NULL
+        GROUP BY date, task;
+    """,
+    # 4: keyset pagination of the clocking history by (check_in, id)
+    """
+    CREATE INDEX idx_clockings_check_in ON clockings (check_in, id);
+    """,
+    # 5: remote id lookups (Jira project names, Clockify project/task ids) kept across launches
+    """
+    CREATE TABLE lookup_cache (
+        kind       TEXT NOT NULL,
+        key        TEXT NOT NULL,
+        value      TEXT NOT NULL,
+        expires_at INTEGER NOT NULL,
+        PRIMARY KEY (kind, key)
+    ) WITHOUT ROWID;
+    """,
+    # 6: small key/value store for sync watermarks
+    """
+    CREATE TABLE app_state (
+        key   TEXT PRIMARY KEY,
+        value TEXT NOT NULL
+    ) WITHOUT ROWID;
+    """,
+    # 7: push outbox; no foreign key so a deleted clocking keeps the remote id to delete
+    """
+    CREATE TABLE sync_state (
+        clocking_id  INTEGER NOT NULL,
+        target       TEXT NOT NULL,
+        date         TEXT NOT NULL,
+        task         TEXT NOT NULL,
+        remote_id    TEXT,
+        content_hash TEXT,
+        status       TEXT NOT NULL CHECK(status IN ('synced', 'failed')),
+        attempts     INTEGER NOT NULL DEFAULT 0,
+        last_error   TEXT,
+        PRIMARY KEY (clocking_id, target)
+    ) WITHOUT ROWID;
+    CREATE INDEX idx_sync_state_target_date ON sync_state (target, date);
+    """,
+]
+
+SCHEMA_VERSION = len(_MIGRATIONS)
+
+
+def get_schema_version() -> int:
+    """Return the schema version recorded in the database file."""
+    return _get_connection().execute("PRAGMA user_version").fetchone()[0]
+
+
+def get_data_version() -> int:
+    """
+    Return PRAGMA data_version for this thread's connection.
+
+    The value changes whenever another connection commits to the database,
+    so callers can cheaply detect external writes without re-running queries.
+    """
+    return _get_connection().execute("PRAGMA data_version").fetchone()[0]
+
+
+def _apply_migrations(conn: sqlite3.Connection) -> None:
+    """Bring the schema up to SCHEMA_VERSION, one transaction per migration."""
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    for target, script in enumerate(_MIGRATIONS[version:], start=version + 1):
+        try:
+            conn.executescript(f"BEGIN; {script}; PRAGMA user_version = {target}; COMMIT;")
+        except sqlite3.Error:
+            if conn.in_transaction:
+                conn.rollback()
+            raise
+
+
 def init_db() -> None:
-    """Create tables if they do not yet exist."""
+    """Create tables if they do not yet exist and apply pending migrations."""
     with _get_connection() as conn:
         conn.execute("PRAGMA journal_mode=WAL")
         conn.executescript("""
@@ -123,6 +428,7 @@ def init_db() -> None:
                     CHECK(task_type IN ('fixed', 'open', 'closed'))
             );
         """)
+        _apply_migrations(conn)
 
 
 # ---------------------------------------------------------------------------
@@ -139,6 +445,52 @@ def get_all_clockings() -> list[ClockingRecord]:
     return [_clocking_from_row(r) for r in rows]
 
 
+def get_clockings_since(date: str) -> list[ClockingRecord]:
+    """Return clocking rows checked in on or after date (YYYY-MM-DD), oldest first."""
+    with _get_connection() as conn:
+        rows = conn.execute(
+            "SELECT id, date, task, check_in, check_out, message "
+            "FROM clockings WHERE check_in >= ? ORDER BY check_in, id",
+            (date,),
+        ).fetchall()
+    return [_clocking_from_row(r) for r in rows]
+
+
+def _keyset_filter(before_check_in: str | None, before_id: int | None) -> tuple[str, tuple]:
+    if before_check_in is None:
+        return "", ()
+    if before_id is None:
+        return "WHERE check_in < ? ", (before_check_in,)
+    return "WHERE (check_in, id) < (?, ?) ", (before_check_in, before_id)
+
+
+def get_clockings_page(
+    before_check_in: str | None = None,
+    before_id: int | None = None,
+    limit: int = CLOCKING_PAGE_SIZE,
+) -> list[ClockingRecord]:
+    """
+    Return up to `limit` clocking rows older than the (check_in, id) cursor
+
+    Args:
+        before_check_in: check_in of the oldest row already loaded, None for the newest page
+        before_id: id of that row, to break ties between equal check_in values
+        limit: Maximum number of rows to return
+
+    Returns:
+        Rows ordered oldest first, like get_all_clockings()
+    """
+    where, params = _keyset_filter(before_check_in, before_id)
+    with _get_connection() as conn:
+        rows = conn.execute(
+            "SELECT id, date, task, check_in, check_out, message "
+            f"FROM clockings {where}"
+            "ORDER BY check_in DESC, id DESC LIMIT ?",
+            (*params, limit),
+        ).fetchall()
+    return [_clocking_from_row(r) for r in reversed(rows)]
+
+
 def get_clockings_for_date(date: str) -> list[ClockingRecord]:
     """Return completed clocking rows for a given date (YYYY-MM-DD)."""
     with _get_connection() as conn:
@@ -165,47 +517,54 @@ def get_today_completed_seconds(date: str) -> int:
     """Return sum of completed session durations for date, in seconds."""
     with _get_connection() as conn:
         row = conn.execute(
-            "SELECT COALESCE("
-            "  CAST(ROUND(SUM((julianday(check_out) - julianday(check_in)) * 86400)) AS INTEGER),"
-            "  0"
-            ") AS secs "
-            "FROM clockings WHERE date = ? AND check_out IS NOT NULL",
+            "SELECT COALESCE(SUM(seconds), 0) AS secs "
+            "FROM daily_task_totals WHERE date = ?",
             (date,),
         ).fetchone()
     return row['secs'] if row else 0
 
 
 def get_task_durations_for_date(date: str) -> list[TaskDuration]:
-    """Return per-task summed durations for date, computed in SQL."""
+    """Return per-task summed durations for date, read from daily_task_totals."""
     with _get_connection() as conn:
         rows = conn.execute(
-            "SELECT task, "
-            "  CAST(ROUND(SUM((julianday(check_out) - julianday(check_in)) * 86400)) AS INTEGER)"
-            "  AS total_seconds "
-            "FROM clockings "
-            "WHERE date = ? AND check_out IS NOT NULL "
-            "GROUP BY task ORDER BY task",
+            "SELECT task, seconds AS total_seconds "
+            "FROM daily_task_totals "
+            "WHERE date = ? "
+            "ORDER BY task",
             (date,),
         ).fetchall()
     return [_task_duration_from_row(r) for r in rows]
 
 
-def insert_clocking(date: str, task: str, check_in: str, check_out: str | None = None) -> None:
-    """Insert a new clocking row."""
+def insert_clocking(
+    date: str, task: str, check_in: str, check_out: str | None = None
+) -> ClockingRecord:
+    """Insert a new clocking row. Returns the stored record, id included."""
     with _get_connection() as conn:
-        conn.execute(
+        cursor = conn.execute(
             "INSERT INTO clockings (date, task, check_in, check_out) VALUES (?, ?, ?, ?)",
             (date, task, check_in, check_out),
         )
+    return ClockingRecord(
+        date=date,
+        task=task,
+        check_in=check_in,
+        check_out=check_out,
+        message=None,
+        id=cursor.lastrowid,
+    )
 
 
-def update_check_out(row_id: int, check_out: str) -> None:
-    """Set check_out on an existing clocking row."""
+def update_check_out(row_id: int, check_out: str) -> ClockingRecord | None:
+    """Set check_out on an existing clocking row. Returns the updated record, if it exists."""
     with _get_connection() as conn:
-        conn.execute(
-            "UPDATE clockings SET check_out = ? WHERE id = ?",
+        row = conn.execute(
+            "UPDATE clockings SET check_out = ? WHERE id = ? "
+            "RETURNING id, date, task, check_in, check_out, message",
             (check_out, row_id),
-        )
+        ).fetchone()
+    return _clocking_from_row(row) if row else None
 
 
 def upsert_clocking(record: ClockingRecord) -> int:
@@ -244,6 +603,58 @@ def save_clockings(records: list[ClockingRecord]) -> None:
         )
 
 
+# ---------------------------------------------------------------------------
+# Daily totals maintenance
+# ---------------------------------------------------------------------------
+
+_RAW_DAILY_TOTALS_SQL = (
+    "SELECT date, task, SUM(duration_seconds) AS seconds, COUNT(*) AS sessions "
+    "FROM clockings WHERE duration_seconds IS NOT NULL GROUP BY date, task"
+)
+
+
+def rebuild_daily_task_totals() -> None:
+    """Recompute daily_task_totals from the raw clockings rows."""
+    with _get_connection() as conn:
+        conn.execute("DELETE FROM daily_task_totals")
+        conn.execute(
+            "INSERT INTO daily_task_totals (date, task, seconds, sessions) "
+            + _RAW_DAILY_TOTALS_SQL
+        )
+
+
+def check_daily_task_totals() -> list[DailyTotalMismatch]:
+    """Return every (date, task) whose stored totals disagree with the raw rows."""
+    with _get_connection() as conn:
+        rows = conn.execute(
+            f"WITH raw AS ({_RAW_DAILY_TOTALS_SQL}) "
+            "SELECT raw.date, raw.task, raw.seconds AS expected_seconds, "
+            "  raw.sessions AS expected_sessions, "
+            "  COALESCE(t.seconds, 0) AS stored_seconds, "
+            "  COALESCE(t.sessions, 0) AS stored_sessions "
+            "FROM raw LEFT JOIN daily_task_totals t "
+            "  ON t.date = raw.date AND t.task = raw.task "
+            "WHERE t.seconds IS NOT raw.seconds OR t.sessions IS NOT raw.sessions "
+            "UNION ALL "
+            "SELECT t.date, t.task, 0, 0, t.seconds, t.sessions "
+            "FROM daily_task_totals t LEFT JOIN raw "
+            "  ON raw.date = t.date AND raw.task = t.task "
+            "WHERE raw.date IS NULL "
+            "ORDER BY 1, 2"
+        ).fetchall()
+    return [
+        DailyTotalMismatch(
+            date=r['date'],
+            task=r['task'],
+            expected_seconds=r['expected_seconds'],
+            expected_sessions=r['expected_sessions'],
+            stored_seconds=r['stored_seconds'],
+            stored_sessions=r['stored_sessions'],
+        )
+        for r in rows
+    ]
+
+
 # ---------------------------------------------------------------------------
 # Task queries
 # ---------------------------------------------------------------------------
@@ -285,26 +696,305 @@ def save_tasks(records: list[TaskRecord]) -> None:
         )
 
 
-def upsert_tasks(issues: list[dict]) -> None:
-    """Insert or update task rows from a list of {task, description} dicts."""
-    with _get_connection() as conn:
-        for issue in issues:
+def sync_open_tasks(
+    issues: list[dict],
+    closed_tasks: set[str] | None = None,
+    state: tuple[str, str] | None = None,
+) -> TaskSyncResult:
+    """
+    Apply fetched Jira issues to the tasks table in one transaction
+
+    The issues are bulk-loaded into a temp table and merged with set-based
+    statements, so the cost does not grow with a Python loop per task.
+
+    Args:
+        issues: {task, description} dicts of open issues; they are inserted or
+            updated as 'open'
+        closed_tasks: Tasks to close if they are 'open'. None means `issues` is
+            the complete open set and every other 'open' task is closed
+        state: Optional (key, value) written to app_state in the same
+            transaction, e.g. the sync watermark
+
+    Returns:
+        The task keys that were added, updated and closed
+    """
+    conn = _get_connection()
+    with conn:
+        conn.execute("BEGIN IMMEDIATE")
+        conn.execute(
+            "CREATE TEMP TABLE IF NOT EXISTS incoming_tasks "
+            "(task TEXT PRIMARY KEY, description TEXT NOT NULL, is_open INTEGER NOT NULL)"
+        )
+        conn.execute("DELETE FROM incoming_tasks")
+        # Open issues are loaded last so they win over a stale closed entry for the same key
+        conn.executemany(
+            "INSERT OR REPLACE INTO incoming_tasks (task, description, is_open) VALUES (?, '', 0)",
+            [(t,) for t in closed_tasks or ()],
+        )
+        conn.executemany(
+            "INSERT OR REPLACE INTO incoming_tasks (task, description, is_open) VALUES (?, ?, 1)",
+            [(issue['task'], issue['description']) for issue in issues],
+        )
+
+        if closed_tasks is None:
+            stale_filter = "task NOT IN (SELECT task FROM incoming_tasks WHERE is_open)"
+        else:
+            stale_filter = "task IN (SELECT task FROM incoming_tasks WHERE NOT is_open)"
+        closed = conn.execute(
+            f"UPDATE tasks SET task_type = 'closed' WHERE task_type = 'open' AND {stale_filter} "
+            "RETURNING task"
+        ).fetchall()
+        updated = conn.execute(
+            "UPDATE tasks SET description = i.description, task_type = 'open' "
+            "FROM incoming_tasks AS i "
+            "WHERE i.is_open AND tasks.task = i.task "
+            "  AND (tasks.description IS NOT i.description OR tasks.task_type <> 'open') "
+            "RETURNING tasks.task"
+        ).fetchall()
+        added = conn.execute(
+            "INSERT INTO tasks (task, description, task_type) "
+            "SELECT task, description, 'open' FROM incoming_tasks "
+            "WHERE is_open AND task NOT IN (SELECT task FROM tasks) "
+            "RETURNING task"
+        ).fetchall()
+
+        conn.execute("DELETE FROM incoming_tasks")
+        if state is not None:
             conn.execute(
-                "INSERT INTO tasks (task, description, task_type) VALUES (?, ?, 'open') "
-                "ON CONFLICT(task) DO UPDATE SET description=excluded.description, task_type='open'",
-                (issue['task'], issue['description']),
+                "INSERT INTO app_state (key, value) VALUES (?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET value = excluded.value",
+                state,
             )
 
+    return TaskSyncResult(
+        added=sorted(r['task'] for r in added),
+        updated=sorted(r['task'] for r in updated),
+        closed=sorted(r['task'] for r in closed),
+    )
+
+
+# ---------------------------------------------------------------------------
+# Application state
+# ---------------------------------------------------------------------------
+
+def get_app_state(key: str) -> str | None:
+    """Return the stored value for key, or None if it was never set."""
+    with _get_connection() as conn:
+        row = conn.execute("SELECT value FROM app_state WHERE key = ?", (key,)).fetchone()
+    return row['value'] if row else None
+
+
+def set_app_state(key: str, value: str) -> None:
+    """Store value under key, replacing any previous value."""
+    with _get_connection() as conn:
+        conn.execute(
+            "INSERT INTO app_state (key, value) VALUES (?, ?) "
+            "ON CONFLICT (key) DO UPDATE SET value = excluded.value",
+            (key, value),
+        )
+
 
-def mark_stale_open_tasks_closed(active_task_ids: set[str]) -> None:
-    """Set task_type='closed' for any 'open' task not in active_task_ids."""
+# ---------------------------------------------------------------------------
+# Sync state
+# ---------------------------------------------------------------------------
+
+_SYNC_STATE_COLUMNS = (
+    "s.clocking_id, s.target, s.date, s.task, s.remote_id, s.content_hash, s.status, "
+    "s.attempts, s.last_error, c.id IS NOT NULL AS clocking_exists"
+)
+
+
+def _sync_state_from_row(row: sqlite3.Row) -> SyncState:
+    return SyncState(
+        clocking_id=row['clocking_id'],
+        target=row['target'],
+        date=row['date'],
+        task=row['task'],
+        remote_id=row['remote_id'],
+        content_hash=row['content_hash'],
+        status=row['status'],
+        attempts=row['attempts'],
+        last_error=row['last_error'],
+        clocking_exists=bool(row['clocking_exists']),
+    )
+
+
+def get_sync_states(target: str, date: str, clocking_ids: list[int]) -> list[SyncState]:
+    """
+    Return the target's sync rows for a day
+
+    Args:
+        target: Target name
+        date: Day (YYYY-MM-DD); rows last pushed on that day are returned
+        clocking_ids: Clockings now on that day; their rows are returned too, wherever
+            they were pushed before
+    """
+    placeholders = ', '.join('?' * len(clocking_ids))
     with _get_connection() as conn:
         rows = conn.execute(
-            "SELECT task FROM tasks WHERE task_type = 'open'"
+            f"SELECT {_SYNC_STATE_COLUMNS} "
+            "FROM sync_state s LEFT JOIN clockings c ON c.id = s.clocking_id "
+            f"WHERE s.target = ? AND (s.date = ? OR s.clocking_id IN ({placeholders}))",
+            (target, date, *clocking_ids),
         ).fetchall()
-        stale = [r['task'] for r in rows if r['task'] not in active_task_ids]
-        if stale:
-            conn.executemany(
-                "UPDATE tasks SET task_type = 'closed' WHERE task = ?",
-                [(t,) for t in stale],
-            )
+    return [_sync_state_from_row(r) for r in rows]
+
+
+def get_failed_sync_states(target: str, max_attempts: int) -> list[SyncState]:
+    """Return the target's rows whose last push failed fewer than max_attempts times in a row."""
+    with _get_connection() as conn:
+        rows = conn.execute(
+            f"SELECT {_SYNC_STATE_COLUMNS} "
+            "FROM sync_state s LEFT JOIN clockings c ON c.id = s.clocking_id "
+            "WHERE s.target = ? AND s.status = 'failed' AND s.attempts < ? "
+            "ORDER BY s.date, s.clocking_id",
+            (target, max_attempts),
+        ).fetchall()
+    return [_sync_state_from_row(r) for r in rows]
+
+
+def record_sync_success(
+    target: str,
+    clocking_id: int,
+    date: str,
+    task: str,
+    remote_id: str,
+    content_hash: str,
+) -> None:
+    """Record that the clocking, with the given content, now exists remotely as remote_id."""
+    with _get_connection() as conn:
+        conn.execute(
+            "INSERT INTO sync_state "
+            "(clocking_id, target, date, task, remote_id, content_hash, status, attempts) "
+            "VALUES (?, ?, ?, ?, ?, ?, 'synced', 0) "
+            "ON CONFLICT (clocking_id, target) DO UPDATE SET "
+            "date = excluded.date, task = excluded.task, remote_id = excluded.remote_id, "
+            "content_hash = excluded.content_hash, status = 'synced', attempts = 0, "
+            "last_error = NULL",
+            (clocking_id, target, date, task, remote_id, content_hash),
+        )
+
+
+def record_sync_failure(target: str, clocking_id: int, date: str, task: str, error: str) -> None:
+    """
+    Record a failed push attempt
+
+    The remote id and content hash of the last success are kept, so the next
+    attempt updates (or deletes) what the target already has.
+    """
+    with _get_connection() as conn:
+        conn.execute(
+            "INSERT INTO sync_state "
+            "(clocking_id, target, date, task, status, attempts, last_error) "
+            "VALUES (?, ?, ?, ?, 'failed', 1, ?) "
+            "ON CONFLICT (clocking_id, target) DO UPDATE SET "
+            "status = 'failed', attempts = attempts + 1, last_error = excluded.last_error",
+            (clocking_id, target, date, task, error),
+        )
+
+
+def delete_sync_state(target: str, clocking_id: int) -> None:
+    """Forget the clocking's push state for the target (after its remote entry was deleted)."""
+    with _get_connection() as conn:
+        conn.execute(
+            "DELETE FROM sync_state WHERE clocking_id = ? AND target = ?",
+            (clocking_id, target),
+        )
+
+
+# ---------------------------------------------------------------------------
+# Lookup cache
+# ---------------------------------------------------------------------------
+
+def get_cached_lookup(kind: str, key: str, now: int) -> tuple[str, int] | None:
+    """
+    Return the cached (value, expires_at) of a remote lookup, or None if missing or expired
+
+    Args:
+        kind: Lookup family, e.g. 'jira_project_name'
+        key: Lookup arguments joined into one string
+        now: Current epoch seconds
+    """
+    with _get_connection() as conn:
+        row = conn.execute(
+            "SELECT value, expires_at FROM lookup_cache "
+            "WHERE kind = ? AND key = ? AND expires_at > ?",
+            (kind, key, now),
+        ).fetchone()
+    return (row['value'], row['expires_at']) if row else None
+
+
+def put_cached_lookup(kind: str, key: str, value: str, expires_at: int) -> None:
+    """Store or replace a remote lookup result valid until expires_at (epoch seconds)."""
+    with _get_connection() as conn:
+        conn.execute(
+            "INSERT INTO lookup_cache (kind, key, value, expires_at) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (kind, key) DO UPDATE "
+            "SET value = excluded.value, expires_at = excluded.expires_at",
+            (kind, key, value, expires_at),
+        )
+
+
+def delete_cached_lookups(
+    kinds: list[str] | None = None,
+    expired_before: int | None = None,
+) -> None:
+    """
+    Delete cached lookups
+
+    Args:
+        kinds: Only delete these lookup families (None for all)
+        expired_before: Only delete entries that expired before this epoch second
+    """
+    clauses, params = [], []
+    if kinds is not None:
+        clauses.append(f"kind IN ({', '.join('?' * len(kinds))})")
+        params.extend(kinds)
+    if expired_before is not None:
+        clauses.append("expires_at <= ?")
+        params.append(expired_before)
+    where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+    with _get_connection() as conn:
+        conn.execute(f"DELETE FROM lookup_cache{where}", params)
+
+
+# ---------------------------------------------------------------------------
+# Maintenance command line
+# ---------------------------------------------------------------------------
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    Check or rebuild daily_task_totals of the app's database.
+
+    Run as `python -m services.database --check-totals` or `--rebuild-totals`.
+
+    Returns:
+        Exit status: 1 if --check-totals found mismatches, 0 otherwise
+    """
+    parser = argparse.ArgumentParser(
+        prog='python -m services.database',
+        description='Maintenance commands for the clocking database.',
+    )
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument('--check-totals', action='store_true',
+                       help='list days whose daily_task_totals disagree with clockings')
+    group.add_argument('--rebuild-totals', action='store_true',
+                       help='recompute daily_task_totals from clockings')
+    args = parser.parse_args(argv)
+
+    init_db()
+    if args.rebuild_totals:
+        rebuild_daily_task_totals()
+        print('daily_task_totals rebuilt.')
+        return 0
+
+    mismatches = check_daily_task_totals()
+    for m in mismatches:
+        print(f'{m.date} {m.task}: expected {m.expected_seconds}s/{m.expected_sessions} '
+              f'sessions, stored {m.stored_seconds}s/{m.stored_sessions} sessions')
+    print(f'{len(mismatches)} mismatch(es) found.')
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,270 @@
+"""
+Opt-in instrumentation: per-call latency histograms of the hot paths and a cProfile of the run.
+
+Turned on with the CLOCKING_PROFILE environment variable or the --profile
+flag of app.py. install() must run before the instrumented modules are
+imported by the rest of the app, because modules that import functions by
+name keep the function they got. Modules imported later (the network
+clients are imported on first use) are wrapped as they load.
+"""
+import bisect
+import cProfile
+import datetime
+import functools
+import importlib.abc
+import inspect
+import os
+import sys
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+
+PROFILE_ENV = 'CLOCKING_PROFILE'
+PROFILE_FLAG = '--profile'
+
+# Upper bounds (ms) of the histogram buckets; a last bucket holds slower calls.
+BUCKET_BOUNDS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+# Module -> qualified names to time; None times every public function defined in it.
+# Only whole operations are listed: helpers they call on every use (the database
+# path and connection getters, the cached network clients) would show up as
+# operations of their own and add the wrapper's overhead inside the measured call.
+INSTRUMENTED: dict[str, list[str] | None] = {
+    'services.database': [
+        'init_db', 'get_schema_version', 'get_data_version',
+        'get_all_clockings', 'get_clockings_since', 'get_clockings_page',
+        'get_clockings_for_date', 'get_open_clocking', 'get_today_completed_seconds',
+        'get_task_durations_for_date', 'insert_clocking', 'update_check_out',
+        'upsert_clocking', 'delete_clocking', 'save_clockings',
+        'rebuild_daily_task_totals', 'check_daily_task_totals',
+        'get_all_tasks', 'get_tasks_by_type', 'get_task_descriptions', 'save_tasks',
+        'sync_open_tasks', 'get_app_state', 'set_app_state',
+        'get_sync_states', 'get_failed_sync_states', 'record_sync_success',
+        'record_sync_failure', 'delete_sync_state',
+        'get_cached_lookup', 'put_cached_lookup', 'delete_cached_lookups',
+    ],
+    'services.jira_api': [
+        'get_project_name', 'create_jira_worklog', 'update_jira_worklog',
+        'delete_jira_worklog', 'get_jira_open_issues', 'get_jira_issue_changes',
+        'fetch_open_issue_changes',
+    ],
+    'services.clockify_api': [
+        'find_clockify_project', 'list_clockify_tasks', 'find_or_create_clockify_task',
+        'create_clockify_entry', 'update_clockify_entry', 'delete_clockify_entry',
+        'warm_project_lookups',
+    ],
+    'windows.clocking': ['Clocking.update_table', 'Clocking.update_buttons'],
+}
+
+
+@dataclass
+class Histogram:
+    """Latencies of one function, bucketed by BUCKET_BOUNDS_MS."""
+    buckets: list[int] = field(default_factory=lambda: [0] * (len(BUCKET_BOUNDS_MS) + 1))
+    calls: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+
+    def add(self, ms: float) -> None:
+        self.buckets[bisect.bisect_left(BUCKET_BOUNDS_MS, ms)] += 1
+        self.calls += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def percentile(self, fraction: float) -> float:
+        """Return the upper bound of the bucket holding the given fraction of calls."""
+        rank = fraction * self.calls
+        seen = 0
+        for bound, count in zip(BUCKET_BOUNDS_MS, self.buckets):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max_ms)
+        return self.max_ms
+
+
+class LatencyRecorder:
+    """Thread-safe collection of per-function histograms."""
+
+    def __init__(self):
+        self._histograms: dict[str, Histogram] = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, ms: float) -> None:
+        with self._lock:
+            self._histograms.setdefault(name, Histogram()).add(ms)
+
+    def snapshot(self) -> dict[str, Histogram]:
+        with self._lock:
+            return {name: Histogram(list(h.buckets), h.calls, h.total_ms, h.max_ms)
+                    for name, h in self._histograms.items()}
+
+    def report(self) -> str:
+        """Return the histograms as a text table, slowest total first."""
+        histograms = sorted(self.snapshot().items(), key=lambda item: -item[1].total_ms)
+        bounds = [f'<={b:g}' for b in BUCKET_BOUNDS_MS] + ['more']
+        lines = [
+            f"{'function':<48}{'calls':>7}{'total ms':>11}{'mean ms':>9}"
+            f"{'p50 ms':>9}{'p95 ms':>9}{'max ms':>9}  buckets (ms: calls)",
+        ]
+        for name, h in histograms:
+            buckets = ', '.join(f'{b}: {n}' for b, n in zip(bounds, h.buckets) if n)
+            lines.append(
+                f'{name:<48}{h.calls:>7}{h.total_ms:>11.2f}{h.total_ms / h.calls:>9.3f}'
+                f'{h.percentile(0.5):>9.2f}{h.percentile(0.95):>9.2f}{h.max_ms:>9.2f}  {buckets}'
+            )
+        return '\n'.join(lines) + '\n'
+
+
+def timed(name: str, recorder: LatencyRecorder) -> Callable[[Callable], Callable]:
+    """Decorator recording the latency of every call, successful or not, under `name`."""
+    def decorator(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                recorder.record(name, (time.perf_counter() - started) * 1000)
+
+        wrapper.__instrumented__ = True
+        return wrapper
+    return decorator
+
+
+def instrument_module(module, names: list[str] | None, recorder: LatencyRecorder) -> list[str]:
+    """
+    Replace functions of a loaded module with timed wrappers
+
+    Args:
+        module: Module to instrument
+        names: Qualified names such as 'func' or 'Class.method'; None for every
+            public function defined in the module
+        recorder: Where the latencies go
+
+    Returns:
+        Qualified names that were wrapped
+    """
+    if names is None:
+        names = [name for name, value in vars(module).items()
+                 if inspect.isfunction(value) and not name.startswith('_')
+                 and value.__module__ == module.__name__]
+    wrapped = []
+    for qualname in names:
+        *path, attr = qualname.split('.')
+        owner = functools.reduce(getattr, path, module)
+        fn = getattr(owner, attr)
+        if getattr(fn, '__instrumented__', False):
+            continue
+        setattr(owner, attr, timed(f'{module.__name__}.{qualname}', recorder)(fn))
+        wrapped.append(qualname)
+    return wrapped
+
+
+class _InstrumentingFinder(importlib.abc.MetaPathFinder):
+    """Wraps the functions of an instrumented module right after it is first imported."""
+
+    def __init__(self, targets: dict[str, list[str] | None], recorder: LatencyRecorder):
+        self._targets = targets
+        self._recorder = recorder
+
+    def find_spec(self, fullname, path, target=None):
+        if fullname not in self._targets:
+            return None
+        for finder in sys.meta_path:
+            if finder is self:
+                continue
+            spec = finder.find_spec(fullname, path, target) \
+                if hasattr(finder, 'find_spec') else None
+            if spec is not None:
+                break
+        else:
+            return None
+        exec_module = spec.loader.exec_module
+
+        def exec_and_instrument(module):
+            exec_module(module)
+            instrument_module(module, self._targets[fullname], self._recorder)
+
+        spec.loader = _LoaderProxy(spec.loader, exec_and_instrument)
+        return spec
+
+
+class _LoaderProxy(importlib.abc.Loader):
+    def __init__(self, loader, exec_module: Callable):
+        self._loader = loader
+        self.exec_module = exec_module
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+
+def enabled(argv: list[str] | None = None) -> bool:
+    """Return whether instrumentation was asked for by CLOCKING_PROFILE or --profile."""
+    value = os.environ.get(PROFILE_ENV, '').strip().lower()
+    return value not in ('', '0', 'false', 'no') or PROFILE_FLAG in (argv or [])
+
+
+class Session:
+    """An instrumented run: latency wrappers and a cProfile, written out by finish()."""
+
+    def __init__(self, targets: dict[str, list[str] | None] | None = None):
+        self.targets = INSTRUMENTED if targets is None else targets
+        self.recorder = LatencyRecorder()
+        self.profiler = cProfile.Profile()
+        self._finder = _InstrumentingFinder(self.targets, self.recorder)
+
+    def start(self) -> None:
+        for name, names in self.targets.items():
+            if name in sys.modules:
+                instrument_module(sys.modules[name], names, self.recorder)
+        sys.meta_path.insert(0, self._finder)
+        self.profiler.enable()
+
+    def finish(self, directory: Path) -> tuple[Path, Path]:
+        """
+        Stop profiling and write the reports
+
+        Args:
+            directory: Where to write them; created if missing
+
+        Returns:
+            Paths of the latency histograms (text) and the cProfile stats
+            (open with `python -m pstats`)
+        """
+        self.profiler.disable()
+        if self._finder in sys.meta_path:
+            sys.meta_path.remove(self._finder)
+        directory.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.datetime.now().strftime('%Y%m%d-%H%M%S')
+        latency_path = directory / f'{stamp}-latency.txt'
+        profile_path = directory / f'{stamp}.prof'
+        latency_path.write_text(self.recorder.report())
+        self.profiler.dump_stats(str(profile_path))
+        return latency_path, profile_path
+
+
+# Global instance
+_session: Session | None = None
+
+
+def install() -> Session:
+    """Start the global instrumented session (once); call before importing the app's windows."""
+    global _session
+    if _session is None:
+        _session = Session()
+        _session.start()
+    return _session
+
+
+def finish(directory: Path) -> tuple[Path, Path] | None:
+    """Write the global session's reports, if one was installed."""
+    global _session
+    if _session is None:
+        return None
+    session, _session = _session, None
+    return session.finish(directory)
@@ -1,24 +1,58 @@
 import datetime
-from functools import cache
+import math
+import threading
+import time
+from dataclasses import dataclass, field
 
-from jira import JIRA
+from jira import JIRA, JIRAError
+from requests.adapters import HTTPAdapter
 
 from services.config_manager import get_config_manager
+from services.constants import JIRA_FULL_SYNC_INTERVAL_SECONDS, JIRA_SEARCH_PAGE_SIZE
+from services.database import get_app_state
 from services.exceptions import ClockingException
+from services.lookup_cache import persistent_cache
 
 OPEN_ISSUE_STATUS = ['Backlog', 'Review', 'In Progress', 'To Do', 'Triage', 'Blocked']
+OPEN_ISSUE_FIELDS = ['status', 'summary']
+# Extra minutes searched before the watermark, for clock skew between us and Jira
+SYNC_OVERLAP_MINUTES = 2
 
+# (connect, read) seconds for every Jira request
+DEFAULT_TIMEOUT = (5, 30)
+POOL_SIZE = 8
 
-def get_jira():
+_client_lock = threading.Lock()
+_clients: dict[tuple[str, str, str], JIRA] = {}
+
+
+def _build_client(url: str, email: str, token: str) -> JIRA:
+    # The server-info probe (once per client) sets deploymentType, which picks the
+    # search API: Jira Cloud has removed the one Server/Data Center still use
+    client = JIRA(url, basic_auth=(email, token), timeout=DEFAULT_TIMEOUT)
+    # Parallel pushes share the client, so keep enough connections alive for them
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_SIZE)
+    client._session.mount('https://', adapter)
+    client._session.mount('http://', adapter)
+    return client
+
+
+def get_jira() -> JIRA:
+    """Return the authenticated client for the configured credentials, creating it once."""
     config = get_config_manager()
-    user_email = config.get('ATLASSIAN_EMAIL')
-    return JIRA(
+    key = (
         config.get('ATLASSIAN_URL'),
-        basic_auth=(user_email, config.get('ATLASSIAN_TOKEN')),
+        config.get('ATLASSIAN_EMAIL'),
+        config.get('ATLASSIAN_TOKEN'),
     )
+    with _client_lock:
+        client = _clients.get(key)
+        if client is None:
+            client = _clients[key] = _build_client(*key)
+    return client
 
 
-@cache
+@persistent_cache('jira_project_name')
 def get_project_name(project_key: str) -> str:
     try:
         project = get_jira().project(project_key, expand='name')
@@ -28,16 +62,18 @@ def get_project_name(project_key: str) -> str:
 
 
 def clear_jira_cache() -> None:
-    """Clear cached Jira API results (call after credential updates)."""
+    """Clear cached Jira API results and clients (call after credential updates)."""
     get_project_name.cache_clear()
+    with _client_lock:
+        clients = list(_clients.values())
+        _clients.clear()
+    for client in clients:
+        client.close()
 
 
 def push_worklog_to_jira(issue_key: str, start_datetime: datetime.datetime, duration: datetime.timedelta) -> bool:
     try:
-        t = int(duration.total_seconds())
-        timeSpent = str(t)
-
-        get_jira().add_worklog(issue_key, timeSpentSeconds=timeSpent, started=start_datetime)
+        create_jira_worklog(issue_key, start_datetime, duration)
         return True
     except Exception as e:
         print(f"Error pushing worklog to Jira: {e}")
@@ -45,16 +81,151 @@ def push_worklog_to_jira(issue_key: str, start_datetime: datetime.datetime, dura
     return False
 
 
+def create_jira_worklog(
+    issue_key: str,
+    start_datetime: datetime.datetime,
+    duration: datetime.timedelta,
+) -> str:
+    """Add a worklog to the issue and return its id."""
+    timeSpent = str(int(duration.total_seconds()))
+    worklog = get_jira().add_worklog(issue_key, timeSpentSeconds=timeSpent, started=start_datetime)
+    return str(worklog.id)
+
+
+def update_jira_worklog(
+    issue_key: str,
+    worklog_id: str,
+    start_datetime: datetime.datetime,
+    duration: datetime.timedelta,
+) -> None:
+    """Change the start and time spent of an existing worklog."""
+    # Same format add_worklog sends, so an updated worklog matches a created one
+    if start_datetime.tzinfo is None:
+        started = start_datetime.strftime("%Y-%m-%dT%H:%M:%S.000+0000")
+    else:
+        started = start_datetime.strftime("%Y-%m-%dT%H:%M:%S.000%z")
+    get_jira().worklog(issue_key, worklog_id).update(
+        fields={'started': started, 'timeSpentSeconds': int(duration.total_seconds())})
+
+
+def delete_jira_worklog(issue_key: str, worklog_id: str) -> None:
+    """
+    Delete a worklog; one that is already gone counts as deleted.
+
+    The remaining estimate is adjusted back the way add_worklog adjusted it.
+    """
+    try:
+        get_jira().worklog(issue_key, worklog_id).delete()
+    except JIRAError as e:
+        if e.status_code != 404:
+            raise
+
+
+@dataclass
+class OpenIssueChanges:
+    """Result of fetch_open_issue_changes(), applied to the tasks table by the caller."""
+    open_issues: list[dict]                               # {task, description} of open issues
+    closed_tasks: set[str] = field(default_factory=set)   # changed issues no longer open
+    full: bool = False          # open_issues is the complete list, not a delta
+    started_at: float = 0.0     # epoch seconds; the next watermark once applied
+    watermark_key: str = ''     # app_state key to store started_at under
+
+
+def _search_all(jql: str) -> list:
+    """
+    Run a JQL search page by page and return every matching issue.
+
+    Jira Cloud only pages with the nextPageToken of its search/jql endpoint;
+    Server/Data Center pages with startAt.
+    """
+    jira = get_jira()
+    issues = []
+    if jira.deploymentType == 'Cloud':
+        token = None
+        while True:
+            page = jira.enhanced_search_issues(
+                jql,
+                nextPageToken=token,
+                maxResults=JIRA_SEARCH_PAGE_SIZE,
+                fields=list(OPEN_ISSUE_FIELDS),
+            )
+            issues.extend(page)
+            token = page.nextPageToken
+            if not token:
+                return issues
+    while True:
+        page = jira.search_issues(
+            jql,
+            startAt=len(issues),
+            maxResults=JIRA_SEARCH_PAGE_SIZE,
+            fields=list(OPEN_ISSUE_FIELDS),
+            validate_query=False,
+        )
+        issues.extend(page)
+        if len(page) < JIRA_SEARCH_PAGE_SIZE or len(issues) >= page.total:
+            return issues
+
+
+def _open_status_jql() -> str:
+    return ', '.join(f'"{status}"' for status in OPEN_ISSUE_STATUS)
+
+
+def _issue_dict(issue) -> dict:
+    return {'task': issue.key, 'description': issue.get_field('summary')}
+
+
 def get_jira_open_issues() -> list[dict]:
+    """Return every open issue assigned to the configured user."""
     config = get_config_manager()
     user_email = config.get('ATLASSIAN_EMAIL')
-    issues = get_jira().search_issues(f'assignee="{user_email}"', fields=['status', 'summary'])
+    jql = f'assignee = "{user_email}" AND status in ({_open_status_jql()})'
+    return [_issue_dict(issue) for issue in _search_all(jql)]
+
+
+def get_jira_issue_changes(minutes: int) -> tuple[list[dict], set[str]]:
+    """
+    Return the user's issues updated in the last `minutes` minutes
 
-    open_issues = []
-    for issue in issues:
-        status = issue.get_field('status').name
-        if status in OPEN_ISSUE_STATUS:
-            summary: str = issue.get_field('summary')
-            open_issues.append({'task': issue.key, 'description': summary})
+    Args:
+        minutes: Size of the window; relative JQL dates avoid time zone conversions
 
-    return open_issues
+    Returns:
+        The changed issues that are open, and the keys of those that are not
+    """
+    config = get_config_manager()
+    user_email = config.get('ATLASSIAN_EMAIL')
+    jql = f'assignee = "{user_email}" AND updated >= "-{minutes}m"'
+    open_issues, closed_tasks = [], set()
+    for issue in _search_all(jql):
+        if issue.get_field('status').name in OPEN_ISSUE_STATUS:
+            open_issues.append(_issue_dict(issue))
+        else:
+            closed_tasks.add(issue.key)
+    return open_issues, closed_tasks
+
+
+def fetch_open_issue_changes(now: float | None = None) -> OpenIssueChanges:
+    """
+    Fetch what changed in the user's open issues since the last applied sync
+
+    Only issues updated since the stored watermark are searched. Without a
+    watermark, or when it is older than JIRA_FULL_SYNC_INTERVAL_SECONDS, the
+    full list of open issues is fetched instead; that also catches issues
+    reassigned to someone else, which a delta cannot see.
+
+    Args:
+        now: Current epoch seconds (tests pass a fixed value)
+    """
+    config = get_config_manager()
+    account = f"{config.get('ATLASSIAN_URL')}|{config.get('ATLASSIAN_EMAIL')}"
+    key = f'jira_open_issues_synced_at:{account}'
+    started_at = time.time() if now is None else now
+    last_sync = get_app_state(key)
+
+    if last_sync is None or started_at - float(last_sync) > JIRA_FULL_SYNC_INTERVAL_SECONDS:
+        return OpenIssueChanges(get_jira_open_issues(), full=True,
+                                started_at=started_at, watermark_key=key)
+
+    minutes = math.ceil(max(started_at - float(last_sync), 0) / 60) + SYNC_OVERLAP_MINUTES
+    open_issues, closed_tasks = get_jira_issue_changes(minutes)
+    return OpenIssueChanges(open_issues, closed_tasks, started_at=started_at, watermark_key=key)
@@ -0,0 +1,46 @@
+"""Resolve task keys to Jira issue links, built once per configuration version."""
+import re
+from collections.abc import Iterable
+
+from services.config_manager import ConfigManager, get_config_manager
+
+
+class JiraLinkResolver:
+    """Maps task keys with one of the configured Jira prefixes to their browse URL."""
+
+    def __init__(self, base_url: str, prefixes: Iterable[str]):
+        """
+        Args:
+            base_url: Atlassian site URL; no links are resolved when empty
+            prefixes: Jira project keys, matched case-insensitively before a '-'
+        """
+        self.base_url = base_url.rstrip('/')
+        keys = [p.strip() for p in prefixes if p.strip()]
+        self._pattern = (
+            re.compile(f"(?:{'|'.join(map(re.escape, keys))})-", re.IGNORECASE)
+            if self.base_url and keys else None
+        )
+
+    @classmethod
+    def from_config(cls, config: ConfigManager) -> 'JiraLinkResolver':
+        """Build a resolver from ATLASSIAN_URL and the comma separated JIRA_TASK_PREFIX."""
+        return cls(config.get('ATLASSIAN_URL', ''), config.get('JIRA_TASK_PREFIX', '').split(','))
+
+    def url_for(self, task: str) -> str | None:
+        """Return the Jira URL of the task, or None if it is not a Jira issue."""
+        if self._pattern is None or not self._pattern.match(task):
+            return None
+        return f'{self.base_url}/browse/{task}'
+
+
+# Global instance, with the configuration and version it was built from
+_resolver: tuple[ConfigManager, int, JiraLinkResolver] | None = None
+
+
+def get_jira_link_resolver() -> JiraLinkResolver:
+    """Get the resolver for the current configuration, rebuilt after it changes."""
+    global _resolver
+    config = get_config_manager()
+    if _resolver is None or _resolver[0] is not config or _resolver[1] != config.version:
+        _resolver = (config, config.version, JiraLinkResolver.from_config(config))
+    return _resolver[2]
@@ -0,0 +1,117 @@
+"""Remote id lookups cached in memory and in the database across launches."""
+import functools
+import logging
+import sqlite3
+import threading
+import time
+from collections.abc import Callable
+
+from services.constants import LOOKUP_CACHE_TTL_SECONDS
+from services.database import delete_cached_lookups, get_cached_lookup, put_cached_lookup
+
+
+class LookupCache:
+    """
+    Two-level cache of string lookups: memory first, then the lookup_cache table.
+
+    Entries expire after ttl_seconds. A database error only costs the disk
+    level; lookups keep working from memory.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: int = LOOKUP_CACHE_TTL_SECONDS,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Args:
+            ttl_seconds: Lifetime of a stored entry
+            clock: Epoch-seconds clock (tests pass a fake)
+        """
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._memory: dict[tuple[str, str], tuple[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, kind: str, key: str) -> str | None:
+        """Return the cached value, or None on a miss or an expired entry."""
+        now = int(self._clock())
+        with self._lock:
+            entry = self._memory.get((kind, key))
+        if entry is not None and entry[1] > now:
+            return entry[0]
+        try:
+            entry = get_cached_lookup(kind, key, now)
+        except sqlite3.Error as e:
+            logging.warning(f"Lookup cache unavailable: {e}")
+            return None
+        if entry is None:
+            return None
+        with self._lock:
+            self._memory[(kind, key)] = entry
+        return entry[0]
+
+    def put(self, kind: str, key: str, value: str) -> None:
+        expires_at = int(self._clock()) + self.ttl_seconds
+        with self._lock:
+            self._memory[(kind, key)] = (value, expires_at)
+        try:
+            put_cached_lookup(kind, key, value, expires_at)
+        except sqlite3.Error as e:
+            logging.warning(f"Lookup cache unavailable: {e}")
+
+    def invalidate(self, kinds: list[str] | None = None) -> None:
+        """Forget the given lookup families (all of them if kinds is None)."""
+        with self._lock:
+            if kinds is None:
+                self._memory.clear()
+            else:
+                for cache_key in [k for k in self._memory if k[0] in kinds]:
+                    del self._memory[cache_key]
+        try:
+            delete_cached_lookups(kinds)
+        except sqlite3.Error as e:
+            logging.warning(f"Lookup cache unavailable: {e}")
+
+    def purge_expired(self) -> None:
+        """Delete expired entries from the lookup_cache table."""
+        try:
+            delete_cached_lookups(expired_before=int(self._clock()))
+        except sqlite3.Error as e:
+            logging.warning(f"Lookup cache unavailable: {e}")
+
+
+# Global instance
+_lookup_cache: LookupCache | None = None
+
+
+def get_lookup_cache() -> LookupCache:
+    """Get or create the global LookupCache instance"""
+    global _lookup_cache
+    if _lookup_cache is None:
+        _lookup_cache = LookupCache()
+        _lookup_cache.purge_expired()
+    return _lookup_cache
+
+
+def persistent_cache(kind: str) -> Callable:
+    """
+    Memoize a function of string arguments returning a string in the LookupCache.
+
+    Like functools.cache, the wrapper has cache_clear(); it drops the
+    `kind` entries from memory and disk. Exceptions are not cached.
+    """
+    def decorator(fn: Callable[..., str]) -> Callable[..., str]:
+        @functools.wraps(fn)
+        def wrapper(*args: str) -> str:
+            key = '\x1f'.join(str(a) for a in args)
+            cache = get_lookup_cache()
+            value = cache.get(kind, key)
+            if value is None:
+                value = fn(*args)
+                cache.put(kind, key, value)
+            return value
+
+        wrapper.cache_clear = lambda: get_lookup_cache().invalidate([kind])
+        return wrapper
+    return decorator
@@ -0,0 +1,142 @@
+"""Push worklogs to several targets in parallel, within per-target limits."""
+import threading
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: on average `rate` acquisitions per second,
+    with bursts of up to `capacity`.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: int,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum number of stored tokens (the burst size)
+            clock: Monotonic clock in seconds (tests pass a fake)
+            sleep: Sleep function used while waiting for a token
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = float(capacity)
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _take(self) -> float:
+        """Take a token if one is available; otherwise return the seconds to wait."""
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self) -> None:
+        """Block until a token is available and take it."""
+        while (wait := self._take()) > 0:
+            self._sleep(wait)
+
+
+@dataclass
+class PushTarget:
+    """A remote system worklogs are pushed to, with its concurrency and rate limits."""
+    name: str
+    max_in_flight: int
+    rate_per_second: float
+    burst: int = 1
+    _slots: threading.Semaphore = field(init=False, repr=False)
+    _bucket: TokenBucket = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self._slots = threading.Semaphore(self.max_in_flight)
+        self._bucket = TokenBucket(self.rate_per_second, self.burst)
+
+
+@dataclass
+class PushJob:
+    """One worklog for one target; `send` performs the request and returns success."""
+    target: PushTarget
+    task: str
+    duration_seconds: int
+    send: Callable[[], bool]
+    action: str = 'create'      # 'create' | 'update' | 'delete', for logging
+
+
+@dataclass
+class PushResult:
+    job: PushJob
+    ok: bool
+    error: Exception | None = None
+
+
+class PushEngine:
+    """
+    Runs PushJobs on a bounded thread pool.
+
+    Jobs for different targets proceed in parallel; per target, at most
+    max_in_flight requests run at once and requests start no faster than
+    the target's token bucket allows.
+    """
+
+    def __init__(self, max_workers: int = 8):
+        self.max_workers = max_workers
+
+    def _run_job(self, job: PushJob, is_cancelled: Callable[[], bool]) -> PushResult | None:
+        if is_cancelled():
+            return None
+        target = job.target
+        with target._slots:
+            if is_cancelled():
+                return None
+            target._bucket.acquire()
+            try:
+                return PushResult(job, bool(job.send()))
+            except Exception as e:
+                return PushResult(job, False, e)
+
+    def run(
+        self,
+        jobs: Iterable[PushJob],
+        on_result: Callable[[PushResult], None] | None = None,
+        is_cancelled: Callable[[], bool] = lambda: False,
+    ) -> list[PushResult]:
+        """
+        Push all jobs and return their results in completion order.
+
+        Args:
+            jobs: Worklogs to push
+            on_result: Called from the calling thread as each job completes
+            is_cancelled: Polled before each request; jobs not started yet are skipped
+
+        Returns:
+            Results of the jobs that ran
+        """
+        jobs = list(jobs)
+        if not jobs:
+            return []
+        results = []
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(jobs)),
+                                thread_name_prefix='push') as executor:
+            futures = [executor.submit(self._run_job, job, is_cancelled) for job in jobs]
+            for future in as_completed(futures):
+                result = future.result()
+                if result is None:
+                    continue
+                results.append(result)
+                if on_result is not None:
+                    on_result(result)
+        return results
@@ -0,0 +1,239 @@
+"""Push outbox: which clockings each target already has, and what it still needs."""
+import datetime
+import hashlib
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+
+from services.clockify_api import (
+    create_clockify_entry,
+    delete_clockify_entry,
+    update_clockify_entry,
+)
+from services.coalesce import CoalesceRule, coalesce
+from services.constants import (
+    CLOCKIFY_MAX_IN_FLIGHT,
+    CLOCKIFY_REQUESTS_PER_SECOND,
+    JIRA_MAX_IN_FLIGHT,
+    JIRA_REQUESTS_PER_SECOND,
+)
+from services.database import (
+    ClockingRecord,
+    SyncState,
+    delete_sync_state,
+    get_clockings_for_date,
+    get_failed_sync_states,
+    get_sync_states,
+    record_sync_failure,
+    record_sync_success,
+)
+from services.jira_api import create_jira_worklog, delete_jira_worklog, update_jira_worklog
+from services.push_engine import PushJob, PushTarget
+
+_FMT = "%Y-%m-%d %H:%M"
+
+CREATE = 'create'
+UPDATE = 'update'
+DELETE = 'delete'
+
+
+@dataclass
+class SyncTarget:
+    """
+    How to mirror clockings into one remote system.
+
+    create returns the new remote id; update returns the remote id the entry
+    has afterwards (it may change); delete removes the remote entry. Requests
+    go out within the limits of push_target.
+    """
+    name: str
+    create: Callable[[ClockingRecord], str]
+    update: Callable[[SyncState, ClockingRecord], str]
+    delete: Callable[[SyncState], None]
+    push_target: PushTarget | None = None
+
+
+@dataclass
+class SyncAction:
+    """One remote change; run() performs it and records the outcome in sync_state."""
+    kind: str                       # CREATE | UPDATE | DELETE
+    target: SyncTarget
+    clocking_id: int
+    date: str
+    task: str
+    duration_seconds: int
+    record: ClockingRecord | None = None    # None for DELETE
+    state: SyncState | None = None          # None for CREATE
+
+    def run(self) -> bool:
+        name = self.target.name
+        try:
+            if self.kind == DELETE:
+                self.target.delete(self.state)
+                delete_sync_state(name, self.clocking_id)
+                return True
+            if self.kind == UPDATE:
+                remote_id = self.target.update(self.state, self.record)
+            else:
+                remote_id = self.target.create(self.record)
+        except Exception as e:
+            record_sync_failure(name, self.clocking_id, self.date, self.task, str(e))
+            raise
+        record_sync_success(name, self.clocking_id, self.record.date, self.record.task,
+                            remote_id, content_hash(self.record))
+        return True
+
+
+def content_hash(record: ClockingRecord) -> str:
+    """Hash of the fields that are pushed; a changed hash means the remote entry is stale."""
+    content = '\x1f'.join((record.task, record.date, record.check_in, record.check_out or ''))
+    return hashlib.sha256(content.encode()).hexdigest()[:16]
+
+
+def clocking_span(record: ClockingRecord) -> tuple[datetime.datetime, datetime.datetime]:
+    """Return the (start, end) pushed for a completed clocking, on the clocking's date."""
+    date = datetime.date.fromisoformat(record.date)
+    check_in = datetime.datetime.strptime(record.check_in, _FMT)
+    check_out = datetime.datetime.strptime(record.check_out, _FMT)
+    start = datetime.datetime(date.year, date.month, date.day, check_in.hour, check_in.minute)
+    return start, start + (check_out - check_in)
+
+
+def _duration_seconds(record: ClockingRecord) -> int:
+    start, end = clocking_span(record)
+    return int((end - start).total_seconds())
+
+
+def plan_sync(
+    target: SyncTarget,
+    day: str,
+    records: list[ClockingRecord],
+    rule: CoalesceRule | None = None,
+) -> list[SyncAction]:
+    """
+    Return the remote changes that bring the target in line with a day's clockings
+
+    New clockings are created, ones changed since their last successful push
+    (or whose last attempt failed) are updated, and entries of clockings
+    deleted locally are deleted. Clockings already pushed as they are need
+    no request, so pushing a day twice sends nothing the second time.
+
+    With a coalescing rule, each group of merged sessions is one entry tracked
+    under its first clocking; entries pushed before for the other sessions of
+    the group are deleted.
+
+    Args:
+        target: Remote system to plan for
+        day: Day (YYYY-MM-DD) being pushed
+        records: The day's clockings; open ones are skipped
+        rule: How sessions of the same task are merged; None pushes each one
+    """
+    groups = coalesce(records, rule or CoalesceRule())
+    absorbed = {member for g in groups for member in g.member_ids if member != g.record.id}
+    records = [g.record for g in groups]
+    states = {s.clocking_id: s for s in get_sync_states(
+        target.name, day, [r.id for r in records] + sorted(absorbed))}
+
+    actions = []
+    for record in records:
+        state = states.pop(record.id, None)
+        common = dict(target=target, clocking_id=record.id, date=record.date, task=record.task,
+                      duration_seconds=_duration_seconds(record), record=record)
+        if state is None or state.remote_id is None:
+            actions.append(SyncAction(CREATE, **common))
+        elif state.status == 'failed' or state.content_hash != content_hash(record):
+            actions.append(SyncAction(UPDATE, state=state, **common))
+
+    # Left over: rows last pushed on this day whose clocking is no longer on it, or
+    # is now merged into another session's entry. A clocking moved to another day
+    # is updated when that day is pushed.
+    for state in states.values():
+        if state.remote_id is not None and (not state.clocking_exists
+                                            or state.clocking_id in absorbed):
+            actions.append(SyncAction(DELETE, target, state.clocking_id, state.date, state.task,
+                                      0, state=state))
+    return actions
+
+
+def plan_retries(
+    target: SyncTarget,
+    max_attempts: int,
+    rule: CoalesceRule | None = None,
+) -> list[SyncAction]:
+    """
+    Return the actions that retry the target's failed pushes
+
+    Only rows whose last attempt failed are retried, planned like a push of
+    their day; clockings the user never pushed are left alone.
+
+    Args:
+        target: Remote system to plan for
+        max_attempts: Rows that failed this many times are left to a manual push
+        rule: Coalescing rule the days are planned with
+    """
+    failed = get_failed_sync_states(target.name, max_attempts)
+    actions = []
+    for day in sorted({state.date for state in failed}):
+        ids = {state.clocking_id for state in failed if state.date == day}
+        planned = plan_sync(target, day, get_clockings_for_date(day), rule)
+        actions.extend(action for action in planned if action.clocking_id in ids)
+    return actions
+
+
+def push_jobs(plans: Iterable[list[SyncAction]]) -> list[PushJob]:
+    """Turn planned actions into push engine jobs, limited by their target's push_target."""
+    return [
+        PushJob(action.target.push_target, action.task, action.duration_seconds, action.run,
+                action.kind)
+        for actions in plans
+        for action in actions
+    ]
+
+
+# ---------------------------------------------------------------------------
+# Targets
+# ---------------------------------------------------------------------------
+
+JIRA_TARGET = PushTarget('Jira', JIRA_MAX_IN_FLIGHT, JIRA_REQUESTS_PER_SECOND,
+                         burst=JIRA_MAX_IN_FLIGHT)
+CLOCKIFY_TARGET = PushTarget('Clockify', CLOCKIFY_MAX_IN_FLIGHT, CLOCKIFY_REQUESTS_PER_SECOND,
+                             burst=CLOCKIFY_MAX_IN_FLIGHT)
+
+
+def _jira_create(record: ClockingRecord) -> str:
+    start, end = clocking_span(record)
+    return create_jira_worklog(record.task, start, end - start)
+
+
+def _jira_update(state: SyncState, record: ClockingRecord) -> str:
+    # A worklog belongs to its issue: a clocking moved to another task is re-created there
+    if state.task != record.task:
+        delete_jira_worklog(state.task, state.remote_id)
+        return _jira_create(record)
+    start, end = clocking_span(record)
+    update_jira_worklog(record.task, state.remote_id, start, end - start)
+    return state.remote_id
+
+
+def _clockify_create(record: ClockingRecord) -> str:
+    return create_clockify_entry(record.task, *clocking_span(record))
+
+
+def _clockify_update(state: SyncState, record: ClockingRecord) -> str:
+    update_clockify_entry(state.remote_id, record.task, *clocking_span(record))
+    return state.remote_id
+
+
+JIRA_SYNC = SyncTarget(
+    'Jira',
+    create=_jira_create,
+    update=_jira_update,
+    delete=lambda state: delete_jira_worklog(state.task, state.remote_id),
+    push_target=JIRA_TARGET,
+)
+CLOCKIFY_SYNC = SyncTarget(
+    'Clockify',
+    create=_clockify_create,
+    update=_clockify_update,
+    delete=lambda state: delete_clockify_entry(state.remote_id),
+    push_target=CLOCKIFY_TARGET,
+)
@@ -0,0 +1,249 @@
+"""Background sync: retry failed pushes and refresh Jira open issues, backing off while offline."""
+import datetime
+import logging
+import random
+import socket
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+from urllib.parse import urlsplit
+
+from PySide6.QtCore import QObject, QTimer, Signal
+
+from services.coalesce import get_coalesce_rule
+from services.config_manager import get_config_manager
+from services.constants import (
+    CLOCKIFY_MAX_IN_FLIGHT,
+    JIRA_MAX_IN_FLIGHT,
+    JIRA_REFRESH_INTERVAL_SECONDS,
+    SYNC_BACKOFF_BASE_SECONDS,
+    SYNC_BACKOFF_MAX_SECONDS,
+    SYNC_INTERVAL_SECONDS,
+    SYNC_MAX_ATTEMPTS,
+    SYNC_STARTUP_DELAY_SECONDS,
+)
+from services.push_engine import PushEngine
+from services.workers import Worker, get_push_pool, run_in_background
+
+# The Jira/Clockify clients are imported by the first run, on the push pool, so
+# creating the scheduler at startup does not load them.
+if TYPE_CHECKING:
+    from services.jira_api import OpenIssueChanges
+
+
+class Backoff:
+    """Exponential backoff with jitter, so many clients coming back online do not retry in step."""
+
+    def __init__(
+        self,
+        base: float = SYNC_BACKOFF_BASE_SECONDS,
+        maximum: float = SYNC_BACKOFF_MAX_SECONDS,
+        jitter: float = 0.5,
+        rng: Callable[[], float] = random.random,
+    ):
+        """
+        Args:
+            base: Delay after the first failure, in seconds
+            maximum: Upper bound of the delay
+            jitter: Fraction of the delay that is randomised (0 for none)
+            rng: Source of uniform numbers in [0, 1) (tests pass a fixed one)
+        """
+        self.base = base
+        self.maximum = maximum
+        self.jitter = jitter
+        self._rng = rng
+
+    def delay(self, failures: int) -> float:
+        """Return the seconds to wait after `failures` consecutive failed runs (at least 1)."""
+        ceiling = min(self.maximum, self.base * 2 ** (failures - 1))
+        return ceiling * (1 - self.jitter * self._rng())
+
+
+def is_reachable(url: str, timeout: float = 3.0) -> bool:
+    """Return whether a TCP connection to the URL's host can be opened."""
+    parts = urlsplit(url)
+    if not parts.hostname:
+        return False
+    port = parts.port or (443 if parts.scheme == 'https' else 80)
+    try:
+        socket.create_connection((parts.hostname, port), timeout=timeout).close()
+    except OSError:
+        return False
+    return True
+
+
+@dataclass
+class SyncRun:
+    """Outcome of one background sync run."""
+    pushed: int = 0
+    failed: int = 0
+    online: list[str] = field(default_factory=list)     # configured targets that were reached
+    offline: list[str] = field(default_factory=list)    # targets that could not be reached
+    issues: 'OpenIssueChanges | None' = None            # set when Jira was refreshed
+    refresh_error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return not (self.failed or self.offline or self.refresh_error)
+
+
+def _format_delay(seconds: float) -> str:
+    if seconds < 90:
+        return f'{round(seconds)} s'
+    return f'{round(seconds / 60)} min'
+
+
+class SyncScheduler(QObject):
+    """
+    Periodically retries failed pushes and refreshes Jira open issues.
+
+    Runs never block the GUI thread: they go to the push pool, one at a
+    time and after any manual push already queued there. A run that meets
+    an unreachable target or a failure is followed by the next one after an
+    exponential, jittered backoff; a clean run resets it to `interval`.
+    Only pushes the user started and that failed are retried.
+    """
+
+    status_changed = Signal(str)
+    open_issues_fetched = Signal(object)    # OpenIssueChanges, to apply on the GUI thread
+
+    def __init__(
+        self,
+        parent: QObject | None = None,
+        *,
+        interval: float = SYNC_INTERVAL_SECONDS,
+        refresh_interval: float = JIRA_REFRESH_INTERVAL_SECONDS,
+        backoff: Backoff | None = None,
+        reachable: Callable[[str], bool] = is_reachable,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            parent: Owner of the scheduler and its timer
+            interval: Seconds between runs while everything succeeds
+            refresh_interval: Seconds between Jira open-issue refreshes
+            backoff: Delay policy after failed runs
+            reachable: Connectivity check for a target URL
+            clock: Monotonic clock in seconds
+        """
+        super().__init__(parent)
+        self.interval = interval
+        self.refresh_interval = refresh_interval
+        self.backoff = backoff or Backoff()
+        self.engine = PushEngine(max_workers=JIRA_MAX_IN_FLIGHT + CLOCKIFY_MAX_IN_FLIGHT)
+        self.failures = 0
+        self.status = 'Sync not started'
+        self._reachable = reachable
+        self._clock = clock
+        self._last_refresh: float | None = None
+        self._worker: Worker | None = None
+        self._stopped = False
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.run_now)
+
+    def start(self, delay: float = SYNC_STARTUP_DELAY_SECONDS) -> None:
+        self._stopped = False
+        self._schedule(delay)
+
+    def stop(self) -> None:
+        """Stop scheduling runs; one in progress finishes on its own."""
+        self._stopped = True
+        self._timer.stop()
+
+    def next_run_in(self) -> float | None:
+        """Seconds until the next scheduled run, or None if none is scheduled."""
+        return self._timer.remainingTime() / 1000 if self._timer.isActive() else None
+
+    def run_now(self) -> Worker | None:
+        """Start a run unless one is in progress; returns its worker."""
+        if self._worker is not None:
+            return None
+        self._timer.stop()
+        refresh = (self._last_refresh is None
+                   or self._clock() - self._last_refresh >= self.refresh_interval)
+        self._worker = run_in_background(
+            lambda worker: self._run(worker, refresh),
+            on_finished=self._finished,
+            on_failed=self._failed,
+            pool=get_push_pool(),
+        )
+        return self._worker
+
+    def _run(self, worker: Worker, refresh: bool) -> SyncRun:
+        """Runs on the push pool."""
+        from services import clockify_api, jira_api, sync_outbox
+
+        config = get_config_manager()
+        run = SyncRun()
+        targets = []
+        for target, (configured, _), url in (
+            (sync_outbox.JIRA_SYNC, config.is_jira_configured(), config.get('ATLASSIAN_URL')),
+            (sync_outbox.CLOCKIFY_SYNC, config.is_clockify_configured(), clockify_api.API_URL),
+        ):
+            if not configured:
+                continue
+            if not self._reachable(url):
+                run.offline.append(target.name)
+                continue
+            run.online.append(target.name)
+            targets.append(target)
+
+        rule = get_coalesce_rule()
+        jobs = sync_outbox.push_jobs(
+            sync_outbox.plan_retries(target, SYNC_MAX_ATTEMPTS, rule) for target in targets)
+        for result in self.engine.run(jobs, is_cancelled=worker.is_cancelled):
+            if result.ok:
+                run.pushed += 1
+            else:
+                run.failed += 1
+
+        if refresh and sync_outbox.JIRA_SYNC in targets:
+            try:
+                run.issues = jira_api.fetch_open_issue_changes()
+            except Exception as e:
+                run.refresh_error = str(e)
+        return run
+
+    def _finished(self, run: SyncRun) -> None:
+        self._worker = None
+        if run.issues is not None:
+            self._last_refresh = self._clock()
+            self.open_issues_fetched.emit(run.issues)
+        self.failures = 0 if run.ok else self.failures + 1
+        delay = self._next_delay()
+
+        if run.offline:
+            status = f"{' and '.join(run.offline)} unreachable, retrying in {_format_delay(delay)}"
+        elif run.failed:
+            status = f'{run.failed} push(es) failed, retrying in {_format_delay(delay)}'
+        elif run.refresh_error:
+            status = f'Jira refresh failed, retrying in {_format_delay(delay)}'
+        elif not run.online:
+            status = 'Jira and Clockify are not configured'
+        else:
+            status = f"Up to date at {datetime.datetime.now().strftime('%H:%M')}"
+            if run.pushed:
+                status += f', {run.pushed} failed push(es) resent'
+        self._set_status(f'Sync: {status}')
+        self._schedule(delay)
+
+    def _failed(self, error: Exception) -> None:
+        self._worker = None
+        logging.warning(f"Background sync failed: {error}")
+        self.failures += 1
+        delay = self._next_delay()
+        self._set_status(f'Sync: error ({error}), retrying in {_format_delay(delay)}')
+        self._schedule(delay)
+
+    def _next_delay(self) -> float:
+        return self.interval if self.failures == 0 else self.backoff.delay(self.failures)
+
+    def _set_status(self, status: str) -> None:
+        self.status = status
+        self.status_changed.emit(status)
+
+    def _schedule(self, delay: float) -> None:
+        if not self._stopped:
+            self._timer.start(int(delay * 1000))
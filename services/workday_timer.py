@@ -0,0 +1,83 @@
+"""In-memory state behind the main window's one-second timer."""
+import datetime
+from collections.abc import Callable
+
+from services.database import get_data_version, get_open_clocking, get_today_completed_seconds
+
+_FMT = "%Y-%m-%d %H:%M"
+
+
+class WorkdayTimer:
+    """
+    Today's worked time, computed without touching SQLite on every tick.
+
+    Completed seconds for today and the open session's start are cached and
+    re-read only when:
+    - invalidate() is called (after the app's own check-in, check-out or edit)
+    - the date rolls over
+    - PRAGMA data_version shows another connection wrote to the database,
+      which is polled every DATA_VERSION_POLL_SECONDS
+    """
+
+    DATA_VERSION_POLL_SECONDS = 30
+
+    def __init__(self, now: Callable[[], datetime.datetime] = datetime.datetime.now):
+        """
+        Args:
+            now: Clock used for the running session and date rollover (tests pass a fake)
+        """
+        self._now = now
+        self._stale = True
+        self._date: datetime.date | None = None
+        self._completed = datetime.timedelta(0)
+        self._open_check_in: datetime.datetime | None = None
+        self._open_task: str | None = None
+        self._data_version: int | None = None
+        self._next_poll = datetime.datetime.min
+
+    def invalidate(self) -> None:
+        """Drop the cached state; the next read goes to the database."""
+        self._stale = True
+
+    def worked_today(self) -> datetime.timedelta:
+        """Return completed time today plus the running session, if any."""
+        now = self._now()
+        self._refresh_if_needed(now)
+        if self._open_check_in is None:
+            return self._completed
+        return self._completed + (now - self._open_check_in)
+
+    @property
+    def is_checked_out(self) -> bool:
+        self._refresh_if_needed(self._now())
+        return self._open_check_in is None
+
+    @property
+    def open_task(self) -> str | None:
+        self._refresh_if_needed(self._now())
+        return self._open_task
+
+    def _refresh_if_needed(self, now: datetime.datetime) -> None:
+        if not self._stale and now.date() == self._date:
+            if now < self._next_poll:
+                return
+            self._next_poll = now + datetime.timedelta(seconds=self.DATA_VERSION_POLL_SECONDS)
+            if get_data_version() == self._data_version:
+                return
+        self._load(now)
+
+    def _load(self, now: datetime.datetime) -> None:
+        self._data_version = get_data_version()
+        self._next_poll = now + datetime.timedelta(seconds=self.DATA_VERSION_POLL_SECONDS)
+        self._date = now.date()
+        self._completed = datetime.timedelta(
+            seconds=get_today_completed_seconds(self._date.isoformat())
+        )
+        open_rec = get_open_clocking()
+        if open_rec is None:
+            self._open_check_in = None
+            self._open_task = None
+        else:
+            self._open_check_in = datetime.datetime.strptime(open_rec.check_in, _FMT)
+            self._open_task = open_rec.task
+        self._stale = False
@@ -0,0 +1,135 @@
+"""Run blocking calls (Jira, Clockify) off the Qt main thread."""
+import threading
+from collections.abc import Callable
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+
+# Workers that have not delivered their final signal yet. Callers may drop
+# the Worker returned by run_in_background(), and its signals object has to
+# outlive the job until the queued signals reach the GUI thread.
+_running: set['Worker'] = set()
+
+# Shared by every pusher and not parented to any window: destroying a window
+# must not block the GUI thread until an HTTP call in flight returns.
+# Cancelling only skips requests not sent yet; those in flight run to their end.
+_push_pool: QThreadPool | None = None
+
+
+class WorkerSignals(QObject):
+    """
+    Signals of a Worker.
+
+    The object lives in the thread that created the worker (the GUI thread),
+    so slots of GUI objects connected to these signals run there as well.
+    """
+
+    started = Signal()
+    progress = Signal(object)
+    finished = Signal(object)   # return value of the job
+    failed = Signal(object)     # exception raised by the job
+    cancelled = Signal()
+
+
+class Worker(QRunnable):
+    """
+    A job for QThreadPool.
+
+    The job is called as fn(worker) so it can report progress with
+    worker.report() and stop early once worker.is_cancelled() is true.
+    Exactly one of finished, failed or cancelled is emitted at the end.
+    """
+
+    def __init__(self, fn: Callable[['Worker'], object]):
+        super().__init__()
+        # Python owns the worker; the pool must not delete it after run()
+        self.setAutoDelete(False)
+        self.signals = WorkerSignals()
+        self._fn = fn
+        self._cancel_event = threading.Event()
+
+    def cancel(self) -> None:
+        """Ask the job to stop; a job that has not started yet never runs."""
+        self._cancel_event.set()
+
+    def is_cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+
+    def report(self, value: object) -> None:
+        """Emit progress from inside the job."""
+        self.signals.progress.emit(value)
+
+    def run(self) -> None:
+        if self.is_cancelled():
+            self.signals.cancelled.emit()
+            return
+        self.signals.started.emit()
+        try:
+            result = self._fn(self)
+        except Exception as e:
+            self.signals.failed.emit(e)
+            return
+        if self.is_cancelled():
+            self.signals.cancelled.emit()
+        else:
+            self.signals.finished.emit(result)
+
+
+def run_in_background(
+    fn: Callable[[Worker], object],
+    *,
+    on_started: Callable[[], None] | None = None,
+    on_progress: Callable[[object], None] | None = None,
+    on_finished: Callable[[object], None] | None = None,
+    on_failed: Callable[[Exception], None] | None = None,
+    on_cancelled: Callable[[], None] | None = None,
+    pool: QThreadPool | None = None,
+) -> Worker:
+    """
+    Start fn(worker) on a pool thread and return the worker.
+
+    The callbacks are connected before the job starts and are queued to the
+    thread that called this function, so they may touch widgets.
+
+    Args:
+        fn: Job to run; receives the Worker for progress and cancellation
+        on_started: Called when a pool thread picks the job up
+        on_progress: Called with every value passed to worker.report()
+        on_finished: Called with the job's return value
+        on_failed: Called with the exception the job raised
+        on_cancelled: Called instead of on_finished after worker.cancel()
+        pool: Thread pool to use (defaults to QThreadPool.globalInstance())
+
+    Returns:
+        The started Worker
+    """
+    worker = Worker(fn)
+    for signal, slot in (
+        (worker.signals.started, on_started),
+        (worker.signals.progress, on_progress),
+        (worker.signals.finished, on_finished),
+        (worker.signals.failed, on_failed),
+        (worker.signals.cancelled, on_cancelled),
+    ):
+        if slot is not None:
+            signal.connect(slot)
+    # Connected after the caller's slots, so it runs once they have been called
+    for signal in (worker.signals.finished, worker.signals.failed, worker.signals.cancelled):
+        signal.connect(lambda *_: _running.discard(worker))
+    _running.add(worker)
+    (pool or QThreadPool.globalInstance()).start(worker)
+    return worker
+
+
+def get_push_pool() -> QThreadPool:
+    """
+    Get or create the pool that runs push batches one after another.
+
+    Manual pushes and the background sync share it, so two batches never
+    plan and send the same outbox rows at once. The push engine
+    parallelises the requests inside a batch itself.
+    """
+    global _push_pool
+    if _push_pool is None:
+        _push_pool = QThreadPool()
+        _push_pool.setMaxThreadCount(1)
+    return _push_pool
@@ -7,8 +7,57 @@ os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
 from PySide6.QtWidgets import QApplication  # noqa: E402
 
 
+def pytest_addoption(parser):
+    parser.addoption('--benchmarks', action='store_true',
+                     help='also run the wall-clock budget tests marked "benchmark"')
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        'markers', 'benchmark: wall-clock budget test, skipped unless --benchmarks is given')
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption('--benchmarks'):
+        return
+    skip = pytest.mark.skip(reason='wall-clock budget; run with --benchmarks')
+    for item in items:
+        if 'benchmark' in item.keywords:
+            item.add_marker(skip)
+
+
 @pytest.fixture(scope="session")
 def qt_app():
     """Session-scoped QApplication required by all Qt widget tests."""
     app = QApplication.instance() or QApplication([])
     yield app
+
+
+@pytest.fixture
+def use_db(monkeypatch):
+    """Return use(path), which points the global ConnectionManager at a database file."""
+    import services.database as db_module
+    managers = []
+
+    def use(path: str):
+        manager = db_module.ConnectionManager(lambda: path)
+        monkeypatch.setattr(db_module, '_connection_manager', manager)
+        managers.append(manager)
+        return manager
+
+    yield use
+    for manager in managers:
+        manager.close_all()
+
+
+@pytest.fixture
+def app_db(tmp_path, monkeypatch, use_db):
+    """Fresh database and LookupCache, so tests never write to the real app database."""
+    import services.database as db_module
+    import services.lookup_cache as lookup_cache_module
+
+    path = str(tmp_path / 'clocking.db')
+    use_db(path)
+    monkeypatch.setattr(lookup_cache_module, '_lookup_cache', None)
+    db_module.init_db()
+    return path
@@ -0,0 +1,222 @@
+"""Tests for the pooled Clockify HTTP session (services/clockify_api.py)."""
+import datetime
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import MagicMock
+
+import pytest
+import requests
+
+import services.clockify_api as clockify_api
+from services.exceptions import ClockingException
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+class StubClockify(ThreadingHTTPServer):
+    """Local HTTP server answering with scripted (status, headers, body) responses."""
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), _StubHandler)
+        self.responses: list[tuple[int, dict, object]] = []
+        self.requests: list[tuple[str, str, dict, int]] = []   # method, path, headers, port
+        self.delay = 0.0
+
+    @property
+    def url(self):
+        return f'http://127.0.0.1:{self.server_address[1]}/workspaces'
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def _respond(self):
+        server: StubClockify = self.server
+        length = int(self.headers.get('Content-Length') or 0)
+        if length:
+            self.rfile.read(length)
+        server.requests.append(
+            (self.command, self.path, dict(self.headers), self.client_address[1]))
+        time.sleep(server.delay)
+        status, headers, body = server.responses.pop(0) if server.responses else (200, {}, [])
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        try:
+            self.wfile.write(payload)
+        except BrokenPipeError:
+            pass    # the client timed out
+
+    do_GET = do_POST = do_PUT = do_DELETE = _respond
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub(app_db, monkeypatch):
+    server = StubClockify()
+    thread = threading.Thread(target=server.serve_forever, args=(0.01,), daemon=True)
+    thread.start()
+    config = MagicMock()
+    config.get.side_effect = lambda key, default='': {
+        'CLOCKIFY_WORKSPACE': 'ws-1', 'CLOCKIFY_API_KEY': 'key-1',
+    }.get(key, default)
+    monkeypatch.setattr(clockify_api, 'get_config_manager', lambda: config)
+    monkeypatch.setattr(clockify_api, 'API_URL', server.url)
+    clockify_api.clear_clockify_cache()
+    yield server
+    clockify_api.clear_clockify_cache()
+    server.shutdown()
+    server.server_close()
+
+
+def log_entry():
+    start = datetime.datetime(2024, 1, 2, 9, 0, tzinfo=datetime.timezone.utc)
+    return clockify_api.log_time_in_clockify(
+        'project-1', 'task-1', 'TASK-1', start, start + datetime.timedelta(hours=1))
+
+
+# ---------------------------------------------------------------------------
+# TestClockifySession
+# ---------------------------------------------------------------------------
+
+class TestClockifySession:
+    def test_requests_reuse_one_connection(self, stub):
+        for _ in range(3):
+            assert log_entry()
+        ports = {port for _, _, _, port in stub.requests}
+        assert len(stub.requests) == 3
+        assert len(ports) == 1
+
+    def test_session_sends_api_key(self, stub):
+        log_entry()
+        _, path, headers, _ = stub.requests[0]
+        assert path == '/workspaces/ws-1/time-entries'
+        assert headers['X-Api-Key'] == 'key-1'
+
+    def test_clear_cache_recreates_session(self, stub):
+        session = clockify_api.get_session()
+        assert clockify_api.get_session() is session
+        clockify_api.clear_clockify_cache()
+        assert clockify_api.get_session() is not session
+
+    def test_get_is_retried_on_5xx_and_honours_retry_after(self, stub):
+        stub.responses = [(503, {'Retry-After': '0'}, {}), (200, {}, [{'id': 'p-1'}])]
+        assert clockify_api.find_clockify_project('Project') == 'p-1'
+        assert len(stub.requests) == 2
+
+    def test_post_is_retried_on_429(self, stub):
+        stub.responses = [(429, {'Retry-After': '0'}, {}), (201, {}, {'id': 'e-1'})]
+        assert log_entry()
+        assert len(stub.requests) == 2
+
+    def test_post_is_not_retried_on_5xx(self, stub):
+        stub.responses = [(500, {}, {}), (201, {}, {'id': 'e-1'})]
+        assert not log_entry()
+        assert len(stub.requests) == 1
+
+    def test_requests_time_out_by_default_without_resending(self, stub, monkeypatch):
+        monkeypatch.setattr(clockify_api, 'DEFAULT_TIMEOUT', (1, 0.1))
+        stub.delay = 0.5
+        with pytest.raises(requests.exceptions.ConnectionError):
+            log_entry()
+        assert len(stub.requests) == 1
+
+
+# ---------------------------------------------------------------------------
+# TestTimeEntries
+# ---------------------------------------------------------------------------
+
+class TestTimeEntries:
+    @pytest.fixture
+    def resolved(self, stub, monkeypatch):
+        monkeypatch.setattr(clockify_api, '_resolve_task', lambda key: ('project-1', 'task-1'))
+        return stub
+
+    def test_create_returns_entry_id(self, resolved):
+        resolved.responses = [(201, {}, {'id': 'e-1'})]
+        start = datetime.datetime(2024, 1, 2, 9, 0, tzinfo=datetime.timezone.utc)
+        entry_id = clockify_api.create_clockify_entry(
+            'TASK-1', start, start + datetime.timedelta(hours=1))
+        assert entry_id == 'e-1'
+        assert resolved.requests[0][:2] == ('POST', '/workspaces/ws-1/time-entries')
+
+    def test_create_rejected_raises(self, resolved):
+        resolved.responses = [(400, {}, {})]
+        start = datetime.datetime(2024, 1, 2, 9, 0, tzinfo=datetime.timezone.utc)
+        with pytest.raises(ClockingException):
+            clockify_api.create_clockify_entry('TASK-1', start, start)
+
+    def test_update_puts_the_entry(self, resolved):
+        start = datetime.datetime(2024, 1, 2, 9, 0, tzinfo=datetime.timezone.utc)
+        clockify_api.update_clockify_entry('e-1', 'TASK-1', start, start)
+        assert resolved.requests[0][:2] == ('PUT', '/workspaces/ws-1/time-entries/e-1')
+
+    def test_delete_of_missing_entry_succeeds(self, resolved):
+        resolved.responses = [(404, {}, {})]
+        clockify_api.delete_clockify_entry('e-1')
+        assert resolved.requests[0][:2] == ('DELETE', '/workspaces/ws-1/time-entries/e-1')
+
+    def test_delete_failure_raises(self, resolved):
+        resolved.responses = [(403, {}, {})]
+        with pytest.raises(ClockingException):
+            clockify_api.delete_clockify_entry('e-1')
+
+
+# ---------------------------------------------------------------------------
+# TestTaskIndex
+# ---------------------------------------------------------------------------
+
+def tasks(*names):
+    return [{'id': f'id-{name}', 'name': name} for name in names]
+
+
+class TestTaskIndex:
+    def test_one_listing_for_all_tasks_of_a_project(self, stub):
+        keys = [f'PROJ-{i}' for i in range(15)]
+        stub.responses = [(200, {}, tasks(*keys))]
+        with clockify_api._lookup_lock:
+            ids = [clockify_api.find_or_create_clockify_task('p-1', key) for key in keys]
+        assert ids == [f'id-{key}' for key in keys]
+        page_size = clockify_api.CLOCKIFY_PAGE_SIZE
+        assert [r[:2] for r in stub.requests] == [
+            ('GET', f'/workspaces/ws-1/projects/p-1/tasks?page=1&page-size={page_size}')]
+
+    def test_listing_follows_pages(self, stub, monkeypatch):
+        monkeypatch.setattr(clockify_api, 'CLOCKIFY_PAGE_SIZE', 2)
+        stub.responses = [(200, {}, tasks('A-1', 'A-2')), (200, {}, tasks('A-3'))]
+        assert clockify_api.list_clockify_tasks('p-1') == {
+            'A-1': 'id-A-1', 'A-2': 'id-A-2', 'A-3': 'id-A-3'}
+        assert [r[1].split('?')[1] for r in stub.requests] == [
+            'page=1&page-size=2', 'page=2&page-size=2']
+
+    def test_miss_creates_task_and_updates_index(self, stub):
+        stub.responses = [(200, {}, tasks('A-1')), (201, {}, {'id': 'id-new'})]
+        assert clockify_api.find_or_create_clockify_task('p-1', 'A-2') == 'id-new'
+        clockify_api.find_or_create_clockify_task.cache_clear()     # only the index is left
+        assert clockify_api.find_or_create_clockify_task('p-1', 'A-2') == 'id-new'
+        assert [r[0] for r in stub.requests] == ['GET', 'POST']
+
+    def test_stale_index_is_listed_again_before_creating(self, stub, monkeypatch):
+        monkeypatch.setattr(clockify_api, 'CLOCKIFY_TASK_INDEX_TTL_SECONDS', 0)
+        stub.responses = [(200, {}, tasks('A-1')), (200, {}, tasks('A-1', 'A-2'))]
+        clockify_api.find_or_create_clockify_task('p-1', 'A-1')
+        assert clockify_api.find_or_create_clockify_task('p-1', 'A-2') == 'id-A-2'
+        assert [r[0] for r in stub.requests] == ['GET', 'GET']
+
+    def test_failed_listing_raises(self, stub):
+        stub.responses = [(403, {}, {})]
+        with pytest.raises(ClockingException):
+            clockify_api.find_or_create_clockify_task('p-1', 'A-1')
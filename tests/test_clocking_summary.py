@@ -1,22 +1,38 @@
 """Tests for the ClockingSummary UI widget (windows/clocking_summary.py)."""
 import datetime
+import itertools
+import threading
+import time
 from unittest.mock import MagicMock
 
+import pytest
+from PySide6.QtWidgets import QApplication
+
+import services.sync_outbox as sync_outbox
 from services.database import ClockingRecord, TaskDuration
+from services.exceptions import ClockingException
+from services.push_engine import PushEngine
 from windows.clocking_summary import ClockingSummary
 
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
 
+@pytest.fixture(autouse=True)
+def _db(app_db):
+    """Pushes record their outcome in sync_state."""
+
 TODAY = datetime.date.today()
 TODAY_STR = TODAY.isoformat()
 YESTERDAY_STR = (TODAY - datetime.timedelta(days=1)).isoformat()
 
 
-def make_record(date, task, check_in, check_out=None, id=0):
+_ids = itertools.count(1)
+
+
+def make_record(date, task, check_in, check_out=None, id=None):
     return ClockingRecord(
-        id=id,
+        id=next(_ids) if id is None else id,
         date=date,
         task=task,
         check_in=f"{date} {check_in}",
@@ -25,6 +41,12 @@ def make_record(date, task, check_in, check_out=None, id=0):
     )
 
 
+def wait_for_pushes(widget):
+    """Block until the widget's pushes ran and deliver their queued signals."""
+    widget.push_pool.waitForDone()
+    QApplication.processEvents()
+
+
 def _durations_for(records):
     """Compute TaskDuration list from ClockingRecord list (mirrors SQL logic)."""
     totals: dict[str, int] = {}
@@ -209,6 +231,7 @@ class TestPushToJira:
 
         widget = ClockingSummary([])
         widget.push_to_jira(TODAY_STR)
+        wait_for_pushes(widget)
         assert 'not configured' in widget.log_text.toPlainText().lower() or \
                'Jira' in widget.log_text.toPlainText()
         widget.close()
@@ -227,11 +250,12 @@ class TestPushToJira:
         monkeypatch.setattr(cs, 'get_clockings_for_date', lambda d: records)
 
         push_calls = []
-        monkeypatch.setattr(cs, 'push_worklog_to_jira',
-                            lambda task, start, duration: push_calls.append(task) or True)
+        monkeypatch.setattr(sync_outbox, 'create_jira_worklog',
+                            lambda task, start, duration: push_calls.append(task) or 'remote-1')
 
         widget = ClockingSummary([])
         widget.push_to_jira(TODAY_STR)
+        wait_for_pushes(widget)
         assert len(push_calls) == 2
         assert 'TASK-1' in push_calls
         assert 'TASK-2' in push_calls
@@ -246,11 +270,12 @@ class TestPushToJira:
         monkeypatch.setattr(cs, 'get_clockings_for_date', lambda d: [])
 
         push_calls = []
-        monkeypatch.setattr(cs, 'push_worklog_to_jira',
-                            lambda task, start, duration: push_calls.append(task) or True)
+        monkeypatch.setattr(sync_outbox, 'create_jira_worklog',
+                            lambda task, start, duration: push_calls.append(task) or 'remote-1')
 
         widget = ClockingSummary([])
         widget.push_to_jira(TODAY_STR)
+        wait_for_pushes(widget)
         assert push_calls == []
         widget.close()
 
@@ -267,12 +292,16 @@ class TestPushToJira:
         ]
         monkeypatch.setattr(cs, 'get_clockings_for_date', lambda d: records)
 
-        results = iter([True, False])
-        monkeypatch.setattr(cs, 'push_worklog_to_jira',
-                            lambda task, start, duration: next(results))
+        def push(task, start, duration):
+            if task == 'TASK-2':
+                raise ClockingException('rejected')
+            return 'wl-1'
+
+        monkeypatch.setattr(sync_outbox, 'create_jira_worklog', push)
 
         widget = ClockingSummary([])
         widget.push_to_jira(TODAY_STR)
+        wait_for_pushes(widget)
         log = widget.log_text.toHtml()
         assert 'Success' in log
         assert 'Fail' in log
@@ -294,6 +323,7 @@ class TestPushToClockify:
 
         widget = ClockingSummary([])
         widget.push_to_clockify(TODAY_STR)
+        wait_for_pushes(widget)
         log = widget.log_text.toPlainText()
         assert 'not configured' in log.lower() or 'Clockify' in log
         widget.close()
@@ -312,11 +342,12 @@ class TestPushToClockify:
         monkeypatch.setattr(cs, 'get_clockings_for_date', lambda d: records)
 
         push_calls = []
-        monkeypatch.setattr(cs, 'push_worklog_to_clockify',
-                            lambda task, start, end: push_calls.append(task) or True)
+        monkeypatch.setattr(sync_outbox, 'create_clockify_entry',
+                            lambda task, start, end: push_calls.append(task) or 'remote-1')
 
         widget = ClockingSummary([])
         widget.push_to_clockify(TODAY_STR)
+        wait_for_pushes(widget)
         assert len(push_calls) == 2
         widget.close()
 
@@ -329,10 +360,147 @@ class TestPushToClockify:
         monkeypatch.setattr(cs, 'get_clockings_for_date', lambda d: [])
 
         push_calls = []
-        monkeypatch.setattr(cs, 'push_worklog_to_clockify',
-                            lambda task, start, end: push_calls.append(task) or True)
+        monkeypatch.setattr(sync_outbox, 'create_clockify_entry',
+                            lambda task, start, end: push_calls.append(task) or 'remote-1')
 
         widget = ClockingSummary([])
         widget.push_to_clockify(TODAY_STR)
+        wait_for_pushes(widget)
         assert push_calls == []
         widget.close()
+
+
+# ---------------------------------------------------------------------------
+# TestPushInBackground
+# ---------------------------------------------------------------------------
+
+class TestPushInBackground:
+    def _configured(self, monkeypatch, records):
+        mock_config = MagicMock()
+        mock_config.is_jira_configured.return_value = (True, [])
+        mock_config.is_clockify_configured.return_value = (True, [])
+        import windows.clocking_summary as cs
+        monkeypatch.setattr(cs, 'get_config_manager', lambda: mock_config)
+        monkeypatch.setattr(cs, 'get_task_durations_for_date', lambda d: [])
+        monkeypatch.setattr(cs, 'get_clockings_for_date', lambda d: records)
+        return cs
+
+    def test_push_runs_off_the_gui_thread(self, qt_app, monkeypatch):
+        self._configured(monkeypatch, [make_record(TODAY_STR, 'TASK-1', '09:00', '10:00')])
+        threads = []
+        monkeypatch.setattr(sync_outbox, 'create_jira_worklog',
+                            lambda *a: threads.append(threading.current_thread()) or 'wl-1')
+
+        widget = ClockingSummary([])
+        widget.push_to_jira(TODAY_STR)
+        wait_for_pushes(widget)
+
+        assert threads and threads[0] is not threading.main_thread()
+        assert widget.log_text.toPlainText().splitlines()[-1] == 'Done'
+        assert not widget.cancel_button.isEnabled()
+        widget.close()
+
+    def test_jira_and_clockify_are_pushed_in_parallel(self, qt_app, monkeypatch):
+        self._configured(monkeypatch, [make_record(TODAY_STR, 'TASK-1', '09:00', '10:00')])
+        # Each push only returns once the other one has started
+        both_started = threading.Barrier(2, timeout=5)
+        monkeypatch.setattr(sync_outbox, 'create_jira_worklog',
+                            lambda *a: str(both_started.wait()))
+        monkeypatch.setattr(sync_outbox, 'create_clockify_entry',
+                            lambda *a: str(both_started.wait()))
+
+        widget = ClockingSummary([])
+        widget.push_clockings(TODAY_STR)()
+        wait_for_pushes(widget)
+
+        log = widget.log_text.toPlainText()
+        assert 'Jira -- Task: TASK-1, Duration: 01h 00m --> Success' in log
+        assert 'Clockify -- Task: TASK-1, Duration: 01h 00m --> Success' in log
+        widget.close()
+
+    def test_day_of_sessions_takes_a_few_round_trips(self, qt_app, monkeypatch):
+        records = [make_record(TODAY_STR, f'TASK-{i}', '09:00', '10:00') for i in range(20)]
+        self._configured(monkeypatch, records)
+        round_trip = 0.05
+
+        def push(*args):
+            time.sleep(round_trip)
+            return 'remote-1'
+
+        monkeypatch.setattr(sync_outbox, 'create_jira_worklog', push)
+        monkeypatch.setattr(sync_outbox, 'create_clockify_entry', push)
+        monkeypatch.setattr(sync_outbox.JIRA_TARGET._bucket, 'rate', 1000)
+        monkeypatch.setattr(sync_outbox.CLOCKIFY_TARGET._bucket, 'rate', 1000)
+
+        widget = ClockingSummary([])
+        started = time.monotonic()
+        widget.push_clockings(TODAY_STR)()
+        wait_for_pushes(widget)
+        elapsed = time.monotonic() - started
+
+        assert widget.log_text.toPlainText().count('Success') == 40
+        # 40 sessions sent one by one would take 40 round trips
+        assert elapsed < 40 * round_trip / 2
+        widget.close()
+
+    def test_cancel_stops_after_current_row(self, qt_app, monkeypatch):
+        records = [
+            make_record(TODAY_STR, 'TASK-1', '09:00', '10:00'),
+            make_record(TODAY_STR, 'TASK-2', '11:00', '12:00'),
+        ]
+        self._configured(monkeypatch, records)
+        widget = ClockingSummary([])
+        widget.push_engine = PushEngine(max_workers=1)
+        push_calls = []
+        pushing, release = threading.Event(), threading.Event()
+
+        def push(task, start, duration):
+            push_calls.append(task)
+            pushing.set()
+            release.wait(5)
+            return 'wl-1'
+
+        monkeypatch.setattr(sync_outbox, 'create_jira_worklog', push)
+        widget.push_to_jira(TODAY_STR)
+        assert pushing.wait(5)
+        widget.cancel_pushes()
+        release.set()
+        wait_for_pushes(widget)
+
+        assert push_calls == ['TASK-1']
+        assert 'cancelled' in widget.log_text.toPlainText()
+        assert not widget.cancel_button.isEnabled()
+        widget.close()
+
+    def test_failure_is_logged(self, qt_app, monkeypatch):
+        self._configured(monkeypatch, [make_record(TODAY_STR, 'TASK-1', '09:00', '10:00')])
+
+        def push(*args):
+            raise RuntimeError('boom')
+
+        monkeypatch.setattr(sync_outbox, 'create_clockify_entry', push)
+        widget = ClockingSummary([])
+        widget.push_to_clockify(TODAY_STR)
+        wait_for_pushes(widget)
+
+        log = widget.log_text.toPlainText()
+        assert 'Task: TASK-1, Duration: 01h 00m --> Fail' in log
+        assert 'boom' in log
+        widget.close()
+
+    def test_pushing_a_day_twice_sends_nothing_the_second_time(self, qt_app, monkeypatch):
+        cs = self._configured(monkeypatch, [make_record(TODAY_STR, 'TASK-1', '09:00', '10:00')])
+        push_calls = []
+        monkeypatch.setattr(sync_outbox, 'create_jira_worklog',
+                            lambda task, start, duration: push_calls.append(task) or 'wl-1')
+
+        widget = ClockingSummary([])
+        widget.push_to_jira(TODAY_STR)
+        widget.push_to_jira(TODAY_STR)
+        wait_for_pushes(widget)
+
+        assert push_calls == ['TASK-1']
+        assert widget.log_text.toPlainText().splitlines()[-1] == \
+            'Nothing to push, already up to date'
+        assert cs.get_push_pool() is widget.push_pool
+        widget.close()
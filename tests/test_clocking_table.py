@@ -0,0 +1,164 @@
+"""Tests for the clocking history model (windows/clocking_table.py)."""
+import pytest
+from PySide6.QtCore import QModelIndex, Qt
+
+from services.database import ClockingRecord
+from services.jira_links import JiraLinkResolver
+from windows.clocking_table import ClockingTableModel, ClockingTableView, record_from_cells
+
+
+def make_record(id, day='2024-01-02', task='TASK-1', check_in='09:00', check_out='10:00'):
+    return ClockingRecord(
+        id=id,
+        date=day,
+        task=task,
+        check_in=f"{day} {check_in}",
+        check_out=f"{day} {check_out}" if check_out else None,
+        message=None,
+    )
+
+
+@pytest.fixture
+def model(qt_app):
+    return ClockingTableModel([make_record(1), make_record(2, check_in='10:00', check_out=None)])
+
+
+class TestRecordFromCells:
+    def test_builds_full_datetimes(self):
+        record = record_from_cells(['2024-01-02', 'TASK-1', '09:00', '10:00', ''], 7)
+        assert record == ClockingRecord('2024-01-02', 'TASK-1', '2024-01-02 09:00',
+                                        '2024-01-02 10:00', None, id=7)
+
+    def test_missing_times_stay_empty(self):
+        record = record_from_cells(['2024-01-02', 'TASK-1', '', '', ''], None)
+        assert record.check_in == '' and record.check_out is None
+
+
+class TestClockingTableModel:
+    def test_displays_record_cells(self, model):
+        assert model.rowCount() == 2
+        assert [model.index(1, c).data() for c in range(5)] == ['2024-01-02', 'TASK-1',
+                                                                 '10:00', '', '']
+
+    def test_task_tooltip_is_its_jira_link(self, model, monkeypatch):
+        import windows.clocking_table as clocking_table
+        resolver = JiraLinkResolver('https://example.atlassian.net', ['TASK'])
+        monkeypatch.setattr(clocking_table, 'get_jira_link_resolver', lambda: resolver)
+        tooltip = model.index(0, 1).data(Qt.ItemDataRole.ToolTipRole)
+        assert tooltip == 'https://example.atlassian.net/browse/TASK-1'
+        assert model.index(0, 0).data(Qt.ItemDataRole.ToolTipRole) is None
+
+    def test_edit_emits_candidate_without_changing_row(self, model):
+        edits = []
+        model.row_edited.connect(lambda row, record: edits.append((row, record)))
+        assert model.setData(model.index(0, 1), 'TASK-9')
+        assert edits[0][0] == 0
+        assert edits[0][1].task == 'TASK-9' and edits[0][1].id == 1
+        assert model.index(0, 1).data() == 'TASK-1'
+
+    def test_unchanged_value_is_ignored(self, model):
+        edits = []
+        model.row_edited.connect(lambda row, record: edits.append(row))
+        assert not model.setData(model.index(0, 1), 'TASK-1')
+        assert edits == []
+
+    def test_set_record_updates_row_in_place(self, model):
+        model.set_record(0, make_record(1, task='TASK-9'))
+        assert model.index(0, 1).data() == 'TASK-9'
+
+    def test_draft_rows_keep_their_text_until_saved(self, model):
+        row = model.append_blank_row('2024-01-03')
+        model.setData(model.index(row, 1), 'TASK-2')
+        assert model.index(row, 1).data() == 'TASK-2'
+        assert model.row_id(row) is None
+
+    def test_saved_draft_becomes_a_record(self, model):
+        records = model._records
+        row = model.append_blank_row('2024-01-03')
+        model.set_record(row, make_record(3, day='2024-01-03'))
+        assert model.rowCount() == 3
+        assert records[-1].id == 3
+
+    def test_saving_second_draft_moves_it_before_the_first(self, model):
+        model.append_blank_row('2024-01-03')
+        model.append_blank_row('2024-01-04')
+        model.set_record(3, make_record(3, day='2024-01-04'))
+        assert model.row_id(2) == 3
+        assert model.index(3, 0).data() == '2024-01-03'
+
+    def test_upsert_patches_loaded_row(self, model):
+        model.upsert_records([make_record(2, check_in='10:00', check_out='11:00')])
+        assert model.rowCount() == 2
+        assert model.index(1, 3).data() == '11:00'
+
+    def test_upsert_appends_new_row_before_drafts(self, model):
+        model.append_blank_row('2024-01-03')
+        model.upsert_records([make_record(3, day='2024-01-03')])
+        assert model.rowCount() == 4
+        assert model.row_id(2) == 3
+        assert model.row_id(3) is None
+
+    def test_remove_row(self, model):
+        model.remove_row(0)
+        assert model.rowCount() == 1
+        assert model.row_id(0) == 2
+
+    def test_fetch_more_prepends_older_rows(self, qt_app):
+        pages = [([make_record(0, day='2024-01-01')], False)]
+        records = [make_record(1)]
+        model = ClockingTableModel(records, lambda oldest: pages.pop(0))
+        model.set_records(records, has_older=True)
+        assert model.canFetchMore(QModelIndex())
+        model.fetchMore(QModelIndex())
+        assert [r.id for r in records] == [0, 1]
+        assert not model.canFetchMore(QModelIndex())
+
+    def test_fetch_more_is_not_reentered_while_fetching(self, qt_app):
+        calls = []
+        records = [make_record(1)]
+
+        def fetch_older(oldest):
+            calls.append(oldest.id)
+            # e.g. an error dialog's event loop asking the model again
+            model.fetchMore(QModelIndex())
+            return [], False
+
+        model = ClockingTableModel(records, fetch_older)
+        model.set_records(records, has_older=True)
+        model.fetchMore(QModelIndex())
+        assert calls == [1]
+        assert not model.canFetchMore(QModelIndex())
+
+    def test_fetch_guard_blocks_fetching(self, qt_app):
+        records = [make_record(1)]
+        model = ClockingTableModel(records, lambda oldest: ([], False))
+        model.set_records(records, has_older=True)
+        model.set_fetch_guard(lambda: False)
+        assert not model.canFetchMore(QModelIndex())
+
+
+class TestClockingTableView:
+    def test_scrolling_to_top_fetches_older_rows(self, qt_app):
+        history = [make_record(i, check_in='08:00') for i in range(1, 301)]
+        records = history[200:]
+
+        def fetch_older(oldest):
+            end = history.index(oldest)
+            return history[max(0, end - 100):end], end > 100
+
+        model = ClockingTableModel(records, fetch_older)
+        view = ClockingTableView()
+        view.resize(400, 300)
+        view.setModel(model)
+        model.set_records(records, has_older=True)
+        view.show()
+        view.scrollToBottom()
+        qt_app.processEvents()
+        assert model.rowCount() == 100
+
+        view.verticalScrollBar().setValue(view.verticalScrollBar().minimum())
+        qt_app.processEvents()
+        assert model.rowCount() == 200
+        # The rows that were on screen stay on screen instead of jumping to the new page
+        assert view.rowAt(0) >= 100
+        view.close()
@@ -1,12 +1,25 @@
 """Tests for the Clocking widget (windows/clocking.py)."""
 import datetime
+import gc
+import threading
 from unittest.mock import MagicMock
 
 import pytest
-from PySide6.QtWidgets import QMessageBox
+from PySide6.QtCore import QEvent, QModelIndex, QThreadPool
+from PySide6.QtWidgets import QApplication, QMessageBox
 
 from services.constants import CLOCKING_HEADER
-from services.database import ClockingRecord, TaskRecord, init_db, save_clockings, save_tasks
+from services.database import (
+    ClockingRecord,
+    TaskRecord,
+    get_all_tasks,
+    get_app_state,
+    init_db,
+    save_clockings,
+    save_tasks,
+    sync_open_tasks,
+)
+from services.jira_api import OpenIssueChanges
 
 # ---------------------------------------------------------------------------
 # Helpers
@@ -14,6 +27,7 @@ from services.database import ClockingRecord, TaskRecord, init_db, save_clocking
 
 TODAY = datetime.date.today().isoformat()
 YESTERDAY = (datetime.date.today() - datetime.timedelta(days=1)).isoformat()
+LAST_MONTH = (datetime.date.today() - datetime.timedelta(days=30)).isoformat()
 
 
 def make_clocking(date, task, check_in, check_out=None, message=None, id=0):
@@ -36,11 +50,10 @@ def make_tray_icon():
 # ---------------------------------------------------------------------------
 
 @pytest.fixture
-def db_env(tmp_path, monkeypatch):
-    """Isolated SQLite DB in a temp directory; monkeypatches get_db_path."""
-    import services.database as db_module
+def db_env(tmp_path, monkeypatch, use_db):
+    """Isolated SQLite DB in a temp directory."""
     db_path = str(tmp_path / 'clocking.db')
-    monkeypatch.setattr(db_module, 'get_db_path', lambda: db_path)
+    use_db(db_path)
     init_db()
     monkeypatch.setattr(QMessageBox, "exec", lambda self: QMessageBox.StandardButton.Ok)
     monkeypatch.setattr(QMessageBox, "critical",
@@ -50,7 +63,14 @@ def db_env(tmp_path, monkeypatch):
 
 @pytest.fixture
 def clocking_env(db_env, qt_app):
-    return db_env
+    yield db_env
+    # Destroy the widgets (and their timers and views) while the DB is still
+    # patched, so they cannot fire in a later test's event processing
+    for widget in QApplication.topLevelWidgets():
+        widget.close()
+        widget.deleteLater()
+    QApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete)
+    gc.collect()
 
 
 # ---------------------------------------------------------------------------
@@ -81,41 +101,135 @@ class TestLoadData:
         assert isinstance(widget.data[0], ClockingRecord)
         widget.close()
 
+    def test_only_recent_days_are_loaded_initially(self, clocking_env):
+        save_clockings([
+            make_clocking(LAST_MONTH, 'TASK-1', '09:00', '10:00', id=1),
+            make_clocking(TODAY, 'TASK-2', '09:00', '10:00', id=2),
+        ])
+        from windows.clocking import Clocking
+        widget = Clocking(make_tray_icon())
+        assert [r.id for r in widget.data] == [2]
+        assert widget.clocking_model.canFetchMore(QModelIndex())
+        widget.close()
+
+    def test_fetch_more_prepends_previous_page(self, clocking_env):
+        save_clockings([
+            make_clocking(LAST_MONTH, 'TASK-1', '09:00', '10:00', id=1),
+            make_clocking(TODAY, 'TASK-2', '09:00', '10:00', id=2),
+        ])
+        from windows.clocking import Clocking
+        widget = Clocking(make_tray_icon())
+        widget.clocking_model.fetchMore(QModelIndex())
+        assert [r.id for r in widget.data] == [1, 2]
+        assert widget.clocking_model.rowCount() == 2
+        assert not widget.clocking_model.canFetchMore(QModelIndex())
+        widget.close()
+
+    def test_falls_back_to_latest_page_without_recent_rows(self, clocking_env):
+        save_clockings([make_clocking(LAST_MONTH, 'TASK-1', '09:00', '10:00', id=1)])
+        from windows.clocking import Clocking
+        widget = Clocking(make_tray_icon())
+        assert [r.id for r in widget.data] == [1]
+        widget.close()
+
 
 # ---------------------------------------------------------------------------
-# TestCreateTaskButtons
+# TestTaskList
 # ---------------------------------------------------------------------------
 
-class TestCreateTaskButtons:
-    def test_no_tasks_creates_empty_buttons_dict(self, clocking_env):
+class TestTaskList:
+    def test_no_tasks_leaves_list_empty(self, clocking_env):
         from windows.clocking import Clocking
         widget = Clocking(make_tray_icon())
-        assert widget.task_buttons == {}
+        assert widget.task_model.task_ids() == []
         widget.close()
 
-    def test_tasks_create_buttons_for_each(self, clocking_env):
+    def test_lists_open_and_fixed_tasks(self, clocking_env):
         save_tasks([
             TaskRecord('TASK-1', 'Fix bugs', 'fixed'),
             TaskRecord('TASK-2', 'New feature', 'open'),
+            TaskRecord('TASK-3', 'Old feature', 'closed'),
         ])
         from windows.clocking import Clocking
         widget = Clocking(make_tray_icon())
-        assert 'TASK-1' in widget.task_buttons
-        assert 'TASK-2' in widget.task_buttons
+        assert sorted(widget.task_model.task_ids()) == ['TASK-1', 'TASK-2']
         widget.close()
 
-    def test_button_label_matches_task_id(self, clocking_env):
-        save_tasks([TaskRecord('TASK-1', 'Some description', 'fixed')])
+    def test_row_shows_task_and_description(self, clocking_env):
+        from windows.task_list import DESCRIPTION_ROLE
+        save_tasks([TaskRecord('TASK-1', 'My task description', 'fixed')])
         from windows.clocking import Clocking
         widget = Clocking(make_tray_icon())
-        assert widget.task_buttons['TASK-1'].button.text() == 'TASK-1'
+        index = widget.task_list.model().index(0, 0)
+        assert index.data() == 'TASK-1 — My task description'
+        assert index.data(DESCRIPTION_ROLE) == 'My task description'
         widget.close()
 
-    def test_task_ui_stores_description(self, clocking_env):
-        save_tasks([TaskRecord('TASK-1', 'My task description', 'fixed')])
+    def test_filter_box_narrows_the_list(self, clocking_env):
+        save_tasks([
+            TaskRecord('TASK-1', 'Fix bugs', 'fixed'),
+            TaskRecord('TASK-2', 'New feature', 'fixed'),
+        ])
+        from windows.clocking import Clocking
+        widget = Clocking(make_tray_icon())
+        widget.task_filter_input.setText('FEAT')
+        assert widget.task_filter.rowCount() == 1
+        assert widget.task_filter.index(0, 0).data().startswith('TASK-2')
+        widget.task_filter_input.clear()
+        assert widget.task_filter.rowCount() == 2
+        widget.close()
+
+    def test_activating_a_row_checks_in(self, clocking_env):
+        save_tasks([TaskRecord('TASK-1', 'Fix bugs', 'fixed')])
+        from windows.clocking import Clocking
+        widget = Clocking(make_tray_icon())
+
+        widget.task_list.activated.emit(widget.task_filter.index(0, 0))
+
+        assert widget.data[-1].task == 'TASK-1' and widget.data[-1].check_out is None
+        assert widget.task_model.active_task == 'TASK-1'
+        widget.close()
+
+    def test_activating_the_running_task_again_does_nothing(self, clocking_env):
+        save_tasks([TaskRecord('TASK-1', 'Fix bugs', 'fixed')])
+        from windows.clocking import Clocking
+        widget = Clocking(make_tray_icon())
+        index = widget.task_filter.index(0, 0)
+
+        widget.task_list.clicked.emit(index)
+        widget.task_list.activated.emit(index)
+
+        assert len(widget.data) == 1
+        widget.close()
+
+    def test_switching_task_closes_the_running_one(self, clocking_env):
+        save_tasks([TaskRecord('TASK-1', 'Fix bugs', 'fixed'),
+                    TaskRecord('TASK-2', 'New feature', 'fixed')])
+        from windows.clocking import Clocking
+        widget = Clocking(make_tray_icon())
+
+        widget.check_in_task('TASK-1')
+        widget.check_in_task('TASK-2')
+
+        assert [(r.task, r.check_out is None) for r in widget.data] == [
+            ('TASK-1', False), ('TASK-2', True),
+        ]
+        assert widget.task_model.active_task == 'TASK-2'
+        widget.close()
+
+    def test_active_mark_is_cleared_on_check_out(self, clocking_env):
+        from PySide6.QtCore import Qt
+        save_tasks([TaskRecord('TASK-1', 'Fix bugs', 'fixed')])
         from windows.clocking import Clocking
         widget = Clocking(make_tray_icon())
-        assert widget.task_buttons['TASK-1'].description == 'My task description'
+        index = widget.task_model.index(0)
+
+        widget.check_in_task('TASK-1')
+        assert index.data(Qt.ItemDataRole.FontRole).bold()
+
+        widget.record_check_out()
+        assert widget.task_model.active_task is None
+        assert index.data(Qt.ItemDataRole.FontRole) is None
         widget.close()
 
 
@@ -127,40 +241,36 @@ class TestAddRow:
     def test_add_row_increments_row_count(self, clocking_env):
         from windows.clocking import Clocking
         widget = Clocking(make_tray_icon())
-        initial = widget.clocking_table.rowCount()
+        initial = widget.clocking_model.rowCount()
         widget.add_row()
-        assert widget.clocking_table.rowCount() == initial + 1
+        assert widget.clocking_model.rowCount() == initial + 1
         widget.close()
 
     def test_add_row_sets_today_date_in_first_cell(self, clocking_env):
         from windows.clocking import Clocking
         widget = Clocking(make_tray_icon())
         widget.add_row()
-        last_row = widget.clocking_table.rowCount() - 1
-        date_cell = widget.clocking_table.item(last_row, 0)
-        assert date_cell is not None
-        assert date_cell.text() == TODAY
+        last_row = widget.clocking_model.rowCount() - 1
+        assert widget.clocking_model.index(last_row, 0).data() == TODAY
         widget.close()
 
     def test_add_row_other_cells_are_empty(self, clocking_env):
         from windows.clocking import Clocking
         widget = Clocking(make_tray_icon())
         widget.add_row()
-        last_row = widget.clocking_table.rowCount() - 1
+        last_row = widget.clocking_model.rowCount() - 1
         for col in range(1, len(CLOCKING_HEADER)):
-            item = widget.clocking_table.item(last_row, col)
-            assert item is not None
-            assert item.text() == ''
+            assert widget.clocking_model.index(last_row, col).data() == ''
         widget.close()
 
     def test_multiple_add_rows(self, clocking_env):
         from windows.clocking import Clocking
         widget = Clocking(make_tray_icon())
-        initial = widget.clocking_table.rowCount()
+        initial = widget.clocking_model.rowCount()
         widget.add_row()
         widget.add_row()
         widget.add_row()
-        assert widget.clocking_table.rowCount() == initial + 3
+        assert widget.clocking_model.rowCount() == initial + 3
         widget.close()
 
 
@@ -284,3 +394,219 @@ class TestCollectRows:
         records = widget._collect_rows()
         assert any(r.task == 'TASK-1' for r in records)
         widget.close()
+
+
+# ---------------------------------------------------------------------------
+# TestAutoSave
+# ---------------------------------------------------------------------------
+
+class TestAutoSave:
+    def test_edit_saves_row_in_place(self, clocking_env):
+        save_clockings([make_clocking(TODAY, 'TASK-1', '09:00', '10:00', id=1)])
+        from services.database import get_clockings_for_date
+        from windows.clocking import Clocking
+        widget = Clocking(make_tray_icon())
+        model = widget.clocking_model
+        model.setData(model.index(0, 4), 'reviewed PR')
+        assert widget.data[0].message == 'reviewed PR'
+        assert get_clockings_for_date(TODAY)[0].message == 'reviewed PR'
+        widget.close()
+
+    def test_invalid_edit_keeps_saved_values(self, clocking_env):
+        save_clockings([make_clocking(TODAY, 'TASK-1', '09:00', '10:00', id=1)])
+        from windows.clocking import Clocking
+        widget = Clocking(make_tray_icon())
+        model = widget.clocking_model
+        model.setData(model.index(0, 3), '25:99')
+        assert model.index(0, 3).data() == '10:00'
+        assert widget.data[0].check_out == f'{TODAY} 10:00'
+        widget.close()
+
+    def test_completed_draft_row_is_saved(self, clocking_env):
+        from services.database import get_clockings_for_date
+        from windows.clocking import Clocking
+        widget = Clocking(make_tray_icon())
+        widget.add_row()
+        model = widget.clocking_model
+        model.setData(model.index(0, 1), 'TASK-1')
+        model.setData(model.index(0, 2), '09:00')
+        model.setData(model.index(0, 3), '09:30')
+        saved = get_clockings_for_date(TODAY)
+        assert [(r.task, r.check_out) for r in saved] == [('TASK-1', f'{TODAY} 09:30')]
+        assert widget.data[0].id == saved[0].id
+        widget.close()
+
+    def test_task_column_uses_combo_delegate(self, clocking_env):
+        from windows.clocking import Clocking, TaskComboDelegate
+        widget = Clocking(make_tray_icon())
+        assert isinstance(widget.clocking_table.itemDelegateForColumn(1), TaskComboDelegate)
+        widget.close()
+
+
+# ---------------------------------------------------------------------------
+# TestCheckInOut
+# ---------------------------------------------------------------------------
+
+class TestCheckInOut:
+    def test_check_in_appends_row_without_reloading(self, clocking_env):
+        save_tasks([TaskRecord('TASK-1', 'Fix bugs', 'fixed')])
+        save_clockings([make_clocking(TODAY, 'TASK-1', '08:00', '09:00', id=1)])
+        from windows.clocking import Clocking
+        widget = Clocking(make_tray_icon())
+        resets = []
+        widget.clocking_model.modelReset.connect(lambda: resets.append(True))
+
+        widget.record_check_in('TASK-1')()
+
+        assert resets == []
+        assert widget.clocking_model.rowCount() == 2
+        assert widget.data[-1].task == 'TASK-1' and widget.data[-1].check_out is None
+        assert widget._is_checked_out is False
+        widget.close()
+
+    def test_check_out_patches_open_row(self, clocking_env):
+        save_clockings([make_clocking(TODAY, 'TASK-1', '00:00', id=1)])
+        from windows.clocking import Clocking
+        widget = Clocking(make_tray_icon())
+
+        written = widget.record_check_out()
+
+        assert [r.id for r in written] == [1]
+        assert widget.data[0].check_out == written[0].check_out
+        assert widget._is_checked_out is True
+        widget.close()
+
+    def test_cross_day_check_out_returns_both_rows(self, clocking_env):
+        save_clockings([make_clocking(YESTERDAY, 'TASK-1', '22:00', id=1)])
+        from windows.clocking import Clocking
+        widget = Clocking(make_tray_icon())
+
+        written = widget.record_check_out()
+
+        assert [(r.date, r.check_out_time) for r in written][0] == (YESTERDAY, '23:59')
+        assert written[1].date == TODAY and written[1].check_in_time == '00:00'
+        assert [r.id for r in widget.data] == [1, written[1].id]
+        widget.close()
+
+
+# ---------------------------------------------------------------------------
+# TestReloadTasks
+# ---------------------------------------------------------------------------
+
+class TestReloadTasks:
+    def test_reload_picks_up_new_and_closed_tasks(self, clocking_env):
+        save_tasks([TaskRecord('TASK-1', 'Fix bugs', 'open')])
+        from windows.clocking import Clocking
+        widget = Clocking(make_tray_icon())
+
+        sync_open_tasks([{'task': 'TASK-2', 'description': 'New feature'}])
+        widget.reload_tasks()
+
+        assert widget.task_model.task_ids() == ['TASK-2']
+        assert widget._task_delegate._task_ids == ['TASK-1', 'TASK-2']
+        widget.close()
+
+    def test_reload_keeps_open_session_running(self, clocking_env):
+        save_tasks([TaskRecord('TASK-1', 'Fix bugs', 'fixed')])
+        save_clockings([make_clocking(TODAY, 'TASK-1', '00:00', id=1)])
+        from windows.clocking import Clocking
+        widget = Clocking(make_tray_icon())
+        timer = widget.timer
+
+        widget.reload_tasks()
+
+        assert widget.timer is timer and timer.isActive()
+        assert widget._is_checked_out is False
+        assert widget.task_model.active_task == 'TASK-1'
+        assert widget.btn_stop.isEnabled()
+        widget.close()
+
+    def test_main_window_reload_rereads_config_and_clears_caches(self, clocking_env, monkeypatch):
+        import services.clockify_api as clockify_api
+        import services.jira_api as jira_api
+        import windows.clocking as clocking_module
+        calls = []
+        config = MagicMock()
+        config.load_config.side_effect = lambda: calls.append('config')
+        monkeypatch.setattr(clocking_module, 'get_config_manager', lambda: config)
+        monkeypatch.setattr(jira_api, 'clear_jira_cache', lambda: calls.append('jira'))
+        monkeypatch.setattr(clockify_api, 'clear_clockify_cache',
+                            lambda: calls.append('clockify'))
+        window = clocking_module.MainClocking()
+        clocking_window = window.clocking_window
+
+        window.reload_app()
+        assert calls == []
+
+        window.reload_app(settings_changed=True)
+        assert calls == ['config', 'jira', 'clockify']
+        assert window.clocking_window is clocking_window
+        window.tray_icon.hide()
+        window.close()
+
+
+# ---------------------------------------------------------------------------
+# TestUpdateOpenTasks
+# ---------------------------------------------------------------------------
+
+class TestUpdateOpenTasks:
+    def _window(self, monkeypatch, fetch):
+        import services.jira_api as jira_api
+        import windows.clocking as clocking_module
+        config = MagicMock()
+        config.is_jira_configured.return_value = (True, [])
+        monkeypatch.setattr(clocking_module, 'get_config_manager', lambda: config)
+        monkeypatch.setattr(jira_api, 'fetch_open_issue_changes', fetch)
+        return clocking_module.MainClocking()
+
+    def _wait(self):
+        QThreadPool.globalInstance().waitForDone()
+        QApplication.processEvents()
+
+    def test_issues_are_fetched_in_background_and_stored(self, clocking_env, monkeypatch):
+        threads = []
+
+        def fetch():
+            threads.append(threading.current_thread())
+            return OpenIssueChanges([{'task': 'TASK-7', 'description': 'From Jira'}], full=True,
+                                    started_at=1000.0, watermark_key='synced')
+
+        window = self._window(monkeypatch, fetch)
+        window.update_open_tasks()
+        assert not window.update_task_action.isEnabled()
+        self._wait()
+
+        assert threads and threads[0] is not threading.main_thread()
+        assert 'TASK-7' in window.clocking_window.task_model.task_ids()
+        assert window.update_task_action.isEnabled() and window.issues_action.isEnabled()
+        assert get_app_state('synced') == '1000.0'
+        window.tray_icon.hide()
+
+    def test_delta_only_touches_changed_tasks(self, clocking_env, monkeypatch):
+        sync_open_tasks([{'task': 'TASK-1', 'description': 'Open'},
+                         {'task': 'TASK-2', 'description': 'Done upstream'}])
+
+        def fetch():
+            return OpenIssueChanges([{'task': 'TASK-3', 'description': 'New'}], {'TASK-2'},
+                                    started_at=2000.0, watermark_key='synced')
+
+        window = self._window(monkeypatch, fetch)
+        window.update_open_tasks()
+        self._wait()
+
+        types = {t.task: t.task_type for t in get_all_tasks()}
+        assert types == {'TASK-1': 'open', 'TASK-2': 'closed', 'TASK-3': 'open'}
+        assert get_app_state('synced') == '2000.0'
+        window.tray_icon.hide()
+
+    def test_failure_reenables_actions(self, clocking_env, monkeypatch):
+        def fetch():
+            raise RuntimeError('offline')
+
+        window = self._window(monkeypatch, fetch)
+        window.update_open_tasks()
+        self._wait()
+
+        assert window.update_task_action.isEnabled()
+        assert window.clocking_window.task_model.task_ids() == []
+        window.tray_icon.hide()
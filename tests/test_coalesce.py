@@ -0,0 +1,113 @@
+"""Tests for push coalescing (services/coalesce.py)."""
+import pytest
+
+from services.coalesce import (
+    COALESCE_GAP,
+    COALESCE_OFF,
+    COALESCE_TASK,
+    CoalesceRule,
+    coalesce,
+    get_coalesce_rule,
+)
+from services.config_manager import ConfigManager
+from services.database import ClockingRecord
+
+DAY = '2024-01-02'
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+_ids = iter(range(1, 10_000))
+
+
+def session(task, check_in, check_out, message=None):
+    return ClockingRecord(DAY, task, f'{DAY} {check_in}', check_out and f'{DAY} {check_out}',
+                          message, id=next(_ids))
+
+
+def spans(groups):
+    return [(g.record.task, g.record.check_in[11:], g.record.check_out[11:]) for g in groups]
+
+
+@pytest.fixture
+def switching():
+    """A morning of switching back and forth between two tasks."""
+    return [
+        session('TASK-1', '09:00', '09:30', 'Review'),
+        session('TASK-2', '09:30', '09:40'),
+        session('TASK-1', '09:40', '10:00', 'Fixes'),
+        session('TASK-1', '11:00', '11:15', 'Review'),
+    ]
+
+
+# ---------------------------------------------------------------------------
+# TestCoalesce
+# ---------------------------------------------------------------------------
+
+class TestCoalesce:
+    def test_off_keeps_each_session(self, switching):
+        groups = coalesce(switching, CoalesceRule(COALESCE_OFF))
+        assert [g.record for g in groups] == switching
+        assert all(len(g.member_ids) == 1 for g in groups)
+
+    def test_task_mode_merges_the_whole_day(self, switching):
+        groups = coalesce(switching, CoalesceRule(COALESCE_TASK))
+        # 30 + 20 + 15 minutes, starting at the first session; the gaps are not logged
+        assert spans(groups) == [('TASK-1', '09:00', '10:05'), ('TASK-2', '09:30', '09:40')]
+        assert groups[0].member_ids == [switching[0].id, switching[2].id, switching[3].id]
+
+    def test_gap_mode_merges_only_close_sessions(self, switching):
+        groups = coalesce(switching, CoalesceRule(COALESCE_GAP, max_gap_minutes=15))
+        assert spans(groups) == [
+            ('TASK-1', '09:00', '09:50'),
+            ('TASK-2', '09:30', '09:40'),
+            ('TASK-1', '11:00', '11:15'),
+        ]
+
+    def test_gap_at_threshold_is_merged(self):
+        records = [session('TASK-1', '09:00', '09:30'), session('TASK-1', '09:45', '10:00')]
+        assert len(coalesce(records, CoalesceRule(COALESCE_GAP, max_gap_minutes=15))) == 1
+        assert len(coalesce(records, CoalesceRule(COALESCE_GAP, max_gap_minutes=14))) == 2
+
+    def test_group_keeps_first_id_and_distinct_messages(self, switching):
+        [first, _] = coalesce(switching, CoalesceRule(COALESCE_TASK))
+        assert first.record.id == switching[0].id
+        assert first.record.message == 'Review; Fixes'
+
+    def test_open_session_is_skipped(self):
+        records = [session('TASK-1', '09:00', '09:30'), session('TASK-1', '09:35', None)]
+        [group] = coalesce(records, CoalesceRule(COALESCE_TASK))
+        assert group.member_ids == [records[0].id]
+
+    def test_session_past_midnight_counts_fully(self):
+        late = session('TASK-1', '23:30', None)
+        late.check_out = '2024-01-03 00:30'
+        records = [session('TASK-1', '22:00', '23:00'), late]
+        [group] = coalesce(records, CoalesceRule(COALESCE_TASK))
+        assert group.record.check_out == '2024-01-03 00:00'
+
+
+# ---------------------------------------------------------------------------
+# TestGetCoalesceRule
+# ---------------------------------------------------------------------------
+
+class TestGetCoalesceRule:
+    @pytest.fixture
+    def config(self, tmp_path):
+        return ConfigManager(env_path=str(tmp_path / '.env'))
+
+    def test_defaults_to_off(self, config):
+        assert get_coalesce_rule(config) == CoalesceRule()
+
+    def test_reads_mode_and_gap(self, config):
+        config.update_all({'PUSH_COALESCE': 'Gap', 'PUSH_COALESCE_GAP_MINUTES': '5'})
+        assert get_coalesce_rule(config) == CoalesceRule(COALESCE_GAP, 5)
+
+    @pytest.mark.parametrize('mode, gap, expected', [
+        ('sometimes', '5', CoalesceRule(COALESCE_OFF, 5)),
+        ('task', 'soon', CoalesceRule(COALESCE_TASK)),
+    ])
+    def test_invalid_values_fall_back(self, config, mode, gap, expected):
+        config.update_all({'PUSH_COALESCE': mode, 'PUSH_COALESCE_GAP_MINUTES': gap})
+        assert get_coalesce_rule(config) == expected
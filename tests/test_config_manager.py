@@ -1,6 +1,9 @@
 import os
 import tempfile
 
+import pytest
+
+import services.config_manager as config_module
 from services.config_manager import ConfigManager
 
 
@@ -169,3 +172,60 @@ class TestConfigManager:
             # Verify it's a copy
             all_config['ATLASSIAN_EMAIL'] = 'modified@example.com'
             assert config.get('ATLASSIAN_EMAIL') == 'test@example.com'
+
+
+class TestAtomicSave:
+    """save() writes the file once, through a temporary file"""
+
+    @pytest.fixture
+    def env_path(self, tmp_path):
+        path = tmp_path / '.env'
+        path.write_text("# Jira\nATLASSIAN_EMAIL=old@example.com\nUNKNOWN_KEY=kept")
+        return path
+
+    def test_single_replace_and_no_leftovers(self, env_path, monkeypatch):
+        config = ConfigManager(str(env_path))
+        replaced = []
+        real_replace = os.replace
+        monkeypatch.setattr(config_module.os, 'replace',
+                            lambda src, dst: replaced.append(dst) or real_replace(src, dst))
+
+        config.set('ATLASSIAN_EMAIL', 'new@example.com')
+        assert config.save() is True
+
+        assert replaced == [str(env_path)]
+        assert os.listdir(env_path.parent) == ['.env']
+
+    def test_keeps_comments_and_unknown_keys(self, env_path):
+        config = ConfigManager(str(env_path))
+        config.set('ATLASSIAN_EMAIL', "o'brien@example.com")
+        config.save()
+
+        lines = env_path.read_text().splitlines()
+        assert lines[:3] == [
+            '# Jira', "ATLASSIAN_EMAIL='o\\'brien@example.com'", 'UNKNOWN_KEY=kept']
+        assert ConfigManager(str(env_path)).get('ATLASSIAN_EMAIL') == "o'brien@example.com"
+
+    def test_failed_write_leaves_file_intact(self, env_path, monkeypatch):
+        config = ConfigManager(str(env_path))
+        config.set('ATLASSIAN_EMAIL', 'new@example.com')
+        before = env_path.read_text()
+
+        def crash(fd):
+            raise OSError('disk full')
+
+        monkeypatch.setattr(config_module.os, 'fsync', crash)
+        assert config.save() is False
+        assert env_path.read_text() == before
+        assert os.listdir(env_path.parent) == ['.env']
+
+    def test_version_changes_only_with_values(self, env_path):
+        config = ConfigManager(str(env_path))
+        version = config.version
+        config.set('ATLASSIAN_EMAIL', 'old@example.com')
+        config.save()
+        assert config.load_config() is False
+        assert config.version == version
+
+        config.set('ATLASSIAN_URL', 'https://example.atlassian.net')
+        assert config.version == version + 1
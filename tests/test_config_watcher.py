@@ -0,0 +1,69 @@
+"""Tests for reloading the configuration on file changes (services/config_watcher.py)."""
+import time
+
+import pytest
+from PySide6.QtWidgets import QApplication
+
+from services.config_manager import ConfigManager
+from services.config_watcher import ConfigWatcher
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture
+def config(tmp_path):
+    return ConfigManager(str(tmp_path / '.env'))
+
+
+@pytest.fixture
+def watcher(qt_app, config):
+    watcher = ConfigWatcher(config)
+    watcher.emitted = []
+    watcher.changed.connect(lambda: watcher.emitted.append(config.get('ATLASSIAN_EMAIL')))
+    yield watcher
+    watcher.deleteLater()
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        QApplication.processEvents()
+        time.sleep(0.01)
+    return condition()
+
+
+def settle(seconds=0.5):
+    wait_for(lambda: False, seconds)
+
+
+# ---------------------------------------------------------------------------
+# TestConfigWatcher
+# ---------------------------------------------------------------------------
+
+class TestConfigWatcher:
+    def test_file_created_outside_the_app_is_loaded(self, watcher, config):
+        with open(config.env_path, 'w') as f:
+            f.write('ATLASSIAN_EMAIL=first@example.com\n')
+        assert wait_for(lambda: watcher.emitted == ['first@example.com'])
+
+    def test_file_replaced_outside_the_app_is_loaded_each_time(self, watcher, config):
+        for email in ('a@example.com', 'b@example.com'):
+            other = ConfigManager(config.env_path)
+            other.set('ATLASSIAN_EMAIL', email)
+            other.save()
+            assert wait_for(lambda: config.get('ATLASSIAN_EMAIL') == email)
+        assert watcher.emitted == ['a@example.com', 'b@example.com']
+
+    def test_own_save_is_silent(self, watcher, config):
+        config.set('ATLASSIAN_EMAIL', 'me@example.com')
+        config.save()
+        settle()
+        assert watcher.emitted == []
+
+    def test_reload_reports_change(self, watcher, config):
+        assert watcher.reload() is False
+        with open(config.env_path, 'w') as f:
+            f.write('ATLASSIAN_EMAIL=now@example.com\n')
+        assert watcher.reload() is True
@@ -0,0 +1,454 @@
+"""Tests for the SQLite access layer (services/database.py)."""
+import sqlite3
+import threading
+
+import pytest
+
+import services.database as db_module
+from services.database import ConnectionManager, get_open_clocking, init_db, insert_clocking
+
+
+@pytest.fixture
+def db_path(tmp_path, use_db):
+    path = str(tmp_path / 'clocking.db')
+    use_db(path)
+    init_db()
+    return path
+
+
+# ---------------------------------------------------------------------------
+# TestConnectionManager
+# ---------------------------------------------------------------------------
+
+class TestConnectionManager:
+    def test_reuses_connection_within_thread(self, db_path):
+        manager = ConnectionManager(lambda: db_path)
+        assert manager.connection() is manager.connection()
+        manager.close_all()
+
+    def test_separate_connection_per_thread(self, db_path):
+        manager = ConnectionManager(lambda: db_path)
+        main_conn = manager.connection()
+        other = []
+        thread = threading.Thread(target=lambda: other.append(manager.connection()))
+        thread.start()
+        thread.join()
+        assert other[0] is not main_conn
+        manager.close_all()
+
+    def test_path_is_resolved_once(self, tmp_path):
+        resolved = []
+        manager = ConnectionManager(lambda: resolved.append(1) or str(tmp_path / 'a.db'))
+        for _ in range(3):
+            manager.connection()
+        assert manager.path() == str(tmp_path / 'a.db')
+        assert len(resolved) == 1
+        manager.close_all()
+
+    def test_reset_path_reopens_at_the_new_path(self, tmp_path):
+        current = {'path': str(tmp_path / 'a.db')}
+        manager = ConnectionManager(lambda: current['path'])
+        first = manager.connection()
+        current['path'] = str(tmp_path / 'b.db')
+        assert manager.connection() is first
+        manager.reset_path()
+        assert manager.connection() is not first
+        assert manager.path() == current['path']
+        manager.close_all()
+
+    def test_close_all_forces_reconnect(self, db_path):
+        manager = ConnectionManager(lambda: db_path)
+        first = manager.connection()
+        manager.close_all()
+        second = manager.connection()
+        assert second is not first
+        assert second.execute("SELECT 1").fetchone()[0] == 1
+        manager.close_all()
+
+    def test_row_factory_and_foreign_keys(self, db_path):
+        manager = ConnectionManager(lambda: db_path)
+        conn = manager.connection()
+        assert conn.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+        assert conn.execute("SELECT 1 AS one").fetchone()['one'] == 1
+        manager.close_all()
+
+    def test_global_manager_can_be_swapped(self, db_path):
+        opened = []
+
+        class RecordingManager(ConnectionManager):
+            def connection(self):
+                conn = super().connection()
+                opened.append(conn)
+                return conn
+
+        previous = db_module.set_connection_manager(RecordingManager(lambda: db_path))
+        try:
+            insert_clocking('2024-01-01', 'TASK-1', '2024-01-01 09:00')
+            assert get_open_clocking() is not None
+            assert len(opened) == 2
+        finally:
+            db_module.close_connections()
+            db_module.set_connection_manager(previous)
+
+
+# ---------------------------------------------------------------------------
+# TestMigrations
+# ---------------------------------------------------------------------------
+
+def _index_names(conn) -> set[str]:
+    rows = conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'").fetchall()
+    return {r['name'] for r in rows}
+
+
+def _query_plan(conn, sql, params=()) -> str:
+    return ' '.join(r['detail'] for r in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params))
+
+
+class TestMigrations:
+    def test_new_database_is_at_latest_version(self, db_path):
+        assert db_module.get_schema_version() == db_module.SCHEMA_VERSION
+
+    def test_init_db_is_idempotent(self, db_path):
+        init_db()
+        init_db()
+        assert db_module.get_schema_version() == db_module.SCHEMA_VERSION
+
+    def test_existing_database_upgrades_in_place(self, tmp_path, use_db):
+        path = str(tmp_path / 'legacy.db')
+        legacy = sqlite3.connect(path)
+        legacy.executescript("""
+            CREATE TABLE clockings (
+                id INTEGER PRIMARY KEY AUTOINCREMENT, date TEXT NOT NULL, task TEXT NOT NULL,
+                check_in TEXT NOT NULL, check_out TEXT, message TEXT
+            );
+            CREATE TABLE tasks (
+                task TEXT PRIMARY KEY, description TEXT NOT NULL, task_type TEXT NOT NULL
+            );
+            INSERT INTO clockings (date, task, check_in, check_out)
+                VALUES ('2024-01-01', 'TASK-1', '2024-01-01 09:00', '2024-01-01 10:00');
+        """)
+        legacy.close()
+        use_db(path)
+
+        init_db()
+
+        assert db_module.get_schema_version() == db_module.SCHEMA_VERSION
+        assert db_module.get_today_completed_seconds('2024-01-01') == 3600
+
+    def test_hot_path_indexes_exist(self, db_path):
+        names = _index_names(db_module._get_connection())
+        assert {'idx_clockings_date_check_out', 'idx_clockings_open',
+                'idx_clockings_task_date'} <= names
+
+    def test_open_session_lookup_uses_partial_index(self, db_path):
+        plan = _query_plan(
+            db_module._get_connection(),
+            "SELECT id FROM clockings WHERE check_out IS NULL ORDER BY id DESC LIMIT 1",
+        )
+        assert 'idx_clockings_open' in plan
+
+    def test_failed_migration_rolls_back(self, db_path, monkeypatch):
+        conn = db_module._get_connection()
+        conn.execute("PRAGMA user_version = 0")
+        monkeypatch.setattr(db_module, '_MIGRATIONS', ["CREATE TABLE broken (", "SELECT 1"])
+        with pytest.raises(sqlite3.Error):
+            init_db()
+        assert db_module.get_schema_version() == 0
+        assert not conn.in_transaction
+
+
+# ---------------------------------------------------------------------------
+# TestEpochColumns
+# ---------------------------------------------------------------------------
+
+class TestEpochColumns:
+    def _row(self, row_id):
+        return db_module._get_connection().execute(
+            "SELECT start_epoch, end_epoch, duration_seconds FROM clockings WHERE id = ?",
+            (row_id,),
+        ).fetchone()
+
+    def test_insert_stores_integer_epochs_and_duration(self, db_path):
+        insert_clocking('2024-01-01', 'TASK-1', '2024-01-01 09:00', '2024-01-01 10:30')
+        row = self._row(1)
+        assert row['end_epoch'] - row['start_epoch'] == 5400
+        assert row['duration_seconds'] == 5400
+
+    def test_open_session_has_no_duration(self, db_path):
+        insert_clocking('2024-01-01', 'TASK-1', '2024-01-01 09:00')
+        assert self._row(1)['duration_seconds'] is None
+
+    def test_check_out_update_recomputes_duration(self, db_path):
+        insert_clocking('2024-01-01', 'TASK-1', '2024-01-01 09:00')
+        db_module.update_check_out(1, '2024-01-01 09:15')
+        assert self._row(1)['duration_seconds'] == 900
+
+    def test_record_still_exposes_hh_mm(self, db_path):
+        insert_clocking('2024-01-01', 'TASK-1', '2024-01-01 09:00', '2024-01-01 10:30')
+        record = db_module.get_clockings_for_date('2024-01-01')[0]
+        assert record.check_in_time == '09:00'
+        assert record.check_out_time == '10:30'
+
+    def test_task_durations_sum_integer_seconds(self, db_path):
+        insert_clocking('2024-01-01', 'TASK-1', '2024-01-01 09:00', '2024-01-01 10:00')
+        insert_clocking('2024-01-01', 'TASK-1', '2024-01-01 11:00', '2024-01-01 11:20')
+        insert_clocking('2024-01-01', 'TASK-2', '2024-01-01 12:00', '2024-01-01 12:05')
+        durations = db_module.get_task_durations_for_date('2024-01-01')
+        assert [(d.task, d.total_seconds) for d in durations] == [('TASK-1', 4800), ('TASK-2', 300)]
+
+    def test_rebuild_keeps_autoincrement_counter(self, tmp_path, monkeypatch, use_db):
+        path = str(tmp_path / 'v1.db')
+        use_db(path)
+        monkeypatch.setattr(db_module, '_MIGRATIONS', db_module._MIGRATIONS[:1])
+        init_db()
+        insert_clocking('2024-01-01', 'TASK-1', '2024-01-01 09:00', '2024-01-01 10:00')
+        insert_clocking('2024-01-01', 'TASK-1', '2024-01-01 10:00', '2024-01-01 11:00')
+        db_module.delete_clocking(2)
+        monkeypatch.undo()
+        use_db(path)
+
+        init_db()
+        insert_clocking('2024-01-02', 'TASK-1', '2024-01-02 09:00')
+
+        assert db_module.get_open_clocking().id == 3
+
+
+# ---------------------------------------------------------------------------
+# TestDailyTaskTotals
+# ---------------------------------------------------------------------------
+
+class TestDailyTaskTotals:
+    def _totals(self):
+        rows = db_module._get_connection().execute(
+            "SELECT date, task, seconds, sessions FROM daily_task_totals ORDER BY date, task"
+        ).fetchall()
+        return [tuple(r) for r in rows]
+
+    def test_insert_completed_session_adds_totals(self, db_path):
+        insert_clocking('2024-01-01', 'TASK-1', '2024-01-01 09:00', '2024-01-01 10:00')
+        insert_clocking('2024-01-01', 'TASK-1', '2024-01-01 11:00', '2024-01-01 11:30')
+        assert self._totals() == [('2024-01-01', 'TASK-1', 5400, 2)]
+
+    def test_open_session_is_not_counted_until_check_out(self, db_path):
+        insert_clocking('2024-01-01', 'TASK-1', '2024-01-01 09:00')
+        assert self._totals() == []
+        db_module.update_check_out(1, '2024-01-01 09:30')
+        assert self._totals() == [('2024-01-01', 'TASK-1', 1800, 1)]
+
+    def test_edit_moves_totals_between_tasks_and_days(self, db_path):
+        insert_clocking('2024-01-01', 'TASK-1', '2024-01-01 09:00', '2024-01-01 10:00')
+        db_module.upsert_clocking(db_module.ClockingRecord(
+            date='2024-01-02', task='TASK-2', check_in='2024-01-02 09:00',
+            check_out='2024-01-02 09:10', message=None, id=1,
+        ))
+        assert self._totals() == [('2024-01-02', 'TASK-2', 600, 1)]
+
+    def test_delete_removes_totals(self, db_path):
+        insert_clocking('2024-01-01', 'TASK-1', '2024-01-01 09:00', '2024-01-01 10:00')
+        insert_clocking('2024-01-01', 'TASK-1', '2024-01-01 10:00', '2024-01-01 10:15')
+        db_module.delete_clocking(1)
+        assert self._totals() == [('2024-01-01', 'TASK-1', 900, 1)]
+        db_module.delete_clocking(2)
+        assert self._totals() == []
+
+    def test_check_reports_no_mismatch_when_consistent(self, db_path):
+        insert_clocking('2024-01-01', 'TASK-1', '2024-01-01 09:00', '2024-01-01 10:00')
+        assert db_module.check_daily_task_totals() == []
+
+    def test_check_and_rebuild_repair_drift(self, db_path):
+        insert_clocking('2024-01-01', 'TASK-1', '2024-01-01 09:00', '2024-01-01 10:00')
+        conn = db_module._get_connection()
+        with conn:
+            conn.execute("UPDATE daily_task_totals SET seconds = 1")
+            conn.execute("INSERT INTO daily_task_totals VALUES ('2023-12-31', 'GHOST', 60, 1)")
+
+        mismatches = db_module.check_daily_task_totals()
+        assert [(m.date, m.task) for m in mismatches] == [
+            ('2023-12-31', 'GHOST'), ('2024-01-01', 'TASK-1'),
+        ]
+        assert mismatches[1].expected_seconds == 3600
+        assert mismatches[1].stored_seconds == 1
+
+        db_module.rebuild_daily_task_totals()
+        assert db_module.check_daily_task_totals() == []
+        assert self._totals() == [('2024-01-01', 'TASK-1', 3600, 1)]
+
+    def test_command_line_checks_and_rebuilds(self, db_path, capsys):
+        insert_clocking('2024-01-01', 'TASK-1', '2024-01-01 09:00', '2024-01-01 10:00')
+        assert db_module.main(['--check-totals']) == 0
+
+        conn = db_module._get_connection()
+        with conn:
+            conn.execute("UPDATE daily_task_totals SET seconds = 1")
+        assert db_module.main(['--check-totals']) == 1
+        assert '2024-01-01 TASK-1: expected 3600s' in capsys.readouterr().out
+
+        assert db_module.main(['--rebuild-totals']) == 0
+        assert db_module.main(['--check-totals']) == 0
+
+    def test_completed_seconds_lookup_uses_totals_primary_key(self, db_path):
+        plan = _query_plan(
+            db_module._get_connection(),
+            "SELECT COALESCE(SUM(seconds), 0) FROM daily_task_totals WHERE date = ?",
+            ('2024-01-01',),
+        )
+        assert 'PRIMARY KEY' in plan
+
+
+# ---------------------------------------------------------------------------
+# TestClockingPagination
+# ---------------------------------------------------------------------------
+
+class TestClockingPagination:
+    @pytest.fixture
+    def history(self, db_path):
+        # Two rows share a check_in so the id tie-breaker is exercised
+        for day, time in [('01', '09:00'), ('02', '09:00'), ('02', '09:00'), ('03', '09:00'),
+                          ('04', '09:00')]:
+            insert_clocking(f'2024-01-{day}', 'TASK-1', f'2024-01-{day} {time}')
+        return db_path
+
+    def test_first_page_is_newest_rows_oldest_first(self, history):
+        page = db_module.get_clockings_page(limit=2)
+        assert [r.id for r in page] == [4, 5]
+
+    def test_pages_walk_back_without_gaps_or_duplicates(self, history):
+        seen = []
+        page = db_module.get_clockings_page(limit=2)
+        while page:
+            seen[0:0] = [r.id for r in page]
+            page = db_module.get_clockings_page(page[0].check_in, page[0].id, limit=2)
+        assert seen == [1, 2, 3, 4, 5]
+
+    def test_cursor_without_id_excludes_equal_check_in(self, history):
+        page = db_module.get_clockings_page('2024-01-02 09:00', limit=10)
+        assert [r.id for r in page] == [1]
+
+    def test_get_clockings_since(self, history):
+        assert [r.id for r in db_module.get_clockings_since('2024-01-03')] == [4, 5]
+
+    def test_page_query_uses_check_in_index(self, history):
+        plan = _query_plan(
+            db_module._get_connection(),
+            "SELECT id FROM clockings WHERE (check_in, id) < (?, ?) "
+            "ORDER BY check_in DESC, id DESC LIMIT 10",
+            ('2024-01-03 09:00', 4),
+        )
+        assert 'idx_clockings_check_in' in plan
+
+
+# ---------------------------------------------------------------------------
+# TestDataVersion
+# ---------------------------------------------------------------------------
+
+class TestDataVersion:
+    def test_changes_after_commit_from_another_connection(self, db_path):
+        before = db_module.get_data_version()
+        other = sqlite3.connect(db_path)
+        with other:
+            other.execute("INSERT INTO tasks VALUES ('TASK-1', 'desc', 'fixed')")
+        other.close()
+        assert db_module.get_data_version() != before
+
+    def test_own_writes_do_not_change_it(self, db_path):
+        before = db_module.get_data_version()
+        insert_clocking('2024-01-01', 'TASK-1', '2024-01-01 09:00')
+        assert db_module.get_data_version() == before
+
+
+# ---------------------------------------------------------------------------
+# TestWriteReturns
+# ---------------------------------------------------------------------------
+
+class TestWriteReturns:
+    def test_insert_returns_stored_record(self, db_path):
+        record = insert_clocking('2024-01-01', 'TASK-1', '2024-01-01 09:00')
+        assert record == get_open_clocking()
+
+    def test_update_check_out_returns_updated_record(self, db_path):
+        inserted = insert_clocking('2024-01-01', 'TASK-1', '2024-01-01 09:00')
+        updated = db_module.update_check_out(inserted.id, '2024-01-01 10:00')
+        assert updated.id == inserted.id
+        assert updated.check_out == '2024-01-01 10:00'
+
+    def test_update_check_out_of_missing_row_returns_none(self, db_path):
+        assert db_module.update_check_out(42, '2024-01-01 10:00') is None
+
+
+# ---------------------------------------------------------------------------
+# TestOpenTaskSync
+# ---------------------------------------------------------------------------
+
+class TestOpenTaskSync:
+    @pytest.fixture
+    def tasks(self, db_path):
+        db_module.save_tasks([
+            db_module.TaskRecord('FIX-1', 'Fixed', 'fixed'),
+            db_module.TaskRecord('T-1', 'One', 'open'),
+            db_module.TaskRecord('T-2', 'Two', 'open'),
+            db_module.TaskRecord('T-3', 'Three', 'closed'),
+        ])
+        return db_path
+
+    def _types(self):
+        return {t.task: (t.task_type, t.description) for t in db_module.get_all_tasks()}
+
+    def test_full_sync_closes_every_missing_open_task(self, tasks):
+        result = db_module.sync_open_tasks([
+            {'task': 'T-1', 'description': 'One'},
+            {'task': 'T-3', 'description': 'Three again'},
+            {'task': 'T-4', 'description': 'Four'},
+        ])
+
+        assert result == db_module.TaskSyncResult(added=['T-4'], updated=['T-3'], closed=['T-2'])
+        assert self._types() == {
+            'FIX-1': ('fixed', 'Fixed'),
+            'T-1': ('open', 'One'),
+            'T-2': ('closed', 'Two'),
+            'T-3': ('open', 'Three again'),
+            'T-4': ('open', 'Four'),
+        }
+
+    def test_delta_sync_only_closes_given_tasks(self, tasks):
+        result = db_module.sync_open_tasks(
+            [{'task': 'T-4', 'description': 'Four'}],
+            closed_tasks={'T-1', 'FIX-1', 'MISSING-1'},
+        )
+
+        assert result == db_module.TaskSyncResult(added=['T-4'], updated=[], closed=['T-1'])
+        assert self._types()['T-2'] == ('open', 'Two')
+        assert self._types()['FIX-1'] == ('fixed', 'Fixed')
+
+    def test_open_issue_wins_over_closed_entry(self, tasks):
+        result = db_module.sync_open_tasks(
+            [{'task': 'T-1', 'description': 'Reopened'}], closed_tasks={'T-1'})
+        assert result.closed == []
+        assert self._types()['T-1'] == ('open', 'Reopened')
+
+    def test_unchanged_sync_reports_nothing(self, tasks):
+        result = db_module.sync_open_tasks([{'task': 'T-1', 'description': 'One'},
+                                            {'task': 'T-2', 'description': 'Two'}])
+        assert not result.changed
+
+    def test_state_is_written_in_the_same_transaction(self, tasks):
+        db_module.sync_open_tasks([], closed_tasks=set(), state=('watermark', '42'))
+        assert db_module.get_app_state('watermark') == '42'
+
+    def test_failure_rolls_back_everything(self, tasks):
+        with pytest.raises(sqlite3.IntegrityError):
+            db_module.sync_open_tasks(
+                [{'task': 'T-4', 'description': None}], state=('watermark', '42'))
+        assert db_module.get_app_state('watermark') is None
+        assert self._types()['T-2'] == ('open', 'Two')
+
+    def test_large_sync(self, db_path):
+        issues = [{'task': f'T-{i}', 'description': f'Issue {i}'} for i in range(5000)]
+        assert len(db_module.sync_open_tasks(issues).added) == 5000
+        result = db_module.sync_open_tasks(issues[:4000])
+        assert len(result.closed) == 1000 and not result.added
+
+    def test_app_state_round_trip(self, db_path):
+        assert db_module.get_app_state('watermark') is None
+        db_module.set_app_state('watermark', '1')
+        db_module.set_app_state('watermark', '2')
+        assert db_module.get_app_state('watermark') == '2'
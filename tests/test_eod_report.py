@@ -4,6 +4,7 @@ import datetime
 import pytest
 
 from services.database import ClockingRecord, TaskRecord, init_db, save_tasks
+from services.jira_links import JiraLinkResolver
 from windows.eod_report import EodReport
 
 # ---------------------------------------------------------------------------
@@ -26,10 +27,9 @@ def make_record(date, task, check_in='09:00', check_out='10:00', message=None, i
 
 
 @pytest.fixture
-def db_env(tmp_path, monkeypatch):
-    import services.database as db_module
+def db_env(tmp_path, use_db):
     db_path = str(tmp_path / 'clocking.db')
-    monkeypatch.setattr(db_module, 'get_db_path', lambda: db_path)
+    use_db(db_path)
     init_db()
     return tmp_path
 
@@ -156,6 +156,18 @@ class TestDisplayTaskMessages:
         assert '- ' not in text
         widget.close()
 
+    def test_jira_tasks_are_linked_and_text_is_kept(self, qt_app, db_env, monkeypatch):
+        import windows.eod_report as eod_report
+        resolver = JiraLinkResolver('https://example.atlassian.net', ['TASK'])
+        monkeypatch.setattr(eod_report, 'get_jira_link_resolver', lambda: resolver)
+        widget = EodReport([])
+        widget.display_task_messages({'TASK-1': ['a <b>bold</b>  claim'], 'Meeting': []})
+        assert 'href="https://example.atlassian.net/browse/TASK-1"' in widget.report_text.toHtml()
+        assert widget.report_text.toPlainText().splitlines() == [
+            'TASK-1:', '- a <b>bold</b>  claim', 'Meeting:',
+        ]
+        widget.close()
+
 
 # ---------------------------------------------------------------------------
 # TestEodReportWidget
@@ -0,0 +1,156 @@
+"""Tests for the opt-in instrumentation (services/instrumentation.py)."""
+import functools
+import importlib
+import pstats
+import sys
+import textwrap
+import types
+
+import pytest
+
+from services import instrumentation
+from services.instrumentation import Histogram, LatencyRecorder, Session, instrument_module
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+
+def make_module(name='fake_module'):
+    module = types.ModuleType(name)
+    exec(textwrap.dedent('''
+        def query(x):
+            return x * 2
+
+        def _helper():
+            return 1
+
+        class Widget:
+            def refresh(self):
+                return 'refreshed'
+    '''), module.__dict__)
+    return module
+
+
+@pytest.fixture
+def module_on_path(tmp_path, monkeypatch):
+    """An importable module, not imported yet."""
+    (tmp_path / 'lazy_client.py').write_text('def fetch():\n    return "data"\n')
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield 'lazy_client'
+    sys.modules.pop('lazy_client', None)
+
+
+# ---------------------------------------------------------------------------
+# TestHistogram
+# ---------------------------------------------------------------------------
+
+class TestHistogram:
+    def test_buckets_and_stats(self):
+        h = Histogram()
+        for ms in (0.05, 0.3, 0.3, 7, 6000):
+            h.add(ms)
+        assert (h.calls, h.max_ms) == (5, 6000)
+        assert h.buckets[0] == 1 and h.buckets[2] == 2 and h.buckets[-1] == 1
+        assert h.percentile(0.5) == 0.5
+        assert h.percentile(1.0) == 6000
+
+    def test_report_lists_slowest_first(self):
+        recorder = LatencyRecorder()
+        recorder.record('fast', 0.1)
+        recorder.record('slow', 30)
+        lines = recorder.report().splitlines()
+        assert lines[1].startswith('slow') and lines[2].startswith('fast')
+
+
+# ---------------------------------------------------------------------------
+# TestInstrumentModule
+# ---------------------------------------------------------------------------
+
+class TestInstrumentModule:
+    def test_public_functions_are_timed(self):
+        module, recorder = make_module(), LatencyRecorder()
+        assert instrument_module(module, None, recorder) == ['query']
+        assert module.query(2) == 4
+        assert recorder.snapshot()['fake_module.query'].calls == 1
+
+    def test_methods_by_qualified_name(self):
+        module, recorder = make_module(), LatencyRecorder()
+        instrument_module(module, ['Widget.refresh'], recorder)
+        assert module.Widget().refresh() == 'refreshed'
+        assert recorder.snapshot()['fake_module.Widget.refresh'].calls == 1
+
+    def test_failing_calls_are_recorded(self):
+        module, recorder = make_module(), LatencyRecorder()
+        instrument_module(module, None, recorder)
+        with pytest.raises(TypeError):
+            module.query()
+        assert recorder.snapshot()['fake_module.query'].calls == 1
+
+    def test_wrapping_twice_is_a_no_op(self):
+        module, recorder = make_module(), LatencyRecorder()
+        instrument_module(module, None, recorder)
+        assert instrument_module(module, None, recorder) == []
+
+
+# ---------------------------------------------------------------------------
+# TestSession
+# ---------------------------------------------------------------------------
+
+class TestSession:
+    def test_modules_imported_later_are_instrumented(self, module_on_path, tmp_path):
+        session = Session({module_on_path: None})
+        session.start()
+        try:
+            import lazy_client
+            assert lazy_client.fetch() == 'data'
+        finally:
+            latency_path, profile_path = session.finish(tmp_path / 'profiles')
+
+        assert 'lazy_client.fetch' in latency_path.read_text()
+        assert pstats.Stats(str(profile_path)).total_calls > 0
+        assert session._finder not in sys.meta_path
+
+    def test_loaded_modules_are_instrumented_on_start(self, tmp_path, monkeypatch):
+        module = make_module('loaded_module')
+        monkeypatch.setitem(sys.modules, 'loaded_module', module)
+        session = Session({'loaded_module': ['query']})
+        session.start()
+        module.query(1)
+        latency_path, _ = session.finish(tmp_path)
+        assert 'loaded_module.query' in latency_path.read_text()
+
+
+# ---------------------------------------------------------------------------
+# TestInstrumentedTargets
+# ---------------------------------------------------------------------------
+
+class TestInstrumentedTargets:
+    @pytest.mark.parametrize('module_name', list(instrumentation.INSTRUMENTED))
+    def test_listed_names_exist(self, module_name):
+        module = importlib.import_module(module_name)
+        for qualname in instrumentation.INSTRUMENTED[module_name]:
+            assert callable(functools.reduce(getattr, qualname.split('.'), module)), qualname
+
+    def test_per_call_helpers_are_not_timed(self):
+        listed = {name for names in instrumentation.INSTRUMENTED.values() for name in names}
+        helpers = {'get_app_data_dir', 'get_db_path', 'get_connection_manager',
+                   'get_jira', 'get_session', 'convert_datetime_to_utc'}
+        assert not listed & helpers
+
+
+# ---------------------------------------------------------------------------
+# TestEnabled
+# ---------------------------------------------------------------------------
+
+class TestEnabled:
+    @pytest.mark.parametrize('value, expected', [('1', True), ('yes', True), ('0', False),
+                                                 ('', False), ('false', False)])
+    def test_environment_variable(self, monkeypatch, value, expected):
+        monkeypatch.setenv(instrumentation.PROFILE_ENV, value)
+        assert instrumentation.enabled([]) is expected
+
+    def test_command_line_flag(self, monkeypatch):
+        monkeypatch.delenv(instrumentation.PROFILE_ENV, raising=False)
+        assert instrumentation.enabled(['app.py', '--profile'])
+        assert not instrumentation.enabled(['app.py'])
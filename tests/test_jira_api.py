@@ -0,0 +1,229 @@
+"""Tests for the cached Jira client (services/jira_api.py)."""
+import datetime
+import json
+import urllib.parse
+from unittest.mock import MagicMock
+
+import pytest
+import requests
+from requests.adapters import HTTPAdapter
+
+import services.database as db_module
+import services.jira_api as jira_api
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture
+def settings(app_db, monkeypatch):
+    values = {
+        'ATLASSIAN_URL': 'https://example.atlassian.net',
+        'ATLASSIAN_EMAIL': 'me@example.com',
+        'ATLASSIAN_TOKEN': 'token-1',
+    }
+    config = MagicMock()
+    config.get.side_effect = lambda key, default='': values.get(key, default)
+    monkeypatch.setattr(jira_api, 'get_config_manager', lambda: config)
+    jira_api.clear_jira_cache()
+    yield values
+    jira_api.clear_jira_cache()
+
+
+@pytest.fixture
+def built(settings, monkeypatch):
+    """Record the clients _build_client creates instead of constructing real ones."""
+    clients = []
+
+    def build(url, email, token):
+        clients.append(MagicMock(name=f'JIRA({url}, {email})'))
+        return clients[-1]
+
+    monkeypatch.setattr(jira_api, '_build_client', build)
+    return clients
+
+
+class FakeJiraServer:
+    """Answers the REST calls of a real JIRA client, recording each (path, params)."""
+
+    def __init__(self, deployment='Cloud'):
+        self.deployment = deployment
+        self.issues: list[dict] = []
+        self.requests: list[tuple[str, dict]] = []
+
+    def send(self, request) -> requests.Response:
+        url = urllib.parse.urlsplit(request.url)
+        path = url.path.removeprefix('/rest/api/2/')
+        params: dict[str, str] = {}
+        for key, value in urllib.parse.parse_qsl(url.query):
+            params[key] = f'{params[key]},{value}' if key in params else value
+        self.requests.append((path, params))
+        response = requests.Response()
+        response.status_code = 200
+        response.headers['Content-Type'] = 'application/json'
+        response._content = json.dumps(self.handle(path, params)).encode()
+        response.url = request.url
+        response.request = request
+        return response
+
+    def handle(self, path, params):
+        if path == 'serverInfo':
+            version = [1001, 0, 0] if self.deployment == 'Cloud' else [9, 12, 0]
+            return {'versionNumbers': version, 'deploymentType': self.deployment}
+        if path == 'field':
+            return []
+        size = int(params['maxResults'])
+        if path == 'search':
+            start = int(params.get('startAt', 0))
+            return {'startAt': start, 'maxResults': size, 'total': len(self.issues),
+                    'issues': self.issues[start:start + size]}
+        if path == 'search/jql':
+            start = int(params.get('nextPageToken', 0))
+            page = {'issues': self.issues[start:start + size]}
+            if start + size < len(self.issues):
+                page['nextPageToken'] = str(start + size)
+            return page
+        raise AssertionError(f'unexpected request {path}')
+
+    def searches(self) -> list[tuple[str, dict]]:
+        return [(path, params) for path, params in self.requests if path.startswith('search')]
+
+
+@pytest.fixture
+def jira_server(settings, monkeypatch):
+    """A Jira Cloud site served in-process to real JIRA clients."""
+    server = FakeJiraServer()
+    monkeypatch.setattr(HTTPAdapter, 'send',
+                        lambda adapter, request, **kwargs: server.send(request))
+    return server
+
+
+def issue_json(key, status='In Progress', summary=None):
+    return {'id': key, 'key': key, 'self': f'https://example.atlassian.net/issue/{key}',
+            'fields': {'status': {'name': status}, 'summary': summary or f'Summary of {key}'}}
+
+
+@pytest.fixture(params=['Cloud', 'Server'])
+def searched(jira_server, request, monkeypatch):
+    """The fake site as each deployment type, searched two issues per page."""
+    monkeypatch.setattr(jira_api, 'JIRA_SEARCH_PAGE_SIZE', 2)
+    jira_server.deployment = request.param
+    return jira_server
+
+
+def page_starts(server: FakeJiraServer) -> list[int]:
+    """Offset of each page searched, whichever way the deployment pages."""
+    return [int(params.get('startAt') or params.get('nextPageToken') or 0)
+            for _, params in server.searches()]
+
+
+# ---------------------------------------------------------------------------
+# TestJiraClient
+# ---------------------------------------------------------------------------
+
+class TestJiraClient:
+    def test_client_is_reused_across_pushes(self, built):
+        start = datetime.datetime(2024, 1, 2, 9, 0)
+        for _ in range(5):
+            assert jira_api.push_worklog_to_jira('TASK-1', start, datetime.timedelta(hours=1))
+        assert len(built) == 1
+        assert built[0].add_worklog.call_count == 5
+
+    def test_clear_cache_rebuilds_and_closes_client(self, built):
+        first = jira_api.get_jira()
+        jira_api.clear_jira_cache()
+        assert jira_api.get_jira() is not first
+        first.close.assert_called_once()
+
+    def test_new_credentials_get_their_own_client(self, settings, built):
+        first = jira_api.get_jira()
+        settings['ATLASSIAN_TOKEN'] = 'token-2'
+        assert jira_api.get_jira() is not first
+        assert len(built) == 2
+
+    def test_client_has_timeout_and_connection_pool(self, settings, jira_server):
+        client = jira_api.get_jira()
+        assert client._session.timeout == jira_api.DEFAULT_TIMEOUT
+        adapter = client._session.get_adapter(settings['ATLASSIAN_URL'])
+        assert adapter.poolmanager.connection_pool_kw['maxsize'] == jira_api.POOL_SIZE
+
+
+    def test_cloud_site_is_detected_once_per_client(self, jira_server):
+        client = jira_api.get_jira()
+        assert client._is_cloud
+        jira_api.get_jira()
+        assert [path for path, _ in jira_server.requests].count('serverInfo') == 1
+
+    def test_cloud_search_uses_the_jql_endpoint(self, jira_server):
+        jira_server.issues = [issue_json('T-1'), issue_json('T-2', status='Done')]
+
+        open_issues, closed = jira_api.get_jira_issue_changes(15)
+
+        assert open_issues == [{'task': 'T-1', 'description': 'Summary of T-1'}]
+        assert closed == {'T-2'}
+        assert [path for path, _ in jira_server.searches()] == ['search/jql']
+
+
+# ---------------------------------------------------------------------------
+# TestOpenIssueSync
+# ---------------------------------------------------------------------------
+
+class TestOpenIssueSync:
+    def test_full_sync_filters_status_in_jql_and_pages(self, searched):
+        searched.issues = [issue_json(f'T-{i}') for i in range(5)]
+
+        issues = jira_api.get_jira_open_issues()
+
+        assert [i['task'] for i in issues] == ['T-0', 'T-1', 'T-2', 'T-3', 'T-4']
+        assert page_starts(searched) == [0, 2, 4]
+        endpoint = 'search/jql' if searched.deployment == 'Cloud' else 'search'
+        assert {path for path, _ in searched.searches()} == {endpoint}
+        params = searched.searches()[0][1]
+        assert params['jql'].startswith('assignee = "me@example.com" AND status in ("Backlog", ')
+        assert params['fields'] == ','.join(jira_api.OPEN_ISSUE_FIELDS)
+
+    def test_exact_multiple_of_page_size_stops_after_one_page(self, searched):
+        searched.issues = [issue_json('T-1'), issue_json('T-2')]
+        assert len(jira_api.get_jira_open_issues()) == 2
+        assert len(searched.searches()) == 1
+
+    def test_changes_split_open_and_closed(self, searched):
+        searched.issues = [issue_json('T-1'), issue_json('T-2', status='Done')]
+
+        open_issues, closed = jira_api.get_jira_issue_changes(15)
+
+        assert open_issues == [{'task': 'T-1', 'description': 'Summary of T-1'}]
+        assert closed == {'T-2'}
+        jql = searched.searches()[0][1]['jql']
+        assert jql == 'assignee = "me@example.com" AND updated >= "-15m"'
+
+    def test_first_sync_is_full(self, searched):
+        changes = jira_api.fetch_open_issue_changes(now=10_000.0)
+        assert changes.full
+        assert changes.started_at == 10_000.0
+        assert 'status in' in searched.searches()[0][1]['jql']
+
+    def test_later_sync_only_fetches_updates_since_watermark(self, searched):
+        changes = jira_api.fetch_open_issue_changes(now=10_000.0)
+        db_module.set_app_state(changes.watermark_key, str(changes.started_at))
+
+        changes = jira_api.fetch_open_issue_changes(now=10_000.0 + 601)
+
+        assert not changes.full
+        minutes = 11 + jira_api.SYNC_OVERLAP_MINUTES
+        assert searched.searches()[-1][1]['jql'].endswith(f'updated >= "-{minutes}m"')
+
+    def test_stale_watermark_falls_back_to_full_sync(self, searched):
+        changes = jira_api.fetch_open_issue_changes(now=10_000.0)
+        db_module.set_app_state(changes.watermark_key, str(changes.started_at))
+
+        later = 10_000.0 + jira_api.JIRA_FULL_SYNC_INTERVAL_SECONDS + 1
+        assert jira_api.fetch_open_issue_changes(now=later).full
+
+    def test_watermark_is_per_account(self, settings, searched):
+        changes = jira_api.fetch_open_issue_changes(now=10_000.0)
+        db_module.set_app_state(changes.watermark_key, str(changes.started_at))
+
+        settings['ATLASSIAN_EMAIL'] = 'other@example.com'
+        assert jira_api.fetch_open_issue_changes(now=10_060.0).full
@@ -0,0 +1,71 @@
+"""Tests for the Jira link resolver (services/jira_links.py)."""
+import pytest
+
+import services.jira_links as jira_links
+from services.config_manager import ConfigManager
+from services.jira_links import JiraLinkResolver, get_jira_link_resolver
+
+BASE_URL = 'https://example.atlassian.net'
+
+
+@pytest.fixture
+def config(tmp_path, monkeypatch):
+    """A fresh configuration as the global one, with no resolver cached yet."""
+    config = ConfigManager(env_path=str(tmp_path / '.env'))
+    config.update_all({'ATLASSIAN_URL': BASE_URL + '/', 'JIRA_TASK_PREFIX': 'PROJ, ops'})
+    monkeypatch.setattr(jira_links, 'get_config_manager', lambda: config)
+    monkeypatch.setattr(jira_links, '_resolver', None)
+    return config
+
+
+# ---------------------------------------------------------------------------
+# TestJiraLinkResolver
+# ---------------------------------------------------------------------------
+
+class TestJiraLinkResolver:
+    @pytest.mark.parametrize('task', ['PROJ-1', 'proj-12', 'OPS-3'])
+    def test_links_tasks_with_a_configured_prefix(self, task):
+        resolver = JiraLinkResolver(BASE_URL + '/', ['PROJ', ' ops '])
+        assert resolver.url_for(task) == f'{BASE_URL}/browse/{task}'
+
+    @pytest.mark.parametrize('task', ['OTHER-1', 'PROJ1', 'XPROJ-1', 'Meeting'])
+    def test_other_tasks_have_no_link(self, task):
+        assert JiraLinkResolver(BASE_URL, ['PROJ', 'OPS']).url_for(task) is None
+
+    def test_prefix_is_matched_literally(self):
+        resolver = JiraLinkResolver(BASE_URL, ['A.B'])
+        assert resolver.url_for('A.B-1') is not None
+        assert resolver.url_for('AXB-1') is None
+
+    @pytest.mark.parametrize('base_url, prefixes', [('', ['PROJ']), (BASE_URL, ['', ' '])])
+    def test_nothing_is_linked_without_url_or_prefixes(self, base_url, prefixes):
+        assert JiraLinkResolver(base_url, prefixes).url_for('PROJ-1') is None
+
+
+# ---------------------------------------------------------------------------
+# TestGetJiraLinkResolver
+# ---------------------------------------------------------------------------
+
+class TestGetJiraLinkResolver:
+    def test_reads_the_configuration(self, config):
+        assert get_jira_link_resolver().url_for('OPS-1') == f'{BASE_URL}/browse/OPS-1'
+
+    def test_is_reused_while_the_configuration_is_unchanged(self, config):
+        resolver = get_jira_link_resolver()
+        config.set('JIRA_TASK_PREFIX', 'PROJ, ops')
+        assert get_jira_link_resolver() is resolver
+
+    def test_is_rebuilt_after_the_configuration_changes(self, config):
+        resolver = get_jira_link_resolver()
+        config.set('JIRA_TASK_PREFIX', 'NEW')
+        rebuilt = get_jira_link_resolver()
+        assert rebuilt is not resolver
+        assert rebuilt.url_for('NEW-1') is not None
+        assert rebuilt.url_for('PROJ-1') is None
+
+    def test_is_rebuilt_for_another_configuration(self, config, tmp_path, monkeypatch):
+        resolver = get_jira_link_resolver()
+        other = ConfigManager(env_path=str(tmp_path / 'other.env'))
+        monkeypatch.setattr(jira_links, 'get_config_manager', lambda: other)
+        assert get_jira_link_resolver() is not resolver
+        assert get_jira_link_resolver().url_for('PROJ-1') is None
@@ -0,0 +1,189 @@
+"""Tests for the persistent lookup cache (services/lookup_cache.py)."""
+import sqlite3
+from unittest.mock import MagicMock
+
+import pytest
+
+import services.clockify_api as clockify_api
+import services.lookup_cache as lookup_cache_module
+from services.lookup_cache import LookupCache, persistent_cache
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+
+class FakeClock:
+    def __init__(self, now: float = 1_700_000_000):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def cache(app_db, clock):
+    return LookupCache(ttl_seconds=100, clock=clock)
+
+
+# ---------------------------------------------------------------------------
+# TestLookupCache
+# ---------------------------------------------------------------------------
+
+class TestLookupCache:
+    def test_miss_then_hit(self, cache):
+        assert cache.get('project', 'PROJ') is None
+        cache.put('project', 'PROJ', 'Project')
+        assert cache.get('project', 'PROJ') == 'Project'
+
+    def test_entries_survive_a_new_instance(self, cache, clock):
+        cache.put('project', 'PROJ', 'Project')
+        assert LookupCache(ttl_seconds=100, clock=clock).get('project', 'PROJ') == 'Project'
+
+    def test_entries_expire_after_ttl(self, cache, clock):
+        cache.put('project', 'PROJ', 'Project')
+        clock.now += 100
+        assert cache.get('project', 'PROJ') is None
+        assert LookupCache(ttl_seconds=100, clock=clock).get('project', 'PROJ') is None
+
+    def test_invalidate_only_drops_given_kinds(self, cache, clock):
+        cache.put('project', 'PROJ', 'Project')
+        cache.put('task', 'PROJ-1', 't-1')
+        cache.invalidate(['project'])
+        fresh = LookupCache(ttl_seconds=100, clock=clock)
+        for c in (cache, fresh):
+            assert c.get('project', 'PROJ') is None
+            assert c.get('task', 'PROJ-1') == 't-1'
+
+    def test_invalidate_all(self, cache, clock):
+        cache.put('project', 'PROJ', 'Project')
+        cache.put('task', 'PROJ-1', 't-1')
+        cache.invalidate()
+        assert cache.get('task', 'PROJ-1') is None
+        assert LookupCache(ttl_seconds=100, clock=clock).get('project', 'PROJ') is None
+
+    def test_purge_expired_keeps_live_entries(self, cache, clock, app_db):
+        cache.put('project', 'OLD', 'Old')
+        clock.now += 50
+        cache.put('project', 'NEW', 'New')
+        clock.now += 60
+        cache.purge_expired()
+        with sqlite3.connect(app_db) as conn:
+            keys = [row[0] for row in conn.execute("SELECT key FROM lookup_cache")]
+        assert keys == ['NEW']
+
+    def test_database_errors_fall_back_to_memory(self, cache, monkeypatch):
+        def broken(*args):
+            raise sqlite3.OperationalError('disk I/O error')
+
+        monkeypatch.setattr(lookup_cache_module, 'put_cached_lookup', broken)
+        monkeypatch.setattr(lookup_cache_module, 'get_cached_lookup', broken)
+        cache.put('project', 'PROJ', 'Project')
+        assert cache.get('project', 'PROJ') == 'Project'
+        assert cache.get('project', 'OTHER') is None
+
+
+# ---------------------------------------------------------------------------
+# TestPersistentCache
+# ---------------------------------------------------------------------------
+
+class TestPersistentCache:
+    def test_calls_function_once_per_arguments(self, app_db):
+        calls = []
+
+        @persistent_cache('test_kind')
+        def lookup(a, b):
+            calls.append((a, b))
+            return f'{a}/{b}'
+
+        assert lookup('x', 'y') == 'x/y'
+        assert lookup('x', 'y') == 'x/y'
+        assert lookup('x', 'z') == 'x/z'
+        assert calls == [('x', 'y'), ('x', 'z')]
+
+    def test_hit_across_launches(self, app_db, monkeypatch):
+        lookup = persistent_cache('test_kind')(lambda key: f'value-{key}')
+        lookup('k')
+        monkeypatch.setattr(lookup_cache_module, '_lookup_cache', None)
+        remote = MagicMock(side_effect=AssertionError('not cached'))
+        assert persistent_cache('test_kind')(remote)('k') == 'value-k'
+
+    def test_cache_clear_forces_lookup(self, app_db):
+        values = iter(['first', 'second'])
+        lookup = persistent_cache('test_kind')(lambda key: next(values))
+        assert lookup('k') == 'first'
+        lookup.cache_clear()
+        assert lookup('k') == 'second'
+
+    def test_exceptions_are_not_cached(self, app_db):
+        outcomes = iter([KeyError('boom'), 'ok'])
+
+        @persistent_cache('test_kind')
+        def lookup(key):
+            outcome = next(outcomes)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        with pytest.raises(KeyError):
+            lookup('k')
+        assert lookup('k') == 'ok'
+
+
+# ---------------------------------------------------------------------------
+# TestWarmProjectLookups
+# ---------------------------------------------------------------------------
+
+class TestWarmProjectLookups:
+    @pytest.fixture
+    def configured(self, app_db, monkeypatch):
+        config = MagicMock()
+        config.is_jira_configured.return_value = (True, [])
+        config.is_clockify_configured.return_value = (True, [])
+        monkeypatch.setattr(clockify_api, 'get_config_manager', lambda: config)
+        monkeypatch.setattr(clockify_api, '_project_task_index', MagicMock())
+        return config
+
+    def test_resolves_each_project_once(self, configured, monkeypatch):
+        names = MagicMock(side_effect=lambda key: f'{key} project')
+        projects = MagicMock(side_effect=lambda name: f'id of {name}')
+        monkeypatch.setattr(clockify_api, 'get_project_name', names)
+        monkeypatch.setattr(clockify_api, 'find_clockify_project', projects)
+
+        assert clockify_api.warm_project_lookups(['AB-1', 'AB-2', 'CD-1', 'local']) == 2
+        assert [c.args for c in names.call_args_list] == [('AB',), ('CD',)]
+        assert [c.args for c in projects.call_args_list] == [('AB project',), ('CD project',)]
+        assert [c.args for c in clockify_api._project_task_index.call_args_list] == [
+            ('id of AB project',), ('id of CD project',)]
+
+    def test_skips_clockify_when_not_configured(self, configured, monkeypatch):
+        configured.is_clockify_configured.return_value = (False, ['CLOCKIFY_API_KEY'])
+        projects = MagicMock()
+        monkeypatch.setattr(clockify_api, 'get_project_name', lambda key: key)
+        monkeypatch.setattr(clockify_api, 'find_clockify_project', projects)
+
+        assert clockify_api.warm_project_lookups(['AB-1']) == 1
+        projects.assert_not_called()
+
+    def test_does_nothing_without_jira(self, configured, monkeypatch):
+        configured.is_jira_configured.return_value = (False, ['ATLASSIAN_URL'])
+        names = MagicMock()
+        monkeypatch.setattr(clockify_api, 'get_project_name', names)
+
+        assert clockify_api.warm_project_lookups(['AB-1']) == 0
+        names.assert_not_called()
+
+    def test_failures_are_skipped(self, configured, monkeypatch):
+        def name(key):
+            if key == 'AB':
+                raise RuntimeError('offline')
+            return key
+
+        monkeypatch.setattr(clockify_api, 'get_project_name', name)
+        monkeypatch.setattr(clockify_api, 'find_clockify_project', lambda name: 'id')
+        assert clockify_api.warm_project_lookups(['AB-1', 'CD-1']) == 1
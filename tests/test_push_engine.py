@@ -0,0 +1,114 @@
+"""Tests for the parallel worklog push engine (services/push_engine.py)."""
+import threading
+
+from services.push_engine import PushEngine, PushJob, PushTarget, TokenBucket
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def make_job(target, task='TASK-1', send=lambda: True):
+    return PushJob(target, task, 3600, send)
+
+
+# ---------------------------------------------------------------------------
+# TestTokenBucket
+# ---------------------------------------------------------------------------
+
+class TestTokenBucket:
+    def test_burst_is_served_without_waiting(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=2, capacity=3, clock=clock, sleep=clock.sleep)
+        for _ in range(3):
+            bucket.acquire()
+        assert clock.now == 0
+
+    def test_waits_for_refill_after_burst(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=2, capacity=1, clock=clock, sleep=clock.sleep)
+        for _ in range(5):
+            bucket.acquire()
+        assert clock.now == 2.0
+
+    def test_tokens_do_not_accumulate_beyond_capacity(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=1, capacity=2, clock=clock, sleep=clock.sleep)
+        clock.now = 100
+        for _ in range(3):
+            bucket.acquire()
+        assert clock.now == 101
+
+
+# ---------------------------------------------------------------------------
+# TestPushEngine
+# ---------------------------------------------------------------------------
+
+class TestPushEngine:
+    def test_in_flight_requests_stay_within_target_limit(self):
+        target = PushTarget('Jira', max_in_flight=2, rate_per_second=1000, burst=100)
+        lock = threading.Lock()
+        in_flight = peak = 0
+        gate = threading.Event()
+
+        def send():
+            nonlocal in_flight, peak
+            with lock:
+                in_flight += 1
+                peak = max(peak, in_flight)
+            gate.wait(0.05)
+            with lock:
+                in_flight -= 1
+            return True
+
+        results = PushEngine(max_workers=8).run([make_job(target, send=send)
+                                                 for _ in range(8)])
+        assert len(results) == 8
+        assert peak == 2
+
+    def test_results_are_reported_and_exceptions_become_failures(self):
+        target = PushTarget('Clockify', max_in_flight=1, rate_per_second=1000, burst=10)
+
+        def explode():
+            raise RuntimeError('boom')
+
+        reported = []
+        results = PushEngine().run(
+            [make_job(target, 'TASK-1'), make_job(target, 'TASK-2', explode)],
+            on_result=reported.append,
+        )
+        assert reported == results
+        by_task = {r.job.task: r for r in results}
+        assert by_task['TASK-1'].ok and by_task['TASK-1'].error is None
+        assert not by_task['TASK-2'].ok and str(by_task['TASK-2'].error) == 'boom'
+
+    def test_cancel_skips_jobs_not_started(self):
+        target = PushTarget('Jira', max_in_flight=1, rate_per_second=1000, burst=10)
+        cancelled = threading.Event()
+        sent = []
+
+        def send():
+            sent.append(True)
+            cancelled.set()
+            return True
+
+        results = PushEngine(max_workers=1).run(
+            [make_job(target, send=send) for _ in range(5)],
+            is_cancelled=cancelled.is_set,
+        )
+        assert len(sent) == 1
+        assert len(results) == 1
+
+    def test_no_jobs(self):
+        assert PushEngine().run([]) == []
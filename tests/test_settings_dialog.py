@@ -132,6 +132,23 @@ class TestSettingsDialogSave:
         assert saved_data['CLOCKIFY_WORKSPACE'] == 'ws-abc'
         assert saved_data['CLOCKIFY_API_KEY'] == 'clockify-key'
 
+    def test_save_includes_push_coalescing(self, dialog, config, monkeypatch):
+        dialog.coalesce_mode_input.setCurrentIndex(dialog.coalesce_mode_input.findData('gap'))
+        dialog.coalesce_gap_input.setValue(10)
+
+        saved_data = {}
+        monkeypatch.setattr(config, "update_all", lambda d: saved_data.update(d))
+        monkeypatch.setattr(config, "save", lambda: True)
+        import windows.settings as settings_module
+        monkeypatch.setattr(settings_module, "clear_jira_cache", lambda: None)
+        monkeypatch.setattr(settings_module, "clear_clockify_cache", lambda: None)
+        monkeypatch.setattr(QMessageBox, "information", staticmethod(lambda *a, **kw: None))
+
+        dialog.save_settings()
+
+        assert saved_data['PUSH_COALESCE'] == 'gap'
+        assert saved_data['PUSH_COALESCE_GAP_MINUTES'] == '10'
+
     def test_save_strips_whitespace(self, dialog, config, monkeypatch):
         dialog.jira_email_input.setText("  user@test.com  ")
         dialog.jira_token_input.setText("")
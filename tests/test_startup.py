@@ -0,0 +1,44 @@
+"""
+Tests for the startup-time budget (benchmarks/bench_startup.py).
+
+The millisecond budgets depend on the machine and its load, so they only run
+with `pytest --benchmarks`; which modules load eagerly is checked every run.
+"""
+import pytest
+
+from benchmarks.bench_startup import load_budget, measure_first_paint, measure_imports
+
+# Best of a few fresh interpreters, so one slow round on a busy machine does not fail
+ROUNDS = 3
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture(scope='module')
+def budget():
+    return load_budget()
+
+
+@pytest.fixture(scope='module')
+def imports(budget):
+    return [measure_imports(budget['lazy_modules']) for _ in range(ROUNDS)]
+
+
+# ---------------------------------------------------------------------------
+# TestStartupBudget
+# ---------------------------------------------------------------------------
+
+class TestStartupBudget:
+    def test_network_clients_and_dialogs_are_imported_on_first_use(self, budget):
+        _, eager = measure_imports(budget['lazy_modules'])
+        assert eager == []
+
+    @pytest.mark.benchmark
+    def test_import_time_within_budget(self, budget, imports):
+        assert min(ms for ms, _ in imports) <= budget['import_ms']
+
+    @pytest.mark.benchmark
+    def test_first_paint_within_budget(self, budget):
+        assert min(measure_first_paint() for _ in range(ROUNDS)) <= budget['first_paint_ms']
@@ -0,0 +1,229 @@
+"""Tests for the push outbox (services/sync_outbox.py)."""
+import dataclasses
+import datetime
+import itertools
+
+import pytest
+
+import services.database as db_module
+from services.coalesce import COALESCE_TASK, CoalesceRule
+from services.database import delete_clocking, get_clockings_for_date, insert_clocking
+from services.sync_outbox import CREATE, DELETE, UPDATE, SyncTarget, plan_sync
+
+DAY = '2024-01-02'
+NEXT_DAY = '2024-01-03'
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+
+class FakeRemote:
+    """In-memory target recording every call; set `fail` to make calls raise."""
+
+    def __init__(self, name='Fake'):
+        self.entries: dict[str, tuple[str, str, str]] = {}   # id -> (task, check_in, check_out)
+        self.calls: list[tuple[str, str]] = []
+        self.fail = False
+        self._ids = itertools.count(1)
+        self.target = SyncTarget(name, self.create, self.update, self.delete)
+
+    def _check(self):
+        if self.fail:
+            raise RuntimeError('offline')
+
+    def create(self, record):
+        self.calls.append(('create', record.task))
+        self._check()
+        remote_id = f'r-{next(self._ids)}'
+        self.entries[remote_id] = (record.task, record.check_in, record.check_out)
+        return remote_id
+
+    def update(self, state, record):
+        self.calls.append(('update', record.task))
+        self._check()
+        self.entries[state.remote_id] = (record.task, record.check_in, record.check_out)
+        return state.remote_id
+
+    def delete(self, state):
+        self.calls.append(('delete', state.task))
+        self._check()
+        del self.entries[state.remote_id]
+
+
+@pytest.fixture
+def remote(app_db):
+    return FakeRemote()
+
+
+def push(remote, day=DAY, rule=None):
+    """Plan and run a day's push like ClockingSummary does; return the action kinds."""
+    actions = plan_sync(remote.target, day, get_clockings_for_date(day), rule)
+    for action in actions:
+        try:
+            action.run()
+        except RuntimeError:
+            pass
+    return [action.kind for action in actions]
+
+
+# ---------------------------------------------------------------------------
+# TestPlanSync
+# ---------------------------------------------------------------------------
+
+class TestPlanSync:
+    def test_new_clockings_are_created_once(self, remote):
+        insert_clocking(DAY, 'TASK-1', f'{DAY} 09:00', f'{DAY} 10:00')
+        insert_clocking(DAY, 'TASK-2', f'{DAY} 10:00', f'{DAY} 11:30')
+
+        assert push(remote) == [CREATE, CREATE]
+        assert push(remote) == []
+        assert len(remote.entries) == 2
+
+    def test_open_clocking_is_not_pushed(self, remote):
+        insert_clocking(DAY, 'TASK-1', f'{DAY} 09:00')
+        assert push(remote) == []
+
+    def test_changed_clocking_is_updated_in_place(self, remote):
+        record = insert_clocking(DAY, 'TASK-1', f'{DAY} 09:00', f'{DAY} 10:00')
+        push(remote)
+        db_module.upsert_clocking(dataclasses.replace(record, check_out=f'{DAY} 10:30'))
+
+        assert push(remote) == [UPDATE]
+        assert list(remote.entries.values()) == [('TASK-1', f'{DAY} 09:00', f'{DAY} 10:30')]
+
+    def test_message_change_needs_no_request(self, remote):
+        record = insert_clocking(DAY, 'TASK-1', f'{DAY} 09:00', f'{DAY} 10:00')
+        push(remote)
+        db_module.upsert_clocking(dataclasses.replace(record, message='Standup'))
+        assert push(remote) == []
+
+    def test_deleted_clocking_is_deleted_remotely(self, remote):
+        record = insert_clocking(DAY, 'TASK-1', f'{DAY} 09:00', f'{DAY} 10:00')
+        push(remote)
+        delete_clocking(record.id)
+
+        assert push(remote) == [DELETE]
+        assert remote.entries == {}
+        assert push(remote) == []
+
+    def test_failed_create_is_retried(self, remote):
+        insert_clocking(DAY, 'TASK-1', f'{DAY} 09:00', f'{DAY} 10:00')
+        remote.fail = True
+        push(remote)
+        remote.fail = False
+
+        assert push(remote) == [CREATE]
+        assert push(remote) == []
+
+    def test_failed_update_is_retried_as_update(self, remote):
+        record = insert_clocking(DAY, 'TASK-1', f'{DAY} 09:00', f'{DAY} 10:00')
+        push(remote)
+        db_module.upsert_clocking(dataclasses.replace(record, check_out=f'{DAY} 11:00'))
+        remote.fail = True
+        push(remote)
+        remote.fail = False
+
+        assert push(remote) == [UPDATE]
+        assert len(remote.entries) == 1
+
+    def test_failure_is_recorded(self, remote):
+        record = insert_clocking(DAY, 'TASK-1', f'{DAY} 09:00', f'{DAY} 10:00')
+        remote.fail = True
+        push(remote)
+        push(remote)
+
+        [state] = db_module.get_sync_states('Fake', DAY, [record.id])
+        assert (state.status, state.attempts, state.last_error) == ('failed', 2, 'offline')
+
+    def test_clocking_moved_to_another_day_is_updated_not_deleted(self, remote):
+        record = insert_clocking(DAY, 'TASK-1', f'{DAY} 09:00', f'{DAY} 10:00')
+        push(remote)
+        db_module.upsert_clocking(dataclasses.replace(
+            record, date=NEXT_DAY, check_in=f'{NEXT_DAY} 09:00', check_out=f'{NEXT_DAY} 10:00'))
+
+        assert push(remote, DAY) == []
+        assert push(remote, NEXT_DAY) == [UPDATE]
+        assert push(remote, DAY) == []
+        assert len(remote.entries) == 1
+
+    def test_targets_are_tracked_separately(self, remote):
+        insert_clocking(DAY, 'TASK-1', f'{DAY} 09:00', f'{DAY} 10:00')
+        push(remote)
+        other = FakeRemote('Other')
+        assert push(other) == [CREATE]
+
+    def test_span_uses_the_clocking_date(self, remote):
+        record = insert_clocking(DAY, 'TASK-1', f'{DAY} 23:00', f'{NEXT_DAY} 00:30')
+        [action] = plan_sync(remote.target, DAY, [record])
+        assert action.duration_seconds == int(datetime.timedelta(minutes=90).total_seconds())
+
+
+# ---------------------------------------------------------------------------
+# TestCoalescedSync
+# ---------------------------------------------------------------------------
+
+MERGE_DAY = CoalesceRule(COALESCE_TASK)
+
+
+class TestCoalescedSync:
+    def test_merged_sessions_are_one_entry(self, remote):
+        insert_clocking(DAY, 'TASK-1', f'{DAY} 09:00', f'{DAY} 09:30')
+        insert_clocking(DAY, 'TASK-2', f'{DAY} 09:30', f'{DAY} 09:40')
+        insert_clocking(DAY, 'TASK-1', f'{DAY} 09:40', f'{DAY} 10:00')
+
+        assert push(remote, rule=MERGE_DAY) == [CREATE, CREATE]
+        assert sorted(remote.entries.values()) == [
+            ('TASK-1', f'{DAY} 09:00', f'{DAY} 09:50'),
+            ('TASK-2', f'{DAY} 09:30', f'{DAY} 09:40'),
+        ]
+        assert push(remote, rule=MERGE_DAY) == []
+
+    def test_new_session_updates_the_merged_entry(self, remote):
+        insert_clocking(DAY, 'TASK-1', f'{DAY} 09:00', f'{DAY} 09:30')
+        push(remote, rule=MERGE_DAY)
+        insert_clocking(DAY, 'TASK-1', f'{DAY} 10:00', f'{DAY} 10:15')
+
+        assert push(remote, rule=MERGE_DAY) == [UPDATE]
+        assert list(remote.entries.values()) == [('TASK-1', f'{DAY} 09:00', f'{DAY} 09:45')]
+
+    def test_entries_pushed_one_by_one_are_merged(self, remote):
+        insert_clocking(DAY, 'TASK-1', f'{DAY} 09:00', f'{DAY} 09:30')
+        insert_clocking(DAY, 'TASK-1', f'{DAY} 10:00', f'{DAY} 10:15')
+        push(remote)
+
+        assert sorted(push(remote, rule=MERGE_DAY)) == [DELETE, UPDATE]
+        assert list(remote.entries.values()) == [('TASK-1', f'{DAY} 09:00', f'{DAY} 09:45')]
+        assert push(remote, rule=MERGE_DAY) == []
+
+    def test_turning_merging_off_splits_the_entry(self, remote):
+        insert_clocking(DAY, 'TASK-1', f'{DAY} 09:00', f'{DAY} 09:30')
+        insert_clocking(DAY, 'TASK-1', f'{DAY} 10:00', f'{DAY} 10:15')
+        push(remote, rule=MERGE_DAY)
+
+        assert sorted(push(remote)) == [CREATE, UPDATE]
+        assert len(remote.entries) == 2
+
+
+# ---------------------------------------------------------------------------
+# TestJiraTarget
+# ---------------------------------------------------------------------------
+
+class TestJiraTarget:
+    def test_task_change_recreates_worklog_on_the_new_issue(self, app_db, monkeypatch):
+        import services.sync_outbox as sync_outbox
+        calls = []
+        monkeypatch.setattr(sync_outbox, 'create_jira_worklog',
+                            lambda task, start, duration: calls.append(('create', task)) or 'wl-2')
+        monkeypatch.setattr(sync_outbox, 'delete_jira_worklog',
+                            lambda task, worklog_id: calls.append(('delete', task, worklog_id)))
+        record = insert_clocking(DAY, 'TASK-1', f'{DAY} 09:00', f'{DAY} 10:00')
+        db_module.record_sync_success('Jira', record.id, DAY, 'TASK-1', 'wl-1', 'old')
+        db_module.upsert_clocking(dataclasses.replace(record, task='TASK-2'))
+
+        [action] = plan_sync(sync_outbox.JIRA_SYNC, DAY, get_clockings_for_date(DAY))
+        action.run()
+
+        assert calls == [('delete', 'TASK-1', 'wl-1'), ('create', 'TASK-2')]
+        [state] = db_module.get_sync_states('Jira', DAY, [record.id])
+        assert (state.task, state.remote_id, state.status) == ('TASK-2', 'wl-2', 'synced')
@@ -0,0 +1,226 @@
+"""Tests for the background sync scheduler (services/sync_scheduler.py)."""
+import socket
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+from PySide6.QtWidgets import QApplication
+
+import services.jira_api as jira_api
+import services.sync_outbox as sync_outbox
+import services.sync_scheduler as scheduler_module
+from services.database import get_sync_states, insert_clocking, record_sync_failure
+from services.jira_api import OpenIssueChanges
+from services.push_engine import PushTarget
+from services.sync_outbox import SyncTarget
+from services.sync_scheduler import Backoff, SyncScheduler, is_reachable
+from services.workers import get_push_pool
+
+DAY = '2024-01-02'
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def config(monkeypatch):
+    config = MagicMock()
+    config.is_jira_configured.return_value = (True, [])
+    config.is_clockify_configured.return_value = (False, ['CLOCKIFY_API_KEY'])
+    config.get.side_effect = lambda key, default='': {
+        'ATLASSIAN_URL': 'https://example.atlassian.net'}.get(key, default)
+    monkeypatch.setattr(scheduler_module, 'get_config_manager', lambda: config)
+    return config
+
+
+@pytest.fixture
+def jira(app_db, config, monkeypatch):
+    """A Jira sync target whose creates succeed unless `jira.fail` is set."""
+    state = MagicMock(fail=False, created=[], refreshes=0)
+
+    def create(record):
+        if state.fail:
+            raise RuntimeError('offline')
+        state.created.append(record.task)
+        return f'wl-{len(state.created)}'
+
+    def fetch():
+        state.refreshes += 1
+        return OpenIssueChanges([], full=True, started_at=1.0, watermark_key='synced')
+
+    target = SyncTarget('Jira', create, MagicMock(), MagicMock(),
+                        push_target=PushTarget('Jira', 2, 1000, burst=2))
+    monkeypatch.setattr(sync_outbox, 'JIRA_SYNC', target)
+    monkeypatch.setattr(jira_api, 'fetch_open_issue_changes', fetch)
+    return state
+
+
+def make_scheduler(qt_app, online=True, clock=None):
+    reachable = online if callable(online) else (lambda url: online)
+    return SyncScheduler(interval=300, refresh_interval=1800, reachable=reachable,
+                         backoff=Backoff(base=30, maximum=600, jitter=0),
+                         clock=clock or FakeClock())
+
+
+def run_once(scheduler):
+    assert scheduler.run_now() is not None
+    get_push_pool().waitForDone()
+    QApplication.processEvents()
+
+
+def failed_push(task='TASK-1'):
+    """A clocking whose push failed, as left behind by ClockingSummary."""
+    record = insert_clocking(DAY, task, f'{DAY} 09:00', f'{DAY} 10:00')
+    record_sync_failure('Jira', record.id, DAY, task, 'offline')
+    return record
+
+
+# ---------------------------------------------------------------------------
+# TestBackoff
+# ---------------------------------------------------------------------------
+
+class TestBackoff:
+    def test_doubles_up_to_maximum(self):
+        backoff = Backoff(base=30, maximum=600, jitter=0)
+        assert [backoff.delay(n) for n in range(1, 7)] == [30, 60, 120, 240, 480, 600]
+
+    def test_jitter_shortens_delay_within_bounds(self):
+        assert Backoff(base=30, maximum=600, jitter=0.5, rng=lambda: 0.999).delay(2) > 30
+        assert Backoff(base=30, maximum=600, jitter=0.5, rng=lambda: 0.5).delay(2) == 45
+
+
+# ---------------------------------------------------------------------------
+# TestIsReachable
+# ---------------------------------------------------------------------------
+
+class TestIsReachable:
+    def test_listening_port_is_reachable(self):
+        # The connection completes in the listen backlog; nothing needs to accept it
+        server = socket.create_server(('127.0.0.1', 0))
+        assert is_reachable(f'http://127.0.0.1:{server.getsockname()[1]}/api', timeout=1)
+        server.close()
+
+    def test_closed_port_is_not_reachable(self):
+        server = socket.create_server(('127.0.0.1', 0))
+        port = server.getsockname()[1]
+        server.close()
+        assert not is_reachable(f'http://127.0.0.1:{port}', timeout=1)
+
+    def test_missing_url_is_not_reachable(self):
+        assert not is_reachable('')
+
+
+# ---------------------------------------------------------------------------
+# TestSyncScheduler
+# ---------------------------------------------------------------------------
+
+class TestSyncScheduler:
+    def test_failed_pushes_are_retried(self, qt_app, jira):
+        record = failed_push()
+        scheduler = make_scheduler(qt_app)
+
+        run_once(scheduler)
+
+        assert jira.created == ['TASK-1']
+        [state] = get_sync_states('Jira', DAY, [record.id])
+        assert state.status == 'synced'
+        assert scheduler.status.startswith('Sync: Up to date')
+        assert scheduler.next_run_in() == pytest.approx(300, abs=1)
+
+    def test_unpushed_clockings_are_left_alone(self, qt_app, jira):
+        insert_clocking(DAY, 'TASK-1', f'{DAY} 09:00', f'{DAY} 10:00')
+        run_once(make_scheduler(qt_app))
+        assert jira.created == []
+
+    def test_offline_backs_off_exponentially_then_recovers(self, qt_app, jira):
+        failed_push()
+        online = {'value': False}
+        scheduler = make_scheduler(qt_app, online=lambda url: online['value'])
+
+        run_once(scheduler)
+        assert scheduler.next_run_in() == pytest.approx(30, abs=1)
+        assert 'Jira unreachable' in scheduler.status
+        run_once(scheduler)
+        assert scheduler.next_run_in() == pytest.approx(60, abs=1)
+        assert jira.created == []
+
+        online['value'] = True
+        run_once(scheduler)
+        assert jira.created == ['TASK-1']
+        assert scheduler.failures == 0
+        assert scheduler.next_run_in() == pytest.approx(300, abs=1)
+
+    def test_push_failures_back_off(self, qt_app, jira):
+        failed_push()
+        jira.fail = True
+        scheduler = make_scheduler(qt_app)
+
+        run_once(scheduler)
+
+        assert scheduler.failures == 1
+        assert '1 push(es) failed' in scheduler.status
+
+    def test_rows_failing_too_often_are_left_to_a_manual_push(self, qt_app, jira, monkeypatch):
+        monkeypatch.setattr(scheduler_module, 'SYNC_MAX_ATTEMPTS', 1)
+        record = failed_push()
+        record_sync_failure('Jira', record.id, DAY, 'TASK-1', 'rejected')
+        run_once(make_scheduler(qt_app))
+        assert jira.created == []
+
+    def test_jira_refresh_is_periodic(self, qt_app, jira):
+        clock = FakeClock()
+        scheduler = make_scheduler(qt_app, clock=clock)
+        fetched = []
+        scheduler.open_issues_fetched.connect(fetched.append)
+
+        run_once(scheduler)
+        clock.now += 60
+        run_once(scheduler)
+        clock.now += 1800
+        run_once(scheduler)
+
+        assert jira.refreshes == 2
+        assert len(fetched) == 2
+
+    def test_status_is_emitted(self, qt_app, jira):
+        scheduler = make_scheduler(qt_app)
+        statuses = []
+        scheduler.status_changed.connect(statuses.append)
+        run_once(scheduler)
+        assert statuses == [scheduler.status]
+
+    def test_nothing_configured(self, qt_app, config):
+        config.is_jira_configured.return_value = (False, ['ATLASSIAN_URL'])
+        scheduler = make_scheduler(qt_app)
+        run_once(scheduler)
+        assert scheduler.status == 'Sync: Jira and Clockify are not configured'
+
+    def test_run_now_does_not_overlap(self, qt_app, jira, monkeypatch):
+        release = threading.Event()
+        monkeypatch.setattr(sync_outbox, 'plan_retries',
+                            lambda target, max_attempts, rule: release.wait(5) and [])
+        scheduler = make_scheduler(qt_app)
+        assert scheduler.run_now() is not None
+        assert scheduler.run_now() is None
+        release.set()
+        get_push_pool().waitForDone()
+        QApplication.processEvents()
+
+    def test_stop_prevents_rescheduling(self, qt_app, jira):
+        scheduler = make_scheduler(qt_app)
+        scheduler.start(delay=60)
+        scheduler.stop()
+        assert scheduler.next_run_in() is None
+        scheduler.run_now()
+        get_push_pool().waitForDone()
+        QApplication.processEvents()
+        assert scheduler.next_run_in() is None
@@ -0,0 +1,116 @@
+"""Tests for the task switcher (windows/task_list.py)."""
+import pytest
+from PySide6.QtCore import Qt
+from PySide6.QtTest import QTest
+
+from services.database import TaskRecord
+from services.jira_links import JiraLinkResolver
+from windows.task_list import (
+    LINK_ROLE,
+    TASK_ROLE,
+    TaskFilterModel,
+    TaskListModel,
+    TaskListView,
+)
+
+
+@pytest.fixture
+def model(qt_app):
+    model = TaskListModel()
+    model.set_tasks([
+        TaskRecord('TASK-1', 'Fix bugs', 'fixed'),
+        TaskRecord('PROJ-2', 'New feature', 'open'),
+        TaskRecord('Meeting', '', 'fixed'),
+    ])
+    return model
+
+
+@pytest.fixture
+def resolver(monkeypatch):
+    import windows.task_list as task_list
+    resolver = JiraLinkResolver('https://example.atlassian.net', ['PROJ'])
+    monkeypatch.setattr(task_list, 'get_jira_link_resolver', lambda: resolver)
+    return resolver
+
+
+class TestTaskListModel:
+    def test_rows_follow_the_tasks(self, model):
+        assert model.rowCount() == 3
+        assert [model.index(r).data() for r in range(3)] == [
+            'TASK-1 — Fix bugs', 'PROJ-2 — New feature', 'Meeting',
+        ]
+        assert model.index(1).data(TASK_ROLE) == 'PROJ-2'
+
+    def test_jira_tasks_have_a_link(self, model, resolver):
+        assert model.index(1).data(LINK_ROLE) == 'https://example.atlassian.net/browse/PROJ-2'
+        assert model.index(1).data(Qt.ItemDataRole.ToolTipRole) == model.index(1).data(LINK_ROLE)
+        assert model.index(0).data(LINK_ROLE) is None
+        assert model.index(0).data(Qt.ItemDataRole.ToolTipRole) == 'Fix bugs'
+
+    def test_active_task_is_marked(self, model):
+        model.set_active_task('PROJ-2')
+        assert model.index(1).data(Qt.ItemDataRole.FontRole).bold()
+        assert model.index(1).data(Qt.ItemDataRole.DecorationRole) is not None
+        assert model.index(0).data(Qt.ItemDataRole.FontRole) is None
+
+    def test_changing_active_task_updates_only_its_rows(self, model):
+        model.set_active_task('TASK-1')
+        changed = []
+        model.dataChanged.connect(lambda first, last: changed.append(first.row()))
+        model.set_active_task('Meeting')
+        model.set_active_task('Meeting')
+        assert changed == [0, 2]
+
+    def test_set_tasks_resets_rows(self, model):
+        resets = []
+        model.modelReset.connect(lambda: resets.append(True))
+        model.set_tasks([TaskRecord('TASK-9', 'Other', 'open')])
+        assert resets == [True]
+        assert model.task_ids() == ['TASK-9']
+
+
+class TestTaskFilterModel:
+    @pytest.fixture
+    def proxy(self, model):
+        proxy = TaskFilterModel()
+        proxy.setSourceModel(model)
+        return proxy
+
+    @pytest.mark.parametrize('text, expected', [
+        ('', ['TASK-1', 'PROJ-2', 'Meeting']),
+        ('proj', ['PROJ-2']),
+        ('BUGS', ['TASK-1']),
+        ('e', ['PROJ-2', 'Meeting']),
+        ('nothing', []),
+    ])
+    def test_filters_on_key_and_description(self, proxy, text, expected):
+        proxy.setFilterFixedString(text)
+        assert [proxy.index(r, 0).data(TASK_ROLE) for r in range(proxy.rowCount())] == expected
+
+
+class TestTaskListView:
+    @pytest.fixture
+    def view(self, model):
+        view = TaskListView()
+        view.setModel(model)
+        yield view
+        view.close()
+
+    def test_rows_have_uniform_sizes(self, view):
+        assert view.uniformItemSizes()
+
+    def test_enter_activates_the_current_task(self, view, model):
+        picked = []
+        view.task_activated.connect(picked.append)
+        view.show()
+        view.setCurrentIndex(model.index(1))
+        QTest.keyClick(view, Qt.Key.Key_Return)
+        assert picked == ['PROJ-2']
+
+    def test_click_activates_the_task(self, view, model):
+        picked = []
+        view.task_activated.connect(picked.append)
+        view.show()
+        QTest.mouseClick(view.viewport(), Qt.MouseButton.LeftButton,
+                         pos=view.visualRect(model.index(2)).center())
+        assert picked[0] == 'Meeting'
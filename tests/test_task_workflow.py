@@ -12,10 +12,9 @@ from services.utils import format_timedelta, format_timedelta_jira
 # ---------------------------------------------------------------------------
 
 @pytest.fixture
-def db_env(tmp_path, monkeypatch):
-    import services.database as db_module
+def db_env(tmp_path, monkeypatch, use_db):
     db_path = str(tmp_path / 'clocking.db')
-    monkeypatch.setattr(db_module, 'get_db_path', lambda: db_path)
+    use_db(db_path)
     init_db()
     monkeypatch.chdir(tmp_path)
     return tmp_path
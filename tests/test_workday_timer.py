@@ -0,0 +1,96 @@
+"""Tests for the cached workday timer (services/workday_timer.py)."""
+import datetime
+
+import pytest
+
+import services.workday_timer as timer_module
+from services.database import ClockingRecord
+from services.workday_timer import WorkdayTimer
+
+START = datetime.datetime(2024, 1, 2, 12, 0, 0)
+
+
+class FakeClock:
+    def __init__(self, now=START):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += datetime.timedelta(seconds=seconds)
+
+
+@pytest.fixture
+def fake_db(monkeypatch):
+    """Replace the timer's DB queries with in-memory fakes that count calls."""
+    state = {
+        'calls': 0,
+        'version': 1,
+        'completed': {'2024-01-02': 3600},
+        'open': ClockingRecord('2024-01-02', 'TASK-1', '2024-01-02 11:00', None, None, id=1),
+    }
+
+    def counted(fn):
+        def wrapper(*args):
+            state['calls'] += 1
+            return fn(*args)
+        return wrapper
+
+    monkeypatch.setattr(timer_module, 'get_data_version', counted(lambda: state['version']))
+    monkeypatch.setattr(timer_module, 'get_today_completed_seconds',
+                        counted(lambda day: state['completed'].get(day, 0)))
+    monkeypatch.setattr(timer_module, 'get_open_clocking', counted(lambda: state['open']))
+    return state
+
+
+class TestWorkdayTimer:
+    def test_adds_running_session_to_completed_time(self, fake_db):
+        timer = WorkdayTimer(FakeClock())
+        assert timer.worked_today() == datetime.timedelta(hours=2)
+        assert timer.open_task == 'TASK-1'
+        assert timer.is_checked_out is False
+
+    def test_idle_hour_makes_only_data_version_polls(self, fake_db):
+        clock = FakeClock()
+        timer = WorkdayTimer(clock)
+        timer.worked_today()
+        initial_calls = fake_db['calls']
+
+        for _ in range(3600):
+            clock.advance(1)
+            timer.worked_today()
+
+        polls = 3600 // WorkdayTimer.DATA_VERSION_POLL_SECONDS
+        assert fake_db['calls'] - initial_calls == polls
+        assert timer.worked_today() == datetime.timedelta(hours=3)
+
+    def test_invalidate_rereads_database(self, fake_db):
+        timer = WorkdayTimer(FakeClock())
+        timer.worked_today()
+        fake_db['open'] = None
+        fake_db['completed']['2024-01-02'] = 5400
+        assert timer.worked_today() == datetime.timedelta(hours=2)
+        timer.invalidate()
+        assert timer.worked_today() == datetime.timedelta(hours=1, minutes=30)
+        assert timer.is_checked_out is True
+
+    def test_external_change_is_picked_up_on_next_poll(self, fake_db):
+        clock = FakeClock()
+        timer = WorkdayTimer(clock)
+        timer.worked_today()
+        fake_db['open'] = None
+        fake_db['version'] += 1
+
+        clock.advance(WorkdayTimer.DATA_VERSION_POLL_SECONDS - 1)
+        assert timer.is_checked_out is False
+        clock.advance(1)
+        assert timer.is_checked_out is True
+
+    def test_date_rollover_reloads_totals(self, fake_db):
+        clock = FakeClock(datetime.datetime(2024, 1, 2, 23, 59, 59))
+        fake_db['open'] = None
+        timer = WorkdayTimer(clock)
+        assert timer.worked_today() == datetime.timedelta(hours=1)
+        clock.advance(1)
+        assert timer.worked_today() == datetime.timedelta(0)
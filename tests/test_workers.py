@@ -0,0 +1,110 @@
+"""Tests for the background worker helpers (services/workers.py)."""
+import gc
+import threading
+
+import pytest
+from PySide6.QtCore import QThreadPool
+from PySide6.QtWidgets import QApplication
+
+from services.workers import Worker, run_in_background
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture
+def pool(qt_app):
+    pool = QThreadPool()
+    pool.setMaxThreadCount(1)
+    yield pool
+    pool.waitForDone()
+
+
+def drain(pool):
+    pool.waitForDone()
+    QApplication.processEvents()
+
+
+# ---------------------------------------------------------------------------
+# TestRunInBackground
+# ---------------------------------------------------------------------------
+
+class TestRunInBackground:
+    def test_result_is_delivered_on_the_calling_thread(self, pool):
+        events = []
+
+        def job(worker):
+            events.append(('job', threading.current_thread() is threading.main_thread()))
+            return 42
+
+        run_in_background(
+            job,
+            on_finished=lambda result: events.append(
+                ('finished', result, threading.current_thread() is threading.main_thread())),
+            pool=pool,
+        )
+        drain(pool)
+
+        assert events == [('job', False), ('finished', 42, True)]
+
+    def test_signals_arrive_when_the_worker_is_not_kept(self, pool):
+        results = []
+        for i in range(50):
+            run_in_background(lambda worker, i=i: i, on_finished=results.append, pool=pool)
+        gc.collect()
+        drain(pool)
+
+        assert sorted(results) == list(range(50))
+
+    def test_progress_arrives_in_order(self, pool):
+        progress = []
+
+        def job(worker):
+            for i in range(3):
+                worker.report(i)
+
+        run_in_background(job, on_progress=progress.append, pool=pool)
+        drain(pool)
+
+        assert progress == [0, 1, 2]
+
+    def test_exception_is_reported_as_failed(self, pool):
+        failed, finished = [], []
+
+        def job(worker):
+            raise ValueError('bad')
+
+        run_in_background(job, on_finished=finished.append, on_failed=failed.append, pool=pool)
+        drain(pool)
+
+        assert finished == []
+        assert isinstance(failed[0], ValueError)
+
+    def test_cancelled_before_start_never_runs(self, pool):
+        ran, cancelled = [], []
+        gate = threading.Event()
+        # Occupy the only pool thread so the second job is still queued
+        run_in_background(lambda worker: gate.wait(5), pool=pool)
+        worker = run_in_background(lambda w: ran.append(True), pool=pool,
+                                   on_cancelled=lambda: cancelled.append(True))
+        worker.cancel()
+        gate.set()
+        drain(pool)
+
+        assert ran == []
+        assert cancelled == [True]
+
+    def test_cancel_during_run_emits_cancelled_instead_of_finished(self, pool):
+        finished, cancelled = [], []
+
+        def job(worker: Worker):
+            worker.cancel()
+            return 'partial'
+
+        run_in_background(job, on_finished=finished.append,
+                          on_cancelled=lambda: cancelled.append(True), pool=pool)
+        drain(pool)
+
+        assert finished == []
+        assert cancelled == [True]
@@ -1,29 +1,27 @@
 import datetime
 import logging
 from collections.abc import Callable
+from typing import TYPE_CHECKING
 
 import resources_rc  # noqa: F401
 
 from PySide6.QtCore import Qt, QTimer
 from PySide6.QtGui import QAction, QIcon
 from PySide6.QtWidgets import (
-    QAbstractItemView,
     QApplication,
     QComboBox,
     QHBoxLayout,
     QHeaderView,
     QLabel,
+    QLineEdit,
     QMainWindow,
     QMenu,
     QMessageBox,
     QPushButton,
-    QScrollArea,
     QSizePolicy,
     QSpacerItem,
     QStyledItemDelegate,
     QSystemTrayIcon,
-    QTableWidget,
-    QTableWidgetItem,
     QVBoxLayout,
     QWidget,
 )
@@ -34,39 +32,47 @@ from services.clocking_validator import (
     validate_time_format,
 )
 from services.config_manager import get_config_manager
-from services.constants import CLOCKING_HEADER
+from services.config_watcher import ConfigWatcher
+from services.constants import (
+    CLOCKING_HEADER,
+    CLOCKING_PAGE_SIZE,
+    HISTORY_DAYS,
+    LOOKUP_WARM_DELAY_SECONDS,
+)
 from services.database import (
     ClockingRecord,
     delete_clocking,
-    get_all_clockings,
     get_all_tasks,
+    get_clockings_page,
+    get_clockings_since,
     get_open_clocking,
     get_tasks_by_type,
-    get_today_completed_seconds,
     insert_clocking,
-    mark_stale_open_tasks_closed,
+    sync_open_tasks,
     update_check_out,
     upsert_clocking,
-    upsert_tasks,
 )
-from services.jira_api import get_jira_open_issues
+from services.sync_scheduler import SyncScheduler
 from services.utils import format_timedelta
-from windows.clocking_summary import ClockingSummary
-from windows.eod_report import EodReport
-from windows.settings import SettingsDialog
-from windows.task_manager import TaskManagerDialog
-
-
-class TaskUI:
-    def __init__(self, id: str, description: str, button: QPushButton, link_url: str | None = None):
-        self.id = id
-        self.description = description
-        self.button = button
-        if link_url:
-            self.label = QLabel(f'<a href="{link_url}">{description}</a>')
-            self.label.setOpenExternalLinks(True)
-        else:
-            self.label = QLabel(description)
+from services.workday_timer import WorkdayTimer
+from services.workers import Worker, run_in_background
+from windows.clocking_table import ClockingTableModel, ClockingTableView
+from windows.task_list import TaskFilterModel, TaskListModel, TaskListView
+
+# The Jira/Clockify clients (jira, requests) and the secondary windows are imported
+# on first use, so they do not delay the first paint of the main window.
+if TYPE_CHECKING:
+    from services.jira_api import OpenIssueChanges
+
+
+def _warm_project_lookups(task_keys: list[str]) -> int:
+    from services.clockify_api import warm_project_lookups
+    return warm_project_lookups(task_keys)
+
+
+def _fetch_open_issue_changes(worker: Worker) -> 'OpenIssueChanges':
+    from services.jira_api import fetch_open_issue_changes
+    return fetch_open_issue_changes()
 
 
 def get_all_task_ids() -> list:
@@ -85,6 +91,10 @@ class TaskComboDelegate(QStyledItemDelegate):
         super().__init__(parent)
         self._task_ids = task_ids
 
+    def set_task_ids(self, task_ids: list) -> None:
+        """Replace the choices offered by editors opened from now on."""
+        self._task_ids = task_ids
+
     def createEditor(self, parent, option, index):
         combo = QComboBox(parent)
         combo.addItems(self._task_ids)
@@ -114,8 +124,6 @@ class TaskComboDelegate(QStyledItemDelegate):
 
 
 class MainClocking(QMainWindow):
-    EXIT_CODE_REBOOT = 122
-
     def __init__(self) -> None:
         super().__init__()
         self.setWindowTitle("Clocking App")
@@ -127,8 +135,8 @@ class MainClocking(QMainWindow):
         summary_action = QAction("Clocking Summary", self)
         summary_action.triggered.connect(self.open_check_clocking)
 
-        update_task_action = QAction("Update Open Tasks", self)
-        update_task_action.triggered.connect(self.update_open_tasks)
+        self.update_task_action = QAction("Update Open Tasks", self)
+        self.update_task_action.triggered.connect(self.update_open_tasks)
 
         manage_tasks_action = QAction("Manage Tasks", self)
         manage_tasks_action.triggered.connect(self.open_task_manager)
@@ -144,7 +152,7 @@ class MainClocking(QMainWindow):
         close_action.triggered.connect(QApplication.quit)
 
         menu.addAction(summary_action)
-        menu.addAction(update_task_action)
+        menu.addAction(self.update_task_action)
         menu.addAction(manage_tasks_action)
         menu.addAction(eod_report_action)
         menu.addSeparator()
@@ -164,9 +172,11 @@ class MainClocking(QMainWindow):
         check_clocking_action = QAction("Clocking Summary", self)
         check_clocking_action.triggered.connect(self.open_check_clocking)
         self.tray_menu.addAction(check_clocking_action)
-        issues_action = QAction("Update Open Tasks", self)
-        issues_action.triggered.connect(self.update_open_tasks)
-        self.tray_menu.addAction(issues_action)
+        self.issues_action = QAction("Update Open Tasks", self)
+        self.issues_action.triggered.connect(self.update_open_tasks)
+        self.tray_menu.addAction(self.issues_action)
+        sync_now_action = QAction("Sync Now", self)
+        self.tray_menu.addAction(sync_now_action)
         exit_action = QAction("Exit", self)
         exit_action.triggered.connect(QApplication.quit)
         self.tray_menu.addAction(exit_action)
@@ -176,6 +186,21 @@ class MainClocking(QMainWindow):
 
         self.clocking_window = Clocking(self.tray_icon, manage_tasks_callback=self.open_task_manager)
         self.setCentralWidget(self.clocking_window)
+        QTimer.singleShot(int(LOOKUP_WARM_DELAY_SECONDS * 1000), self._warm_lookups)
+
+        self.config_watcher = ConfigWatcher(parent=self)
+        self.config_watcher.changed.connect(lambda: self.reload_app(settings_changed=True))
+
+        self.sync_scheduler = SyncScheduler(self)
+        self.sync_scheduler.status_changed.connect(self._sync_status_changed)
+        self.sync_scheduler.open_issues_fetched.connect(self._open_issues_refreshed)
+        sync_now_action.triggered.connect(self.sync_scheduler.run_now)
+        self.sync_scheduler.start()
+
+    def _warm_lookups(self) -> None:
+        """Fill the remote lookup cache for the task panel's projects in the background."""
+        task_keys = self.clocking_window.task_model.task_ids()
+        run_in_background(lambda worker: _warm_project_lookups(task_keys))
 
     def update_open_tasks(self):
         config = get_config_manager()
@@ -189,48 +214,91 @@ class MainClocking(QMainWindow):
             )
             return
 
+        self.update_task_action.setEnabled(False)
+        self.issues_action.setEnabled(False)
+        run_in_background(
+            _fetch_open_issue_changes,
+            on_finished=self._apply_open_issues,
+            on_failed=self._open_issues_failed,
+        )
+
+    def _apply_open_issues(self, changes: 'OpenIssueChanges') -> None:
+        """Store the issues fetched by update_open_tasks() (runs on the GUI thread)."""
+        self._update_tasks_done()
         try:
-            issues = get_jira_open_issues()
-            active_ids = {issue["task"] for issue in issues}
-            mark_stale_open_tasks_closed(active_ids)
-            upsert_tasks(issues)
-            self.restart_app()
-            
+            self._store_open_issues(changes)
         except Exception as e:
-            QMessageBox.critical(
-                self,
-                "Failed to Update Tasks",
-                f"Error updating open tasks from Jira: {str(e)}"
-            )
+            self._open_issues_failed(e)
+
+    def _open_issues_refreshed(self, changes: 'OpenIssueChanges') -> None:
+        """Store the issues fetched by the background sync; failures are only logged."""
+        try:
+            self._store_open_issues(changes)
+        except Exception as e:
+            logging.warning(f"Could not store refreshed open issues: {e}")
+
+    def _store_open_issues(self, changes: 'OpenIssueChanges') -> None:
+        result = sync_open_tasks(
+            changes.open_issues,
+            None if changes.full else changes.closed_tasks,
+            state=(changes.watermark_key, str(changes.started_at)),
+        )
+        if result.changed:
+            self.reload_app()
+
+    def _sync_status_changed(self, status: str) -> None:
+        self.tray_icon.setToolTip(f'ClockingApp\n{status}')
+
+    def _open_issues_failed(self, error: Exception) -> None:
+        self._update_tasks_done()
+        QMessageBox.critical(
+            self,
+            "Failed to Update Tasks",
+            f"Error updating open tasks from Jira: {str(error)}"
+        )
+
+    def _update_tasks_done(self) -> None:
+        self.update_task_action.setEnabled(True)
+        self.issues_action.setEnabled(True)
 
     def open_task_manager(self):
+        from windows.task_manager import TaskManagerDialog
         dialog = TaskManagerDialog(self)
         if dialog.exec() == TaskManagerDialog.DialogCode.Accepted:
-            self.restart_app()
+            self.reload_app()
 
     def open_check_clocking(self):
+        from windows.clocking_summary import ClockingSummary
         self.check_clocking_window = ClockingSummary(self.clocking_window.data)
         self.check_clocking_window.show()
 
     def generate_eod_report(self):
+        from windows.eod_report import EodReport
         self.eod_report = EodReport(self.clocking_window.data)
         self.eod_report.show()
 
     def open_settings(self):
+        from windows.settings import SettingsDialog
         settings_dialog = SettingsDialog(self)
         if settings_dialog.exec() == SettingsDialog.DialogCode.Accepted:
-            reply = QMessageBox.question(
-                self,
-                "Restart Required",
-                "Settings have been updated. Would you like to restart the application to apply changes?",
-                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
-                QMessageBox.StandardButton.Yes
-            )
-            if reply == QMessageBox.StandardButton.Yes:
-                self.restart_app()
-
-    def restart_app(self):
-        QApplication.exit(self.EXIT_CODE_REBOOT)
+            self.reload_app(settings_changed=True)
+
+    def reload_app(self, settings_changed: bool = False):
+        """
+        Apply task and settings changes in place.
+
+        Rebuilds the task panel; after a settings change it first re-reads the
+        configuration and drops the Jira/Clockify clients and cached lookups.
+        The running timer and open session are kept.
+        """
+        if settings_changed:
+            from services.clockify_api import clear_clockify_cache
+            from services.jira_api import clear_jira_cache
+            get_config_manager().load_config()
+            clear_jira_cache()
+            clear_clockify_cache()
+        self.clocking_window.reload_tasks()
+        self._warm_lookups()
 
     def closeEvent(self, event):
         event.ignore()
@@ -242,8 +310,6 @@ class MainClocking(QMainWindow):
 
 
 class Clocking(QWidget):
-    EXIT_CODE_REBOOT = 122
-
     def __init__(self, tray_icon: QSystemTrayIcon, manage_tasks_callback: Callable | None = None):
         super().__init__()
         self.tray_icon = tray_icon
@@ -256,6 +322,7 @@ class Clocking(QWidget):
         self._overtime_message_showed = False
 
         self.timer = QTimer()
+        self.workday_timer = WorkdayTimer()
         self.worked_hours = datetime.timedelta(0)
 
         self.setup_ui()
@@ -264,19 +331,38 @@ class Clocking(QWidget):
         self.timer.start(1000)
 
     def load_data(self):
-        """Load all clocking records from the DB into self.data."""
+        """Load the last HISTORY_DAYS of clocking records from the DB into self.data."""
+        since = datetime.date.today() - datetime.timedelta(days=HISTORY_DAYS - 1)
         try:
-            self.data = get_all_clockings()
+            self.data = get_clockings_since(since.isoformat())
+            if not self.data:
+                self.data = get_clockings_page(limit=CLOCKING_PAGE_SIZE)
         except Exception as e:
             self.show_db_error(f"Failed to load clocking data: {str(e)}")
             self.data = []
 
+    def _fetch_older_page(
+        self, oldest: ClockingRecord | None
+    ) -> tuple[list[ClockingRecord], bool]:
+        """Return the page of records preceding `oldest` and whether more may follow."""
+        try:
+            page = get_clockings_page(
+                oldest.check_in if oldest else None,
+                oldest.id if oldest else None,
+                CLOCKING_PAGE_SIZE,
+            )
+        except Exception as e:
+            self.show_db_error(f"Failed to load clocking data: {str(e)}")
+            return [], False
+        return page, len(page) == CLOCKING_PAGE_SIZE
+
     def setup_ui(self):
         self.setWindowTitle("Clocking")
         self.setMinimumSize(500, 200)
 
         self.timer_clocking_label = QLabel(format_timedelta(self.worked_hours))
-        self.create_task_buttons()
+        self.task_model = TaskListModel(self)
+        self.load_tasks()
         self.btn_stop = QPushButton("STOP")
 
         self.update_buttons()
@@ -291,42 +377,34 @@ class Clocking(QWidget):
             manage_tasks_btn.clicked.connect(self._manage_tasks_callback)
             hbox.addWidget(manage_tasks_btn)
         vbox.addLayout(hbox)
-        tasks_container = QWidget()
-        tasks_layout = QVBoxLayout(tasks_container)
-        tasks_layout.setContentsMargins(0, 0, 0, 0)
-        for _, task in self.task_buttons.items():
-            hbox = QHBoxLayout()
-            hbox.addWidget(task.button)
-            hbox.addWidget(task.label)
-            tasks_layout.addLayout(hbox)
-
-        tasks_scroll = QScrollArea()
-        tasks_scroll.setWidget(tasks_container)
-        tasks_scroll.setWidgetResizable(True)
-        tasks_scroll.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
-        vbox.addWidget(tasks_scroll)
+        self.task_filter = TaskFilterModel(self)
+        self.task_filter.setSourceModel(self.task_model)
+        self.task_filter_input = QLineEdit()
+        self.task_filter_input.setPlaceholderText("Filter tasks")
+        self.task_filter_input.setClearButtonEnabled(True)
+        self.task_filter_input.textChanged.connect(self.task_filter.setFilterFixedString)
+        self.task_filter_input.returnPressed.connect(self._focus_task_list)
+        vbox.addWidget(self.task_filter_input)
+        self.task_list = TaskListView()
+        self.task_list.setModel(self.task_filter)
+        self.task_list.task_activated.connect(self.check_in_task)
+        vbox.addWidget(self.task_list)
         vbox.addWidget(self.btn_stop)
 
         task_ids = get_all_task_ids()
         self._task_delegate = TaskComboDelegate(task_ids, self)
 
-        self.clocking_table = QTableWidget()
-        self.clocking_table.setColumnCount(len(CLOCKING_HEADER))
-        self.clocking_table.setHorizontalHeaderLabels(CLOCKING_HEADER)
+        self.clocking_model = ClockingTableModel(self.data, self._fetch_older_page, self)
+        self.clocking_table = ClockingTableView()
+        self.clocking_table.setModel(self.clocking_model)
         self.clocking_table.setItemDelegateForColumn(1, self._task_delegate)
         header = self.clocking_table.horizontalHeader()
         for col in range(len(CLOCKING_HEADER)):
             header.setSectionResizeMode(col, QHeaderView.ResizeMode.ResizeToContents)
         message_col = CLOCKING_HEADER.index("Message")
         header.setSectionResizeMode(message_col, QHeaderView.ResizeMode.Stretch)
-        self.clocking_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
-        self.clocking_table.setEditTriggers(
-            QAbstractItemView.EditTrigger.DoubleClicked |
-            QAbstractItemView.EditTrigger.SelectedClicked |
-            QAbstractItemView.EditTrigger.EditKeyPressed
-        )
         self.update_table()
-        self.clocking_table.itemChanged.connect(self._auto_save)
+        self.clocking_model.row_edited.connect(self._auto_save)
 
         self.add_row_btn = QPushButton("Add Row")
         self.add_row_btn.clicked.connect(self.add_row)
@@ -346,34 +424,11 @@ class Clocking(QWidget):
 
     def _collect_row(self, row_idx: int) -> ClockingRecord:
         """Build a ClockingRecord from a single table row."""
-        def cell(col):
-            item = self.clocking_table.item(row_idx, col)
-            return item.text().strip() if item else ""
-
-        date = cell(0)
-        task = cell(1)
-        check_in_time = cell(2)   # HH:MM
-        check_out_time = cell(3)  # HH:MM or ""
-        message = cell(4) or None
-
-        check_in = f"{date} {check_in_time}" if date and check_in_time else ""
-        check_out = f"{date} {check_out_time}" if date and check_out_time else None
-
-        item_date = self.clocking_table.item(row_idx, 0)
-        existing_id = item_date.data(Qt.ItemDataRole.UserRole) if item_date else None
-
-        return ClockingRecord(
-            date=date,
-            task=task,
-            check_in=check_in,
-            check_out=check_out,
-            message=message,
-            id=existing_id,
-        )
+        return self.clocking_model.record_at(row_idx)
 
     def _collect_rows(self) -> list[ClockingRecord]:
         """Build a list of ClockingRecord from all table rows."""
-        return [self._collect_row(i) for i in range(self.clocking_table.rowCount())]
+        return [self._collect_row(i) for i in range(self.clocking_model.rowCount())]
 
     def _validate_record(self, r: ClockingRecord, row_num: int) -> list[str]:
         """Return a list of validation error strings for the given record."""
@@ -404,27 +459,13 @@ class Clocking(QWidget):
 
         return errors
 
-    def _revert_row(self, row_idx: int, record: ClockingRecord) -> None:
-        """Restore a table row to the given saved record's values."""
-        self.clocking_table.blockSignals(True)
-        item_date = QTableWidgetItem(record.date)
-        item_date.setData(Qt.ItemDataRole.UserRole, record.id)
-        self.clocking_table.setItem(row_idx, 0, item_date)
-        self.clocking_table.setItem(row_idx, 1, QTableWidgetItem(record.task))
-        self.clocking_table.setItem(row_idx, 2, QTableWidgetItem(record.check_in_time))
-        self.clocking_table.setItem(row_idx, 3, QTableWidgetItem(record.check_out_time or ""))
-        self.clocking_table.setItem(row_idx, 4, QTableWidgetItem(record.message or ""))
-        self.clocking_table.blockSignals(False)
-
-    def _auto_save(self, item: QTableWidgetItem) -> None:
+    def _auto_save(self, row_idx: int, record: ClockingRecord) -> None:
         """Upsert the single row that changed instead of rewriting the whole table."""
-        row_idx = item.row()
-        record = self._collect_row(row_idx)
-
         # New (unsaved) row: wait until the required fields are all present
         if not record.id and not (record.date and record.task and record.check_in):
             return
 
+        # On failure the model still holds the saved values, so the row reverts by itself
         errors = self._validate_record(record, row_idx + 1)
         if errors:
             msg_box = QMessageBox()
@@ -434,16 +475,12 @@ class Clocking(QWidget):
             msg_box.setDetailedText("\n".join(errors))
             msg_box.setStandardButtons(QMessageBox.StandardButton.Ok)
             msg_box.exec()
-            if row_idx < len(self.data):
-                self._revert_row(row_idx, self.data[row_idx])
             return
 
         try:
             saved_id = upsert_clocking(record)
         except Exception as e:
             self.show_db_error(f"Failed to save clocking data: {str(e)}")
-            if row_idx < len(self.data):
-                self._revert_row(row_idx, self.data[row_idx])
             return
 
         saved = ClockingRecord(
@@ -454,47 +491,20 @@ class Clocking(QWidget):
             message=record.message,
             id=saved_id,
         )
-        # Store the assigned id into the cell so subsequent edits can find it
-        self.clocking_table.blockSignals(True)
-        item_date = self.clocking_table.item(row_idx, 0)
-        if item_date:
-            item_date.setData(Qt.ItemDataRole.UserRole, saved_id)
-        self.clocking_table.blockSignals(False)
-
-        if row_idx < len(self.data):
-            self.data[row_idx] = saved
-        else:
-            self.data.append(saved)
+        self.clocking_model.set_record(row_idx, saved)
+        self.workday_timer.invalidate()
         self.update_buttons()
 
     def update_table(self):
-        """Repopulate the clocking table from self.data."""
-        self.clocking_table.blockSignals(True)
-        self.clocking_table.setRowCount(0)
-        for r in self.data:
-            row_idx = self.clocking_table.rowCount()
-            self.clocking_table.insertRow(row_idx)
-            item_date = QTableWidgetItem(r.date)
-            item_date.setData(Qt.ItemDataRole.UserRole, r.id)
-            self.clocking_table.setItem(row_idx, 0, item_date)
-            self.clocking_table.setItem(row_idx, 1, QTableWidgetItem(r.task))
-            self.clocking_table.setItem(row_idx, 2, QTableWidgetItem(r.check_in_time))
-            self.clocking_table.setItem(row_idx, 3, QTableWidgetItem(r.check_out_time or ""))
-            self.clocking_table.setItem(row_idx, 4, QTableWidgetItem(r.message or ""))
-        self.clocking_table.blockSignals(False)
-        if self.clocking_table.rowCount() > 0:
+        """Point the clocking table at self.data."""
+        self.clocking_model.set_records(self.data, has_older=bool(self.data))
+        if self.clocking_model.rowCount() > 0:
             self.clocking_table.scrollToBottom()
 
     def add_row(self):
-        row_idx = self.clocking_table.rowCount()
-        self.clocking_table.blockSignals(True)
-        self.clocking_table.insertRow(row_idx)
-        self.clocking_table.setItem(row_idx, 0, QTableWidgetItem(datetime.date.today().isoformat()))
-        for col_idx in range(1, len(CLOCKING_HEADER)):
-            self.clocking_table.setItem(row_idx, col_idx, QTableWidgetItem(""))
-        self.clocking_table.blockSignals(False)
+        row_idx = self.clocking_model.append_blank_row(datetime.date.today().isoformat())
         self.clocking_table.scrollToBottom()
-        self.clocking_table.setCurrentCell(row_idx, 1)
+        self.clocking_table.setCurrentIndex(self.clocking_model.index(row_idx, 1))
 
     def delete_row(self):
         selected_rows = sorted(
@@ -513,65 +523,51 @@ class Clocking(QWidget):
         )
         if confirm != QMessageBox.StandardButton.Yes:
             return
-        self.clocking_table.blockSignals(True)
         for row_idx in selected_rows:
-            record_id = self.data[row_idx].id if row_idx < len(self.data) else None
+            record_id = self.clocking_model.row_id(row_idx)
             if record_id:
                 try:
                     delete_clocking(record_id)
                 except Exception as e:
-                    self.clocking_table.blockSignals(False)
                     self.show_db_error(f"Failed to delete row: {str(e)}")
                     return
-            if row_idx < len(self.data):
-                self.data.pop(row_idx)
-            self.clocking_table.removeRow(row_idx)
-        self.clocking_table.blockSignals(False)
+            self.clocking_model.remove_row(row_idx)
+        self.workday_timer.invalidate()
         self.update_buttons()
 
-    def create_task_buttons(self):
-        self.task_buttons = {}
-        self.create_buttons_from_db()
-
-    def _jira_link_for_task(self, task_id: str) -> str | None:
-        config = get_config_manager()
-        prefix_str = config.get('JIRA_TASK_PREFIX', '')
-        if not prefix_str:
-            return None
-        base_url = config.get('ATLASSIAN_URL', '').rstrip('/')
-        if not base_url:
-            return None
-        prefixes = [p.strip() for p in prefix_str.split(',') if p.strip()]
-        for prefix in prefixes:
-            if task_id.upper().startswith(prefix.upper() + '-'):
-                return f"{base_url}/browse/{task_id}"
-        return None
-
-    def create_buttons_from_db(self):
+    def load_tasks(self) -> None:
+        """List the open and fixed tasks from the DB in the task panel."""
         try:
             tasks = get_tasks_by_type('open')
             tasks.extend(get_tasks_by_type('fixed'))
         except Exception as e:
             logging.error(f"Error loading tasks from DB: {e}")
-            return
-        for task_rec in tasks:
-            btn_check_in = QPushButton(task_rec.task)
-            btn_check_in.setFixedWidth(100)
-            btn_check_in.clicked.connect(self.record_check_in(task_rec.task))
-            link_url = self._jira_link_for_task(task_rec.task)
-            self.task_buttons[task_rec.task] = TaskUI(
-                task_rec.task, task_rec.description, btn_check_in, link_url
-            )
+            tasks = []
+        self.task_model.set_tasks(tasks)
+
+    def reload_tasks(self) -> None:
+        """Reload the task panel and the Task column choices from the DB."""
+        self.load_tasks()
+        self._task_delegate.set_task_ids(get_all_task_ids())
+        self.update_buttons()
+
+    def _focus_task_list(self) -> None:
+        """Move from the filter box to the first matching task, ready for Enter."""
+        if self.task_filter.rowCount():
+            self.task_list.setCurrentIndex(self.task_filter.index(0, 0))
+            self.task_list.setFocus()
 
     def update_buttons(self):
         self.get_today_worked_hours()
-        for _, task in self.task_buttons.items():
-            task.button.setEnabled(True)
-        if self.started_task_id and self.started_task_id in self.task_buttons:
-            self.task_buttons[self.started_task_id].button.setEnabled(self._is_checked_out)
-
+        self.task_model.set_active_task(None if self._is_checked_out else self.started_task_id)
         self.btn_stop.setEnabled(not self._is_checked_out)
 
+    def check_in_task(self, task_id: str) -> None:
+        """Check in to a task picked in the task list; picking the running task does nothing."""
+        if task_id == self.started_task_id and not self._is_checked_out:
+            return
+        self.record_check_in(task_id)()
+
     def record_check_in(self, task_id: str) -> Callable:
         def do_check_in():
             if not self._is_checked_out:
@@ -579,17 +575,19 @@ class Clocking(QWidget):
             now = datetime.datetime.now()
             date_str = now.date().isoformat()
             check_in_str = f"{date_str} {now.strftime('%H:%M')}"
-            insert_clocking(date_str, task_id, check_in_str)
-            self.load_data()
+            record = insert_clocking(date_str, task_id, check_in_str)
+            self.workday_timer.invalidate()
+            self.clocking_model.upsert_records([record])
             self.started_task_id = task_id
             self.update_buttons()
-            self.update_table()
+            self.clocking_table.scrollToBottom()
         return do_check_in
 
-    def record_check_out(self):
+    def record_check_out(self) -> list[ClockingRecord]:
+        """Close the open session and return the rows written (two across midnight)."""
         open_rec = get_open_clocking()
         if open_rec is None:
-            return
+            return []
         now = datetime.datetime.now()
         started_date = open_rec.date
         end_date = now.date().isoformat()
@@ -597,15 +595,21 @@ class Clocking(QWidget):
 
         assert open_rec.id is not None
         if started_date == end_date:
-            update_check_out(open_rec.id, f"{end_date} {end_time}")
+            changed = [update_check_out(open_rec.id, f"{end_date} {end_time}")]
         else:
             # Cross-day: close at 23:59, open new row at 00:00
-            update_check_out(open_rec.id, f"{started_date} 23:59")
-            insert_clocking(end_date, open_rec.task, f"{end_date} 00:00", f"{end_date} {end_time}")
-
-        self.load_data()
+            changed = [
+                update_check_out(open_rec.id, f"{started_date} 23:59"),
+                insert_clocking(
+                    end_date, open_rec.task, f"{end_date} 00:00", f"{end_date} {end_time}"
+                ),
+            ]
+        written = [r for r in changed if r is not None]
+
+        self.workday_timer.invalidate()
+        self.clocking_model.upsert_records(written)
         self.update_buttons()
-        self.update_table()
+        return written
 
     def show_db_error(self, message: str):
         msg_box = QMessageBox()
@@ -623,20 +627,11 @@ class Clocking(QWidget):
         self.warn_if_overtime()
 
     def get_today_worked_hours(self) -> datetime.timedelta:
-        today_str = datetime.date.today().isoformat()
-        completed_seconds = get_today_completed_seconds(today_str)
-        todays_hours = datetime.timedelta(seconds=completed_seconds)
-
-        open_rec = get_open_clocking()
-        self._is_checked_out = True
-        if open_rec is not None:
-            self._is_checked_out = False
-            self.started_task_id = open_rec.task
-            check_in_dt = datetime.datetime.strptime(open_rec.check_in, "%Y-%m-%d %H:%M")
-            not_completed = datetime.datetime.now() - check_in_dt
-            return todays_hours + not_completed
-        else:
-            return todays_hours
+        worked = self.workday_timer.worked_today()
+        self._is_checked_out = self.workday_timer.is_checked_out
+        if not self._is_checked_out:
+            self.started_task_id = self.workday_timer.open_task
+        return worked
 
     def warn_if_overtime(self) -> None:
         todays_hours = self.worked_hours
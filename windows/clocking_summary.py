@@ -1,26 +1,38 @@
 import datetime
 
-from PySide6 import QtGui
 from PySide6.QtCore import Qt
-from PySide6.QtWidgets import QHBoxLayout, QLabel, QPushButton, QTextEdit, QVBoxLayout, QWidget
+from PySide6.QtWidgets import (
+    QHBoxLayout,
+    QLabel,
+    QPushButton,
+    QTextBrowser,
+    QTextEdit,
+    QVBoxLayout,
+    QWidget,
+)
 
-from services.clockify_api import push_worklog_to_clockify
+from services.coalesce import get_coalesce_rule
 from services.config_manager import get_config_manager
+from services.constants import CLOCKIFY_MAX_IN_FLIGHT, JIRA_MAX_IN_FLIGHT
 from services.database import (
     ClockingRecord,
     get_clockings_for_date,
     get_task_durations_for_date,
 )
-from services.jira_api import push_worklog_to_jira
+from services.jira_links import get_jira_link_resolver
+from services.push_engine import PushEngine, PushResult
+from services.sync_outbox import CLOCKIFY_SYNC, JIRA_SYNC, SyncTarget, plan_sync, push_jobs
 from services.utils import format_timedelta, format_timedelta_jira
-
-_FMT = "%Y-%m-%d %H:%M"
+from services.workers import Worker, get_push_pool, run_in_background
 
 
 class ClockingSummary(QWidget):
     def __init__(self, data: list[ClockingRecord]):
         super().__init__()
         self._data = data
+        self._push_workers: list[Worker] = []
+        self.push_pool = get_push_pool()
+        self.push_engine = PushEngine(max_workers=JIRA_MAX_IN_FLIGHT + CLOCKIFY_MAX_IN_FLIGHT)
         self.setWindowTitle("Clocking Summary")
         self.setMinimumSize(200, 200)
 
@@ -33,8 +45,9 @@ class ClockingSummary(QWidget):
         for task in week_tasks:
             vbox = QVBoxLayout()
             vbox.addWidget(QLabel(task['date']), alignment=Qt.AlignmentFlag.AlignTop)
-            clockings = QTextEdit(task['clockings'])
-            clockings.setReadOnly(True)
+            clockings = QTextBrowser()
+            clockings.setOpenExternalLinks(True)
+            clockings.setHtml(task['clockings'])
             vbox.addWidget(clockings)
 
             buttons_layout = QHBoxLayout()
@@ -49,15 +62,34 @@ class ClockingSummary(QWidget):
         self.log_text = QTextEdit()
         self.log_text.setReadOnly(True)
         main_layout.addWidget(self.log_text)
+        self.cancel_button = QPushButton('Cancel Push')
+        self.cancel_button.setEnabled(False)
+        self.cancel_button.clicked.connect(self.cancel_pushes)
+        main_layout.addWidget(self.cancel_button)
         self.setLayout(main_layout)
 
     def push_clockings(self, day: str):
         def do_push_clockings():
-            self.push_to_jira(day)
-            self.push_to_clockify(day)
+            targets = [t for t in (self._jira_target(), self._clockify_target()) if t]
+            if targets:
+                names = ' and '.join(target.name for target in targets)
+                self._start_push(f'Pushing {day} clocking to {names} ...', day, targets)
         return do_push_clockings
 
-    def push_to_jira(self, day: str) -> None:
+    def push_to_jira(self, day: str) -> Worker | None:
+        target = self._jira_target()
+        if target is None:
+            return None
+        return self._start_push(f'Pushing {day} clocking to Jira worklog ...', day, [target])
+
+    def push_to_clockify(self, day: str) -> Worker | None:
+        target = self._clockify_target()
+        if target is None:
+            return None
+        return self._start_push(f'Pushing {day} clocking to Clockify worklog ...', day, [target])
+
+    def _jira_target(self) -> SyncTarget | None:
+        """Return the Jira target, or log and return None if Jira is not configured."""
         config = get_config_manager()
         is_configured, _ = config.is_jira_configured()
 
@@ -66,24 +98,11 @@ class ClockingSummary(QWidget):
                 '<span style="color:red;">Jira is not configured. '
                 'Please configure it in Menu → Settings.</span>'
             )
-            return
-
-        date = datetime.date.fromisoformat(day)
-        self.log_text.append(f'Pushing {day} clocking to Jira worklog ...')
-
-        for r in get_clockings_for_date(day):
-            assert r.check_out is not None
-            check_in_dt = datetime.datetime.strptime(r.check_in, _FMT)
-            check_out_dt = datetime.datetime.strptime(r.check_out, _FMT)
-            duration = check_out_dt - check_in_dt
-            start_dt = datetime.datetime(date.year, date.month, date.day,
-                                         check_in_dt.hour, check_in_dt.minute)
-            ok = push_worklog_to_jira(r.task, start_dt, duration)
-            self.log_pushing_output(duration, ok, r.task)
-
-        self.log_text.append('Done')
+            return None
+        return JIRA_SYNC
 
-    def push_to_clockify(self, day: str) -> None:
+    def _clockify_target(self) -> SyncTarget | None:
+        """Return the Clockify target, or log and return None if Clockify is not configured."""
         config = get_config_manager()
         is_configured, _ = config.is_clockify_configured()
 
@@ -92,43 +111,86 @@ class ClockingSummary(QWidget):
                 '<span style="color:red;">Clockify is not configured. '
                 'Please configure it in Menu → Settings.</span>'
             )
-            return
-
-        date = datetime.date.fromisoformat(day)
-        self.log_text.append(f'Pushing {day} clocking to Clockify worklog ...')
-
-        for r in get_clockings_for_date(day):
-            assert r.check_out is not None
-            check_in_dt = datetime.datetime.strptime(r.check_in, _FMT)
-            check_out_dt = datetime.datetime.strptime(r.check_out, _FMT)
-            duration = check_out_dt - check_in_dt
-            start_dt = datetime.datetime(date.year, date.month, date.day,
-                                         check_in_dt.hour, check_in_dt.minute)
-            end_dt = datetime.datetime(date.year, date.month, date.day,
-                                       check_out_dt.hour, check_out_dt.minute)
-            ok = push_worklog_to_clockify(r.task, start_dt, end_dt)
-            self.log_pushing_output(duration, ok, r.task)
-
-        self.log_text.append('Done')
-
-    def log_pushing_output(self, duration, ok, task):
+            return None
+        return CLOCKIFY_SYNC
+
+    def _start_push(
+        self,
+        title: str,
+        day: str,
+        targets: list[SyncTarget],
+    ) -> Worker:
+        """Push the day's changes through the push engine off the GUI thread and log each result."""
+        def push(worker: Worker) -> int:
+            # Planned here rather than on click: a batch queued behind another one for
+            # the same day must see what that one already pushed
+            records = get_clockings_for_date(day)
+            rule = get_coalesce_rule()
+            jobs = push_jobs(plan_sync(target, day, records, rule) for target in targets)
+            self.push_engine.run(jobs, on_result=worker.report, is_cancelled=worker.is_cancelled)
+            return len(jobs)
+
+        worker = run_in_background(
+            push,
+            on_started=lambda: self.log_text.append(title),
+            on_progress=self._log_push_result,
+            on_finished=lambda sent: self._push_ended(
+                worker, 'Done' if sent else 'Nothing to push, already up to date'),
+            on_failed=lambda e: self._push_ended(
+                worker, f'<span style="color:red;">Push failed: {e}</span>'),
+            on_cancelled=lambda: self._push_ended(
+                worker, f'<span style="color:red;">{title} cancelled</span>'),
+            pool=self.push_pool,
+        )
+        self._push_workers.append(worker)
+        self.cancel_button.setEnabled(True)
+        return worker
+
+    def _log_push_result(self, result: PushResult) -> None:
+        job = result.job
+        target = job.target.name if job.action == 'create' else f'{job.target.name} {job.action}'
+        self.log_pushing_output(datetime.timedelta(seconds=job.duration_seconds), result.ok,
+                                job.task, target)
+        if result.error is not None:
+            self.log_text.append(f'<span style="color:red;">{result.error}</span>')
+
+    def _push_ended(self, worker: Worker, message: str) -> None:
+        self.log_text.append(message)
+        if worker in self._push_workers:
+            self._push_workers.remove(worker)
+        self.cancel_button.setEnabled(bool(self._push_workers))
+
+    def cancel_pushes(self) -> None:
+        """Let requests in flight finish and skip the ones not sent yet."""
+        for worker in self._push_workers:
+            worker.cancel()
+
+    def closeEvent(self, event):
+        self.cancel_pushes()
+        super().closeEvent(event)
+
+    def log_pushing_output(self, duration, ok, task, target=None):
         log_info = f'Task: {task}, Duration: {format_timedelta_jira(duration)}'
+        if target:
+            log_info = f'{target} -- {log_info}'
         log_status = 'Success' if ok else 'Fail'
         log_color = 'blue' if ok else 'red'
         self.log_text.append(
             f'<span style="color:{log_color};">{log_info} --> {log_status}</span>'
         )
-        QtGui.QGuiApplication.processEvents()
 
     def compute_task_duration(self, day: datetime.date) -> dict | None:
         durations = get_task_durations_for_date(day.isoformat())
         if not durations:
             return None
 
+        links = get_jira_link_resolver()
         task_string = ''
         for td in durations:
             delta = datetime.timedelta(seconds=td.total_seconds)
-            task_string += f'{td.task} -- {format_timedelta_jira(delta)}<br>'
+            url = links.url_for(td.task)
+            task = f'<a href="{url}">{td.task}</a>' if url else td.task
+            task_string += f'{task} -- {format_timedelta_jira(delta)}<br>'
 
         total_seconds = sum(td.total_seconds for td in durations)
         total_delta = datetime.timedelta(seconds=total_seconds)
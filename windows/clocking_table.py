@@ -0,0 +1,265 @@
+from collections.abc import Callable
+
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, QPersistentModelIndex, Qt, Signal
+from PySide6.QtWidgets import QAbstractItemView, QTableView
+
+from services.constants import CLOCKING_HEADER
+from services.database import ClockingRecord
+from services.jira_links import get_jira_link_resolver
+
+# fetch_older(oldest_loaded) -> (older rows oldest first, whether even older rows may exist)
+FetchOlder = Callable[[ClockingRecord | None], tuple[list[ClockingRecord], bool]]
+
+_ModelIndex = QModelIndex | QPersistentModelIndex
+
+
+def record_cells(record: ClockingRecord) -> list[str]:
+    """Return the table cell texts (Date, Task, Check In, Check Out, Message) of a record."""
+    return [
+        record.date,
+        record.task,
+        record.check_in_time,
+        record.check_out_time or "",
+        record.message or "",
+    ]
+
+
+def record_from_cells(cells: list[str], record_id: int | None) -> ClockingRecord:
+    """Build a ClockingRecord from table cell texts."""
+    date, task, check_in_time, check_out_time, message = (c.strip() for c in cells)
+    return ClockingRecord(
+        date=date,
+        task=task,
+        check_in=f"{date} {check_in_time}" if date and check_in_time else "",
+        check_out=f"{date} {check_out_time}" if date and check_out_time else None,
+        message=message or None,
+        id=record_id,
+    )
+
+
+class ClockingTableModel(QAbstractTableModel):
+    """
+    Editable table model over the clocking history, oldest row first.
+
+    Saved rows are read straight from `records` (the list shared with
+    Clocking.data), so nothing is copied per cell. Rows added with
+    append_blank_row() are kept as drafts after them until they are saved.
+    Edits are not applied to saved rows directly: row_edited carries the
+    edited record and the owner calls set_record() once it has been saved,
+    so a rejected edit leaves the row untouched.
+    """
+
+    row_edited = Signal(int, object)   # row, edited ClockingRecord
+
+    def __init__(self, records: list[ClockingRecord], fetch_older: FetchOlder | None = None,
+                 parent=None):
+        super().__init__(parent)
+        self._records = records
+        self._drafts: list[list[str]] = []
+        self._fetch_older = fetch_older
+        self._has_older = False
+        self._fetch_guard: Callable[[], bool] = lambda: True
+
+    # -- Qt model interface -------------------------------------------------
+
+    def rowCount(self, parent: _ModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._records) + len(self._drafts)
+
+    def columnCount(self, parent: _ModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(CLOCKING_HEADER)
+
+    def data(self, index: _ModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            return self.row_cells(index.row())[index.column()]
+        if role == Qt.ItemDataRole.UserRole and index.column() == 0:
+            return self.row_id(index.row())
+        if role == Qt.ItemDataRole.ToolTipRole and index.column() == 1:
+            return get_jira_link_resolver().url_for(self.row_cells(index.row())[1])
+        return None
+
+    def headerData(self, section: int, orientation: Qt.Orientation,
+                   role: int = Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return CLOCKING_HEADER[section]
+        return section + 1
+
+    def flags(self, index: _ModelIndex) -> Qt.ItemFlag:
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        return (Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsEnabled
+                | Qt.ItemFlag.ItemIsEditable)
+
+    def setData(self, index: _ModelIndex, value, role: int = Qt.ItemDataRole.EditRole) -> bool:
+        if not index.isValid() or role != Qt.ItemDataRole.EditRole:
+            return False
+        row, col = index.row(), index.column()
+        cells = self.row_cells(row)
+        value = "" if value is None else str(value)
+        if cells[col] == value:
+            return False
+        cells[col] = value
+        if row >= len(self._records):
+            self._drafts[row - len(self._records)] = cells
+            self.dataChanged.emit(index, index)
+        self.row_edited.emit(row, record_from_cells(cells, self.row_id(row)))
+        return True
+
+    def canFetchMore(self, parent: _ModelIndex = QModelIndex()) -> bool:
+        return (not parent.isValid() and self._fetch_older is not None
+                and self._has_older and self._fetch_guard())
+
+    def fetchMore(self, parent: _ModelIndex = QModelIndex()) -> None:
+        if parent.isValid() or self._fetch_older is None or not self._has_older:
+            return
+        # fetch_older may open an error dialog whose event loop asks again
+        self._has_older = False
+        older, has_older = self._fetch_older(self._records[0] if self._records else None)
+        if not older:
+            return
+        self._has_older = has_older
+        self.beginInsertRows(QModelIndex(), 0, len(older) - 1)
+        self._records[0:0] = older
+        self.endInsertRows()
+
+    # -- Row access ---------------------------------------------------------
+
+    def row_cells(self, row: int) -> list[str]:
+        if row < len(self._records):
+            return record_cells(self._records[row])
+        return list(self._drafts[row - len(self._records)])
+
+    def row_id(self, row: int) -> int | None:
+        return self._records[row].id if row < len(self._records) else None
+
+    def record_at(self, row: int) -> ClockingRecord:
+        """Return the row as a ClockingRecord (drafts included)."""
+        return record_from_cells(self.row_cells(row), self.row_id(row))
+
+    # -- Mutations ----------------------------------------------------------
+
+    def set_records(self, records: list[ClockingRecord], has_older: bool = False) -> None:
+        """Replace the whole history (drafts are discarded)."""
+        self.beginResetModel()
+        self._records = records
+        self._drafts = []
+        self._has_older = has_older
+        self.endResetModel()
+
+    def set_fetch_guard(self, guard: Callable[[], bool]) -> None:
+        """Only offer older rows while guard() is true (the view uses 'scrolled to top')."""
+        self._fetch_guard = guard
+
+    def set_record(self, row: int, record: ClockingRecord) -> None:
+        """Store a saved record at row; a saved draft becomes the newest saved row."""
+        saved_count = len(self._records)
+        if row < saved_count:
+            self._records[row] = record
+        elif row == saved_count:
+            self._drafts.pop(0)
+            self._records.append(record)
+        else:
+            self.beginMoveRows(QModelIndex(), row, row, QModelIndex(), saved_count)
+            self._drafts.pop(row - saved_count)
+            self._records.append(record)
+            self.endMoveRows()
+            row = saved_count
+        self.dataChanged.emit(self.index(row, 0), self.index(row, self.columnCount() - 1))
+
+    def upsert_records(self, records: list[ClockingRecord]) -> None:
+        """
+        Patch saved rows by id, appending records that are not loaded yet.
+
+        Written rows are almost always the newest ones, so the search starts
+        from the end and the cost does not depend on the history size.
+        """
+        for record in records:
+            row = next(
+                (i for i in range(len(self._records) - 1, -1, -1)
+                 if self._records[i].id == record.id),
+                None,
+            )
+            if row is not None:
+                self._records[row] = record
+                self.dataChanged.emit(self.index(row, 0),
+                                      self.index(row, self.columnCount() - 1))
+            else:
+                row = len(self._records)
+                self.beginInsertRows(QModelIndex(), row, row)
+                self._records.append(record)
+                self.endInsertRows()
+
+    def append_blank_row(self, date: str) -> int:
+        """Append an empty draft row dated `date` and return its row number."""
+        row = self.rowCount()
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._drafts.append([date] + [""] * (len(CLOCKING_HEADER) - 1))
+        self.endInsertRows()
+        return row
+
+    def remove_row(self, row: int) -> None:
+        self.beginRemoveRows(QModelIndex(), row, row)
+        if row < len(self._records):
+            self._records.pop(row)
+        else:
+            self._drafts.pop(row - len(self._records))
+        self.endRemoveRows()
+
+
+class ClockingTableView(QTableView):
+    """
+    Table view for ClockingTableModel with the newest rows at the bottom.
+
+    Qt only fetches more rows when the end of a view is reached, so older
+    pages are requested when the user scrolls to the top instead, and the
+    rows that were visible stay in place after they are prepended.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._anchor: tuple[bool, int] | None = None
+        self.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.setEditTriggers(
+            QAbstractItemView.EditTrigger.DoubleClicked |
+            QAbstractItemView.EditTrigger.SelectedClicked |
+            QAbstractItemView.EditTrigger.EditKeyPressed
+        )
+        self.verticalScrollBar().valueChanged.connect(self._fetch_if_at_top)
+
+    def setModel(self, model) -> None:
+        super().setModel(model)
+        if isinstance(model, ClockingTableModel):
+            model.set_fetch_guard(self._is_at_top)
+            model.rowsAboutToBeInserted.connect(self._remember_anchor)
+            model.rowsInserted.connect(self._restore_anchor)
+
+    def _is_at_top(self) -> bool:
+        bar = self.verticalScrollBar()
+        return bar.value() == bar.minimum()
+
+    def _fetch_if_at_top(self, value: int) -> None:
+        model = self.model()
+        if value == self.verticalScrollBar().minimum() and model.canFetchMore(QModelIndex()):
+            model.fetchMore(QModelIndex())
+
+    def _remember_anchor(self, parent: QModelIndex, first: int, last: int) -> None:
+        if first == 0 and self.model().rowCount() > 0:
+            bar = self.verticalScrollBar()
+            self._anchor = (bar.value() == bar.maximum(), max(self.rowAt(0), 0))
+
+    def _restore_anchor(self, parent: QModelIndex, first: int, last: int) -> None:
+        if self._anchor is None:
+            return
+        at_bottom, top_row = self._anchor
+        self._anchor = None
+        self.executeDelayedItemsLayout()
+        if at_bottom:
+            self.scrollToBottom()
+        else:
+            self.scrollTo(
+                self.model().index(top_row + last - first + 1, 0),
+                QAbstractItemView.ScrollHint.PositionAtTop,
+            )
@@ -1,8 +1,10 @@
 import datetime
+import html
 
-from PySide6.QtWidgets import QTextEdit, QVBoxLayout, QWidget
+from PySide6.QtWidgets import QTextBrowser, QVBoxLayout, QWidget
 
 from services.database import ClockingRecord, get_task_descriptions
+from services.jira_links import get_jira_link_resolver
 
 
 class EodReport(QWidget):
@@ -16,8 +18,8 @@ class EodReport(QWidget):
         task_messages = self.get_task_messages(today)
 
         main_layout = QVBoxLayout()
-        self.report_text = QTextEdit()
-        self.report_text.setReadOnly(True)
+        self.report_text = QTextBrowser()
+        self.report_text.setOpenExternalLinks(True)
         main_layout.addWidget(self.report_text)
         self.setLayout(main_layout)
 
@@ -40,12 +42,17 @@ class EodReport(QWidget):
 
     def display_task_messages(self, task_messages: dict[str, list[str]]):
         descriptions = get_task_descriptions()
+        links = get_jira_link_resolver()
         report = ''
         for task, messages in task_messages.items():
-            description = descriptions.get(task, '')
-            report += f'{task}:{description}\n'
+            description = html.escape(descriptions.get(task, ''))
+            url = links.url_for(task)
+            label = f'<a href="{html.escape(url)}">{html.escape(task)}</a>' if url \
+                else html.escape(task)
+            report += f'{label}:{description}\n'
             if messages:
                 for m in messages:
                     for n in m.split("\\n"):
-                        report += f'- {n}\n'
-        self.report_text.append(report)
+                        report += f'- {html.escape(n)}\n'
+        # Rich text for the links; pre-wrap keeps the copied plain text line for line
+        self.report_text.append(f'<div style="white-space: pre-wrap">{report}</div>')
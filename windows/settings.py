@@ -1,4 +1,5 @@
 from PySide6.QtWidgets import (
+    QComboBox,
     QDialog,
     QFormLayout,
     QGroupBox,
@@ -7,12 +8,14 @@ from PySide6.QtWidgets import (
     QLineEdit,
     QMessageBox,
     QPushButton,
+    QSpinBox,
     QTabWidget,
     QVBoxLayout,
     QWidget,
 )
 
 from services.clockify_api import clear_clockify_cache
+from services.coalesce import COALESCE_GAP, COALESCE_OFF, COALESCE_TASK, get_coalesce_rule
 from services.config_manager import get_config_manager
 from services.jira_api import clear_jira_cache
 
@@ -64,6 +67,14 @@ class SettingsDialog(QDialog):
         
         clockify_tab.setLayout(clockify_layout)
         tabs.addTab(clockify_tab, "Clockify")
+
+        # Push settings tab
+        push_tab = QWidget()
+        push_layout = QVBoxLayout()
+        push_layout.addWidget(self.create_push_group())
+        push_layout.addStretch()
+        push_tab.setLayout(push_layout)
+        tabs.addTab(push_tab, "Push")
         
         layout.addWidget(tabs)
         
@@ -170,6 +181,37 @@ class SettingsDialog(QDialog):
         group.setLayout(form_layout)
         return group
     
+    def create_push_group(self) -> QGroupBox:
+        """Create push settings group"""
+        group = QGroupBox("Push Configuration")
+        form_layout = QFormLayout()
+
+        # Coalescing rule
+        self.coalesce_mode_input = QComboBox()
+        self.coalesce_mode_input.addItem("Push each session", COALESCE_OFF)
+        self.coalesce_mode_input.addItem("Merge a task's sessions of the day", COALESCE_TASK)
+        self.coalesce_mode_input.addItem("Merge a task's sessions close together", COALESCE_GAP)
+        self.coalesce_mode_input.currentIndexChanged.connect(self._update_coalesce_gap_enabled)
+        form_layout.addRow("Sessions:", self.coalesce_mode_input)
+
+        self.coalesce_gap_input = QSpinBox()
+        self.coalesce_gap_input.setRange(0, 24 * 60)
+        self.coalesce_gap_input.setSuffix(" min")
+        form_layout.addRow("Largest gap:", self.coalesce_gap_input)
+
+        help_label = QLabel(
+            '<small>Merged sessions are pushed as one Jira worklog and one Clockify entry '
+            'with their total duration, starting at the first session.</small>'
+        )
+        help_label.setWordWrap(True)
+        form_layout.addRow("", help_label)
+
+        group.setLayout(form_layout)
+        return group
+
+    def _update_coalesce_gap_enabled(self):
+        self.coalesce_gap_input.setEnabled(self.coalesce_mode_input.currentData() == COALESCE_GAP)
+
     def toggle_password_visibility(self, line_edit: QLineEdit, button: QPushButton, show: bool):
         """Toggle password visibility for a line edit"""
         if show:
@@ -187,6 +229,10 @@ class SettingsDialog(QDialog):
         self.jira_task_prefix_input.setText(self.config_manager.get('JIRA_TASK_PREFIX'))
         self.clockify_workspace_input.setText(self.config_manager.get('CLOCKIFY_WORKSPACE'))
         self.clockify_api_key_input.setText(self.config_manager.get('CLOCKIFY_API_KEY'))
+        rule = get_coalesce_rule(self.config_manager)
+        self.coalesce_mode_input.setCurrentIndex(self.coalesce_mode_input.findData(rule.mode))
+        self.coalesce_gap_input.setValue(rule.max_gap_minutes)
+        self._update_coalesce_gap_enabled()
     
     def save_settings(self):
         """Save settings to config manager and close dialog"""
@@ -198,6 +244,8 @@ class SettingsDialog(QDialog):
             'JIRA_TASK_PREFIX': self.jira_task_prefix_input.text().strip(),
             'CLOCKIFY_WORKSPACE': self.clockify_workspace_input.text().strip(),
             'CLOCKIFY_API_KEY': self.clockify_api_key_input.text().strip(),
+            'PUSH_COALESCE': self.coalesce_mode_input.currentData(),
+            'PUSH_COALESCE_GAP_MINUTES': str(self.coalesce_gap_input.value()),
         }
         
         # Update config manager
@@ -0,0 +1,138 @@
+from PySide6.QtCore import (
+    QAbstractListModel,
+    QModelIndex,
+    QPersistentModelIndex,
+    QSortFilterProxyModel,
+    Qt,
+    QUrl,
+    Signal,
+)
+from PySide6.QtGui import QDesktopServices, QFont
+from PySide6.QtWidgets import QAbstractItemView, QApplication, QListView, QMenu, QStyle
+
+from services.database import TaskRecord
+from services.jira_links import get_jira_link_resolver
+
+_ModelIndex = QModelIndex | QPersistentModelIndex
+
+TASK_ROLE = Qt.ItemDataRole.UserRole
+DESCRIPTION_ROLE = Qt.ItemDataRole.UserRole + 1
+LINK_ROLE = Qt.ItemDataRole.UserRole + 2
+FILTER_ROLE = Qt.ItemDataRole.UserRole + 3
+
+
+class TaskListModel(QAbstractListModel):
+    """
+    List model over the tasks that can be checked in to, one row per task.
+
+    Rows are read straight from the TaskRecords; Jira links are resolved when
+    a row is drawn, so only the visible tasks pay for them. The running task
+    is marked with a bold font and a play icon.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._tasks: list[TaskRecord] = []
+        self._rows: dict[str, int] = {}
+        self._active: str | None = None
+        self._active_font = QFont()
+        self._active_font.setBold(True)
+        self._active_icon = QApplication.style().standardIcon(QStyle.StandardPixmap.SP_MediaPlay)
+
+    def rowCount(self, parent: _ModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._tasks)
+
+    def data(self, index: _ModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        task = self._tasks[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return f'{task.task} — {task.description}' if task.description else task.task
+        if role == TASK_ROLE:
+            return task.task
+        if role == DESCRIPTION_ROLE:
+            return task.description
+        if role == LINK_ROLE:
+            return get_jira_link_resolver().url_for(task.task)
+        if role == FILTER_ROLE:
+            return f'{task.task} {task.description}'
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return get_jira_link_resolver().url_for(task.task) or task.description or None
+        if task.task == self._active:
+            if role == Qt.ItemDataRole.FontRole:
+                return self._active_font
+            if role == Qt.ItemDataRole.DecorationRole:
+                return self._active_icon
+        return None
+
+    # -- Access -------------------------------------------------------------
+
+    def task_ids(self) -> list[str]:
+        return [t.task for t in self._tasks]
+
+    @property
+    def active_task(self) -> str | None:
+        return self._active
+
+    # -- Mutations ----------------------------------------------------------
+
+    def set_tasks(self, tasks: list[TaskRecord]) -> None:
+        """Replace the listed tasks; the active mark is kept."""
+        self.beginResetModel()
+        self._tasks = tasks
+        self._rows = {t.task: row for row, t in enumerate(tasks)}
+        self.endResetModel()
+
+    def set_active_task(self, task_id: str | None) -> None:
+        """Mark task_id as the running task (None when checked out)."""
+        if task_id == self._active:
+            return
+        previous, self._active = self._active, task_id
+        for changed in (previous, task_id):
+            row = self._rows.get(changed) if changed else None
+            if row is not None:
+                index = self.index(row)
+                self.dataChanged.emit(index, index)
+
+
+class TaskFilterModel(QSortFilterProxyModel):
+    """Case-insensitive filter on a task's key and description."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setFilterRole(FILTER_ROLE)
+        self.setFilterCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+
+
+class TaskListView(QListView):
+    """
+    Task switcher: a click or keyboard activation (Enter) of a row emits task_activated.
+
+    Rows have uniform sizes, so the view lays out and draws only the
+    visible tasks however many are listed. The context menu opens a Jira
+    task in the browser.
+    """
+
+    task_activated = Signal(str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setUniformItemSizes(True)
+        self.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        # Styles that activate on single click emit both; the owner ignores the repeat
+        self.clicked.connect(self._emit_task)
+        self.activated.connect(self._emit_task)
+
+    def _emit_task(self, index: QModelIndex) -> None:
+        task_id = index.data(TASK_ROLE)
+        if task_id:
+            self.task_activated.emit(task_id)
+
+    def contextMenuEvent(self, event) -> None:
+        url = self.indexAt(event.pos()).data(LINK_ROLE)
+        if not url:
+            return
+        menu = QMenu(self)
+        menu.addAction("Open in Jira", lambda: QDesktopServices.openUrl(QUrl(url)))
+        menu.exec(event.globalPos())